@@ -1,22 +1,99 @@
 """
 API routes for the blockchain assistant.
 """
+import asyncio
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from app.services.blockchain import blockchain_service
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from app.services.blockchain import get_blockchain_service, get_ready_service, service_status
+from app.services.executor import query_executor, QueueFullError
+from app.services.jobs import airdrop_jobs, FINAL_STATUSES
+from app.core.answer_cache import answer_cache
+from app.core.catalog import prompt_token_report
+from app.core.memory import memory_store
+from app.data.task_params import TASK_DESCRIPTIONS
+from app.utils.cache import rpc_cache
+from app.utils.live_accounts import live_accounts
+from app.utils.metrics import registry, EXECUTOR_RUNNING, EXECUTOR_QUEUE_DEPTH
+from app.utils.rate_limit import (
+    RateLimitTimeout,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_BATCH,
+    request_context,
+    rpc_limiter,
+    llm_limiter,
+)
+from app.utils.rpc_client import dumps
+from app.utils.rpc_router import rpc_router
+from app.utils.shared_state import shared_state
+from app.utils.tools import rpc_flight
+from app.config.settings import (
+    QUERY_QUEUE_FULL_STATUS,
+    BATCH_MAX_QUERIES,
+    QUERY_DEADLINE,
+    BATCH_DEADLINE,
+    JOB_POLL_INITIAL_SECONDS,
+    JOB_TIMEOUT_SECONDS,
+)
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 
 router = APIRouter()
 
 class QueryRequest(BaseModel):
     """Request model for user queries."""
     query: str
+    session_id: Optional[str] = Field(None, max_length=128)
 
 class QueryResponse(BaseModel):
     """Response model for processed queries."""
     response: str
     task_executed: Optional[str] = None
     data_used: Optional[Dict[str, Any]] = None
+    job_id: Optional[str] = None
+
+class BatchQueryRequest(BaseModel):
+    """Request model for a batch of independent queries."""
+    queries: List[str] = Field(..., min_length=1, max_length=BATCH_MAX_QUERIES)
+
+class BatchQueryItem(QueryResponse):
+    """Response for a single query within a batch."""
+    error: Optional[str] = None
+
+class BatchQueryResponse(BaseModel):
+    """Response model for batch queries, in request order."""
+    results: List[BatchQueryItem]
+
+def run_query(query: str, session_id: Optional[str]) -> Dict[str, Any]:
+    """Process a query on a worker thread, building the service on first use."""
+    return get_blockchain_service().process_query(query, session_id)
+
+def run_stream(query: str, session_id: Optional[str]) -> Iterator[Tuple[str, Any]]:
+    """Stream query events on a worker thread, building the service on first use."""
+    yield from get_blockchain_service().stream_query(query, session_id)
+
+def run_batch(queries: List[str]) -> List[Dict[str, Any]]:
+    """Process a batch on a worker thread, building the service on first use."""
+    return get_blockchain_service().process_batch(queries)
+
+def format_sse(event: str, payload: Any) -> bytes:
+    """Encode one server-sent event."""
+    return b"event: " + event.encode() + b"\ndata: " + dumps(payload) + b"\n\n"
+
+def queue_full_exception(error: QueueFullError) -> HTTPException:
+    """Build the fail-fast response for a full admission queue."""
+    return HTTPException(
+        status_code=QUERY_QUEUE_FULL_STATUS,
+        detail="Server is busy, please retry later",
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+def rate_limit_exception(error: RateLimitTimeout) -> HTTPException:
+    """Build the response for a request that could not be admitted before its deadline."""
+    return HTTPException(
+        status_code=503,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)}
+    )
 
 @router.post("/query", response_model=QueryResponse)
 async def process_query(request: QueryRequest):
@@ -30,25 +107,209 @@ async def process_query(request: QueryRequest):
         QueryResponse: The processed response
     """
     try:
-        result = blockchain_service.process_query(request.query)
+        with request_context(PRIORITY_INTERACTIVE, QUERY_DEADLINE):
+            result = await query_executor.run(run_query, request.query, request.session_id)
         return QueryResponse(
             response=result["response"],
             task_executed=result.get("task_executed"),
-            data_used=result.get("data_used")
+            data_used=result.get("data_used"),
+            job_id=result.get("job_id")
         )
+    except QueueFullError as e:
+        raise queue_full_exception(e)
+    except RateLimitTimeout as e:
+        raise rate_limit_exception(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing query: {str(e)}")
 
+@router.post("/query/stream")
+async def stream_query(request: QueryRequest):
+    """
+    Process a blockchain query, streaming each stage as server-sent events.
+    
+    Emits a "task" event with the identified task and its data, an
+    "rpc_result" event with the raw RPC response, "token" events carrying the
+    answer as it is produced and a "final" event matching QueryResponse.
+    Failures are reported as an "error" event.
+    
+    Args:
+        request: The query request containing the user's input
+        
+    Returns:
+        StreamingResponse: A text/event-stream response
+    """
+    try:
+        with request_context(PRIORITY_INTERACTIVE, QUERY_DEADLINE):
+            events = query_executor.stream(run_stream, request.query, request.session_id)
+    except QueueFullError as e:
+        raise queue_full_exception(e)
+    
+    async def body():
+        try:
+            async for event, payload in events:
+                if event == "final":
+                    payload = QueryResponse(**payload).model_dump()
+                elif event == "token":
+                    payload = {"text": payload}
+                yield format_sse(event, payload)
+        except Exception as e:
+            yield format_sse("error", {"response": f"Error processing query: {str(e)}", "task_executed": None, "error": str(e)})
+    
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/query/batch", response_model=BatchQueryResponse)
+async def process_batch(request: BatchQueryRequest):
+    """
+    Process several independent blockchain queries in one request.
+    
+    Task identification runs concurrently and the resulting RPC calls are
+    deduplicated and sent as a single JSON-RPC batch. A failing item does not
+    fail the batch; it carries an error message instead.
+    
+    Args:
+        request: The batch request containing the user's queries
+        
+    Returns:
+        BatchQueryResponse: One result per query, in request order
+    """
+    try:
+        with request_context(PRIORITY_BATCH, BATCH_DEADLINE):
+            results = await query_executor.run(run_batch, request.queries)
+        return BatchQueryResponse(results=[BatchQueryItem(**result) for result in results])
+    except QueueFullError as e:
+        raise queue_full_exception(e)
+    except RateLimitTimeout as e:
+        raise rate_limit_exception(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing batch: {str(e)}")
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Status of a background job, such as a submitted airdrop.
+    
+    Args:
+        job_id: Job id returned with the query response
+        
+    Returns:
+        dict: Job status, transaction signature and, once confirmed, the updated balance
+    """
+    job = airdrop_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job(job_id: str):
+    """
+    Follow a background job as server-sent events.
+    
+    Emits a "status" event with the job each time it changes, ending after
+    the job is confirmed, fails or expires.
+    
+    Args:
+        job_id: Job id returned with the query response
+        
+    Returns:
+        StreamingResponse: A text/event-stream response
+    """
+    job = airdrop_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def body():
+        current = job
+        yield format_sse("status", current)
+        # The job may be tracked by another worker, so it is read again rather than waited on
+        deadline = asyncio.get_running_loop().time() + JOB_TIMEOUT_SECONDS * 2
+        while current["status"] not in FINAL_STATUSES and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(JOB_POLL_INITIAL_SECONDS)
+            latest = airdrop_jobs.get(job_id)
+            if latest is None:
+                return
+            if latest != current:
+                current = latest
+                yield format_sse("status", current)
+    
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/health")
 async def health_check():
     """
-    API health check endpoint.
+    API health check endpoint (liveness).
+    
+    Answers as soon as the process serves HTTP, before the agents are built.
     
     Returns:
         dict: Health status
     """
     return {"status": "healthy", "service": "blockchain-assistant"}
 
+@router.get("/ready")
+async def readiness_check():
+    """
+    Readiness endpoint: succeeds once the agents and crews are built.
+    
+    Returns:
+        dict: Initialization status and startup timing report, with status code 503 until ready
+    """
+    status = service_status()
+    return JSONResponse(status, status_code=200 if status["status"] == "ready" else 503)
+
+@router.get("/stats")
+async def service_stats():
+    """
+    Query executor and cache statistics.
+    
+    Returns:
+        dict: Queue depth, worker utilisation, queue wait times, cache and coalescing counters
+    """
+    stats = {
+        "executor": query_executor.stats(),
+        "rpc_cache": rpc_cache.stats(),
+        "live_accounts": live_accounts.stats(),
+        "rpc_endpoints": rpc_router.stats(),
+        "rate_limits": {
+            "rpc": rpc_limiter.stats(),
+            "llm": llm_limiter.stats()
+        },
+        "answer_cache": answer_cache.stats(),
+        "memory": memory_store.stats(),
+        "airdrop_jobs": airdrop_jobs.stats(),
+        "shared_state": shared_state.stats() if shared_state is not None else None,
+        "prompt": prompt_token_report(),
+        "single_flight": {
+            "rpc": rpc_flight.stats()
+        }
+    }
+    service = get_ready_service()
+    if service is not None:
+        from app.core.crew import query_flight
+        stats["crew_pools"] = service.crew.pool_stats()
+        stats["single_flight"]["query"] = query_flight.stats()
+    return stats
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Prometheus metrics: stage, RPC, queue and request latency histograms and LLM token counts.
+    
+    Returns:
+        PlainTextResponse: Metrics in the Prometheus text exposition format
+    """
+    executor_stats = query_executor.stats()
+    EXECUTOR_RUNNING.set(executor_stats["running"])
+    EXECUTOR_QUEUE_DEPTH.set(executor_stats["queue_depth"])
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 @router.get("/tasks")
 async def list_available_tasks():
     """
@@ -59,19 +320,7 @@ async def list_available_tasks():
     """
     return {
         "available_tasks": [
-            {"name": "getAccountInfo", "description": "Get account information for an address"},
-            {"name": "getContractMetadata", "description": "Fetch contract metadata"},
-            {"name": "getGasPrices", "description": "Get current gas prices"},
-            {"name": "getTransactionDetails", "description": "Get details for a transaction"},
-            {"name": "getHealth", "description": "Check blockchain network health"},
-            {"name": "requestAirdrop", "description": "Request an airdrop of SOL"},
-            {"name": "getBalance", "description": "Get balance for an address"},
-            {"name": "getInflationRate", "description": "Get current inflation rate"},
-            {"name": "getSupply", "description": "Get token supply information"},
-            {"name": "getTokenAccountBalance", "description": "Get token account balance"},
-            {"name": "getTokenAccountsByDelegate", "description": "Get token accounts by delegate"},
-            {"name": "getTokenAccountsByOwner", "description": "Get token accounts by owner"},
-            {"name": "getTokenLargestAccounts", "description": "Get largest token accounts"},
-            {"name": "getTokenSupply", "description": "Get token supply information"}
+            {"name": name, "description": description}
+            for name, description in TASK_DESCRIPTIONS.items()
         ]
-    }
\ No newline at end of file
+    }
@@ -10,10 +10,139 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 # Blockchain API endpoint
 SOLANA_API_URL = os.getenv("SOLANA_API_URL", "https://solana-devnet.g.alchemy.com/v2/jK9f7FhUJarWMR9nozOhvCKB1Qdj3VYS")
+# Comma-separated list of endpoints to route between, defaults to SOLANA_API_URL alone
+SOLANA_API_URLS = [url.strip() for url in os.getenv("SOLANA_API_URLS", SOLANA_API_URL).split(",") if url.strip()]
+
+# RPC routing settings: rolling health window, benching of failing endpoints and hedging of read-only calls
+RPC_HEALTH_WINDOW = int(os.getenv("RPC_HEALTH_WINDOW", "100"))
+RPC_MAX_CONSECUTIVE_FAILURES = int(os.getenv("RPC_MAX_CONSECUTIVE_FAILURES", "3"))
+RPC_FAILURE_COOLDOWN = float(os.getenv("RPC_FAILURE_COOLDOWN", "30"))
+RPC_HEDGING = os.getenv("RPC_HEDGING", "False").lower() == "true"
+RPC_HEDGE_MIN_DELAY = float(os.getenv("RPC_HEDGE_MIN_DELAY", "0.05"))
+RPC_HEDGE_MAX_DELAY = float(os.getenv("RPC_HEDGE_MAX_DELAY", "1.0"))
+
+# Live view of hot accounts kept fresh by accountSubscribe/slotSubscribe over the RPC WebSocket
+LIVE_ACCOUNTS_ENABLED = os.getenv("LIVE_ACCOUNTS_ENABLED", "False").lower() == "true"
+SOLANA_WS_URL = os.getenv("SOLANA_WS_URL", SOLANA_API_URL.replace("https://", "wss://", 1).replace("http://", "ws://", 1))
+# Most-requested accounts to subscribe to, and requests an account needs before it qualifies
+LIVE_ACCOUNTS_MAX = int(os.getenv("LIVE_ACCOUNTS_MAX", "100"))
+LIVE_ACCOUNTS_MIN_HITS = int(os.getenv("LIVE_ACCOUNTS_MIN_HITS", "3"))
+# Seconds between subscription rebalances (request counts are halved at each one)
+LIVE_ACCOUNTS_REBALANCE_SECONDS = float(os.getenv("LIVE_ACCOUNTS_REBALANCE_SECONDS", "5"))
+# The view is not served when no slot notification arrived for this long
+LIVE_ACCOUNTS_STALE_SECONDS = float(os.getenv("LIVE_ACCOUNTS_STALE_SECONDS", "10"))
+LIVE_ACCOUNTS_RECONNECT_MAX_DELAY = float(os.getenv("LIVE_ACCOUNTS_RECONNECT_MAX_DELAY", "30"))
+
+# RPC client settings
+RPC_CONNECT_TIMEOUT = float(os.getenv("RPC_CONNECT_TIMEOUT", "5"))
+RPC_READ_TIMEOUT = float(os.getenv("RPC_READ_TIMEOUT", "30"))
+RPC_MAX_CONNECTIONS = int(os.getenv("RPC_MAX_CONNECTIONS", "100"))
+RPC_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("RPC_MAX_KEEPALIVE_CONNECTIONS", "20"))
+RPC_KEEPALIVE_EXPIRY = float(os.getenv("RPC_KEEPALIVE_EXPIRY", "60"))
+RPC_HTTP2 = os.getenv("RPC_HTTP2", "False").lower() == "true"
+
+# Large list results (token and program accounts) are reduced to a summary with this many top entries,
+# reading at most LARGE_RESULT_MAX_ITEMS accounts (0 reads all)
+LARGE_RESULT_TOP_N = int(os.getenv("LARGE_RESULT_TOP_N", "10"))
+LARGE_RESULT_MAX_ITEMS = int(os.getenv("LARGE_RESULT_MAX_ITEMS", "100000"))
+
+# RPC response cache settings
+RPC_CACHE_ENABLED = os.getenv("RPC_CACHE_ENABLED", "True").lower() == "true"
+RPC_CACHE_MAX_BYTES = int(os.getenv("RPC_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RPC_CACHE_EPOCH_TTL = float(os.getenv("RPC_CACHE_EPOCH_TTL", "600"))
+
+# Coalesce concurrent identical RPC calls and, optionally, identical queries
+RPC_SINGLE_FLIGHT = os.getenv("RPC_SINGLE_FLIGHT", "True").lower() == "true"
+QUERY_SINGLE_FLIGHT = os.getenv("QUERY_SINGLE_FLIGHT", "False").lower() == "true"
+
+# Conversational answer cache settings
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "True").lower() == "true"
+ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "2048"))
+ANSWER_CACHE_TTL = float(os.getenv("ANSWER_CACHE_TTL", "3600"))
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.9"))
+
+# Query execution settings
+QUERY_WORKERS = int(os.getenv("QUERY_WORKERS", "8"))
+QUERY_QUEUE_SIZE = int(os.getenv("QUERY_QUEUE_SIZE", "32"))
+QUERY_RETRY_AFTER = int(os.getenv("QUERY_RETRY_AFTER", "5"))
+QUERY_QUEUE_FULL_STATUS = int(os.getenv("QUERY_QUEUE_FULL_STATUS", "503"))
+BATCH_MAX_QUERIES = int(os.getenv("BATCH_MAX_QUERIES", "50"))
+BATCH_IDENTIFY_WORKERS = int(os.getenv("BATCH_IDENTIFY_WORKERS", "8"))
+
+# Routing settings
+ENABLE_FAST_ROUTER = os.getenv("ENABLE_FAST_ROUTER", "True").lower() == "true"
+# Number of candidate tasks shown to the task identification LLM (0 shows all)
+PROMPT_TOP_K_TASKS = int(os.getenv("PROMPT_TOP_K_TASKS", "0"))
+# Phrase blockchain results with the LLM instead of the deterministic renderers
+LLM_RENDERING = os.getenv("LLM_RENDERING", "False").lower() == "true"
+
+# Pre-built crew pools: maximum crews per task, and whether to build the task crews at startup
+CREW_POOL_SIZE = int(os.getenv("CREW_POOL_SIZE", str(QUERY_WORKERS)))
+CREW_POOL_PREWARM = os.getenv("CREW_POOL_PREWARM", "False").lower() == "true"
+# CrewAI's own short-term/long-term/entity memory (needs an embedder); conversation memory is separate
+CREW_MEMORY = os.getenv("CREW_MEMORY", "True").lower() == "true"
+
+# Build the agents and crews in the background at startup instead of on the first query
+SERVICE_EAGER_INIT = os.getenv("SERVICE_EAGER_INIT", "True").lower() == "true"
+
+# Client-side rate limits (0 disables a limit) and how long callers may queue for them
+RPC_CREDITS_PER_SECOND = float(os.getenv("RPC_CREDITS_PER_SECOND", "50"))
+RPC_CREDITS_PER_MINUTE = float(os.getenv("RPC_CREDITS_PER_MINUTE", "0"))
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "1000000"))
+# Completion tokens charged per LLM call when the request sets no max_tokens
+LLM_COMPLETION_TOKEN_ESTIMATE = int(os.getenv("LLM_COMPLETION_TOKEN_ESTIMATE", "512"))
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "10"))
+QUERY_DEADLINE = float(os.getenv("QUERY_DEADLINE", "30"))
+BATCH_DEADLINE = float(os.getenv("BATCH_DEADLINE", "60"))
+
+# Tracing: open OpenTelemetry spans around query stages (exporter configured via OTEL_EXPORTER_OTLP_* variables)
+OTEL_ENABLED = os.getenv("OTEL_ENABLED", "False").lower() == "true"
+OTEL_SERVICE_NAME = os.getenv("OTEL_SERVICE_NAME", "solana-navigator")
+
+# Conversation memory settings
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "1500"))
+MEMORY_SUMMARY_TOKENS = int(os.getenv("MEMORY_SUMMARY_TOKENS", "300"))
+MEMORY_SESSION_IDLE_SECONDS = float(os.getenv("MEMORY_SESSION_IDLE_SECONDS", "1800"))
+MEMORY_MAX_SESSIONS = int(os.getenv("MEMORY_MAX_SESSIONS", "10000"))
+MEMORY_MAX_TOTAL_TOKENS = int(os.getenv("MEMORY_MAX_TOTAL_TOKENS", "5000000"))
+# Persistent conversation storage: "sqlite" (any SQLAlchemy URL) or "memory" for process memory only
+MEMORY_BACKEND = os.getenv("MEMORY_BACKEND", "sqlite")
+MEMORY_DB_URL = os.getenv("MEMORY_DB_URL", "sqlite:///conversations.db")
+MEMORY_FLUSH_SECONDS = float(os.getenv("MEMORY_FLUSH_SECONDS", "1"))
+MEMORY_FLUSH_BATCH = int(os.getenv("MEMORY_FLUSH_BATCH", "500"))
+# Messages read back when a session that is not in memory is resumed
+MEMORY_LOAD_MESSAGES = int(os.getenv("MEMORY_LOAD_MESSAGES", "50"))
 
 # LLM settings
 DEFAULT_TEMPERATURE = 0
 DEFAULT_MODEL = "gemini/gemini-1.5-flash"
 
 # Application settings
-DEBUG = os.getenv("DEBUG", "False").lower() == "true"
\ No newline at end of file
+DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+
+# Server launch: "development" runs one auto-reloading process, "production" runs SERVER_WORKERS processes (0 = one per core)
+SERVER_MODE = os.getenv("SERVER_MODE", "development")
+SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "0"))
+
+# State shared between worker processes: "local" (none), "sqlite" (a file on this host) or "redis" (any Redis-protocol server)
+SHARED_STATE = os.getenv("SHARED_STATE", "local")
+SHARED_STATE_URL = os.getenv("SHARED_STATE_URL", "redis://127.0.0.1:6379/0" if SHARED_STATE == "redis" else "shared_state.db")
+# RPC responses fresh for less than this many seconds are only cached in the process
+SHARED_CACHE_MIN_TTL = float(os.getenv("SHARED_CACHE_MIN_TTL", "1"))
+
+# Airdrops return a job at once and are confirmed in the background instead of inside the request
+AIRDROP_JOBS_ENABLED = os.getenv("AIRDROP_JOBS_ENABLED", "True").lower() == "true"
+# Commitment an airdrop must reach before its job completes and the new balance is read
+AIRDROP_CONFIRMATION = os.getenv("AIRDROP_CONFIRMATION", "confirmed")
+# Seconds between status polls; the interval doubles up to the maximum while nothing changes
+JOB_POLL_INITIAL_SECONDS = float(os.getenv("JOB_POLL_INITIAL_SECONDS", "0.5"))
+JOB_POLL_MAX_SECONDS = float(os.getenv("JOB_POLL_MAX_SECONDS", "5"))
+# Jobs whose transaction is not seen within this many seconds expire (an airdrop's blockhash is valid for about 60 seconds)
+JOB_TIMEOUT_SECONDS = float(os.getenv("JOB_TIMEOUT_SECONDS", "90"))
+# Seconds a finished job stays available at /jobs/{id}
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", "3600"))
+# URL receiving a POST with the job when it finishes, empty for none
+JOB_WEBHOOK_URL = os.getenv("JOB_WEBHOOK_URL", "")
@@ -1,8 +1,9 @@
 """
 Definitions for CrewAI agents used in the blockchain assistant.
 """
-from crewai import Agent, LLM
+from crewai import Agent
 from app.config.settings import GEMINI_API_KEY, DEFAULT_MODEL, DEFAULT_TEMPERATURE
+from app.core.llm import RateLimitedLLM
 from app.utils.tools import create_structured_tool
 
 def initialize_agents():
@@ -12,8 +13,8 @@ def initialize_agents():
     Returns:
         tuple: A tuple containing task_define_agent and get_agent
     """
-    # Initialize LLM with explicit provider
-    gemini_llm = LLM(
+    # Initialize LLM with explicit provider, admitted through the client-side quota
+    gemini_llm = RateLimitedLLM(
         provider="gemini", 
         model=DEFAULT_MODEL,
         api_key=GEMINI_API_KEY,
@@ -25,7 +26,7 @@ def initialize_agents():
     # Define task identification agent
     task_define_agent = Agent(
         role='Task Definer and Populator',
-        goal='Act as a conversational agent. Process the user input and tell which task is needed to be performed after identifying if the input provided is an address, signature, amount, programId or a message. Also populate the field in curly brackets in params of the correct task in {task_params_map}.'
+        goal='Act as a conversational agent. Process the user input and tell which task is needed to be performed after identifying if the input provided is an address, signature, amount, programId or a message. Also fill the slots listed in brackets after the correct task in this task catalog:\n{task_params_map}\n'
             'If the user is just conversing and there is no task to be performed, answer the user like a human and dont mention that this is a conversational query, just answer the user'
             'In case of an input error, clearly define the error and output it'
             'Take into consideration {memory} while answering as well',
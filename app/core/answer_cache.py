@@ -0,0 +1,320 @@
+"""
+Cache of conversational LLM answers keyed by normalized query and memory context.
+
+Lookups first try an exact match on the normalized query. On a miss, a local
+embedding of the query is compared against cached queries from the same
+memory scope and the nearest neighbour is used when it is similar enough.
+Embeddings are computed locally (hashed words, word bigrams and character
+trigrams), so the cache works offline. Bigrams keep word order significant,
+and a neighbour is only used when it is negated the same way as the query.
+Nearest-neighbour search uses hnswlib when it is installed and a numpy scan
+otherwise.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config.settings import (
+    ANSWER_CACHE_ENABLED,
+    ANSWER_CACHE_MAX_ENTRIES,
+    ANSWER_CACHE_TTL,
+    ANSWER_CACHE_SIMILARITY,
+)
+from app.utils.text import normalize_query
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+EMBEDDING_DIM = 256
+NEIGHBOURS = 8
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+# Queries or answers containing live data (numbers, addresses, signatures) are never cached
+DATA_RE = re.compile(r"\d|[1-9A-HJ-NP-Za-km-z]{32,88}")
+STOPWORDS = frozenset({
+    "a", "an", "the", "is", "are", "was", "what", "whats", "how", "do", "does", "can",
+    "i", "you", "me", "my", "to", "of", "on", "in", "about", "tell", "please",
+})
+# Words that invert a question; "t" is what remains of "n't" after tokenizing
+NEGATIONS = frozenset({"not", "no", "never", "nor", "without", "cannot", "t"})
+
+
+def _stem(word: str) -> str:
+    """Strip common English suffixes so plurals and tenses share features."""
+    for suffix in ("ing", "ed", "es", "s"):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[: -len(suffix)]
+    return word
+
+
+def embed(text: str) -> np.ndarray:
+    """
+    Compute a normalized hashed embedding of a query.
+
+    Args:
+        text: Normalized query text
+
+    Returns:
+        numpy.ndarray: Unit vector of EMBEDDING_DIM float32 values
+    """
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    words = [_stem(word) for word in WORD_RE.findall(text) if word not in STOPWORDS]
+    features: List[Tuple[str, float]] = [(f"w:{word}", 1.0) for word in words]
+    # Adjacent word pairs, so that reordered questions do not look identical
+    features += [(f"b:{first} {second}", 1.5) for first, second in zip(words, words[1:])]
+    for word in words:
+        padded = f" {word} "
+        features += [(f"c:{padded[i:i + 3]}", 0.5) for i in range(len(padded) - 2)]
+    for feature, weight in features:
+        digest = zlib.crc32(feature.encode())
+        vector[digest % EMBEDDING_DIM] += weight if digest & 0x80000000 else -weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def is_negated(text: str) -> bool:
+    """Check whether a normalized query contains a negation."""
+    return any(word in NEGATIONS for word in WORD_RE.findall(text))
+
+
+def memory_scope(messages: List[Dict[str, str]]) -> str:
+    """
+    Hash the memory window that conditions an answer.
+
+    Args:
+        messages: Conversation messages preceding the query
+
+    Returns:
+        str: Scope identifier
+    """
+    payload = json.dumps(messages, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def is_data_independent(text: str) -> bool:
+    """Check that a text carries no numbers, addresses or signatures."""
+    return DATA_RE.search(text) is None
+
+
+class _NumpyIndex:
+    """Brute-force cosine index over unit vectors."""
+
+    def __init__(self, capacity: int):
+        self.vectors = np.zeros((capacity, EMBEDDING_DIM), dtype=np.float32)
+        self.labels: List[int] = []
+        self.rows: Dict[int, int] = {}
+
+    def add(self, label: int, vector: np.ndarray) -> None:
+        row = len(self.labels)
+        self.vectors[row] = vector
+        self.labels.append(label)
+        self.rows[label] = row
+
+    def remove(self, label: int) -> None:
+        row = self.rows.pop(label)
+        last = len(self.labels) - 1
+        if row != last:
+            moved = self.labels[last]
+            self.vectors[row] = self.vectors[last]
+            self.labels[row] = moved
+            self.rows[moved] = row
+        self.labels.pop()
+
+    def search(self, vector: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        count = len(self.labels)
+        if not count:
+            return []
+        similarities = self.vectors[:count] @ vector
+        k = min(k, count)
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        return [(self.labels[row], float(similarities[row])) for row in top]
+
+
+class _HNSWIndex:
+    """Approximate cosine index backed by hnswlib."""
+
+    def __init__(self, capacity: int):
+        self.index = hnswlib.Index(space="cosine", dim=EMBEDDING_DIM)
+        self.index.init_index(max_elements=capacity, ef_construction=100, M=16, allow_replace_deleted=True)
+        self.index.set_ef(50)
+        self.size = 0
+
+    def add(self, label: int, vector: np.ndarray) -> None:
+        self.index.add_items(vector.reshape(1, -1), [label], replace_deleted=True)
+        self.size += 1
+
+    def remove(self, label: int) -> None:
+        self.index.mark_deleted(label)
+        self.size -= 1
+
+    def search(self, vector: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        k = min(k, self.size)
+        if k <= 0:
+            return []
+        labels, distances = self.index.knn_query(vector.reshape(1, -1), k=k)
+        return [(int(label), 1.0 - float(distance)) for label, distance in zip(labels[0], distances[0])]
+
+
+class _Entry:
+    """A cached answer."""
+
+    __slots__ = ("scope", "query", "answer", "expires_at")
+
+    def __init__(self, scope: str, query: str, answer: str, expires_at: float):
+        self.scope = scope
+        self.query = query
+        self.answer = answer
+        self.expires_at = expires_at
+
+
+class AnswerCache:
+    """Thread-safe, size-bounded cache of conversational answers with TTL."""
+
+    def __init__(
+        self,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+        ttl: float = ANSWER_CACHE_TTL,
+        similarity: float = ANSWER_CACHE_SIMILARITY,
+        enabled: bool = ANSWER_CACHE_ENABLED,
+        use_hnsw: Optional[bool] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached answers (LRU eviction)
+            ttl: Seconds an answer stays valid
+            similarity: Minimum cosine similarity for a nearest-neighbour hit
+            enabled: Whether lookups and stores are performed at all
+            use_hnsw: Force or disable the hnswlib index, auto-detected if None
+            clock: Monotonic time source
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self.enabled = enabled
+        self.clock = clock
+        if use_hnsw is None:
+            use_hnsw = hnswlib is not None
+        self.index = _HNSWIndex(max_entries) if use_hnsw else _NumpyIndex(max_entries)
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._exact: Dict[Tuple[str, str], int] = {}
+        self._next_label = 0
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def _remove(self, label: int) -> None:
+        entry = self._entries.pop(label)
+        self._exact.pop((entry.scope, entry.query), None)
+        self.index.remove(label)
+
+    def _hit(self, label: int) -> str:
+        self._entries.move_to_end(label)
+        return self._entries[label].answer
+
+    def get(self, user_input: str, scope: str) -> Optional[str]:
+        """
+        Look up a cached answer.
+
+        Args:
+            user_input: The user's input string
+            scope: Memory scope from :func:`memory_scope`
+
+        Returns:
+            str: The cached answer, or None on a miss
+        """
+        if not self.enabled or not is_data_independent(user_input):
+            return None
+        query = normalize_query(user_input)
+        now = self.clock()
+        with self._lock:
+            label = self._exact.get((scope, query))
+            if label is not None:
+                if self._entries[label].expires_at > now:
+                    self.exact_hits += 1
+                    return self._hit(label)
+                self._remove(label)
+
+            negated = is_negated(query)
+            for label, score in self.index.search(embed(query), NEIGHBOURS):
+                if score < self.similarity:
+                    break
+                entry = self._entries.get(label)
+                # A question and its negation share almost every feature but not the answer
+                if entry is None or entry.scope != scope or is_negated(entry.query) != negated:
+                    continue
+                if entry.expires_at <= now:
+                    self._remove(label)
+                    continue
+                self.semantic_hits += 1
+                return self._hit(label)
+
+            self.misses += 1
+            return None
+
+    def put(self, user_input: str, scope: str, answer: str) -> bool:
+        """
+        Store a conversational answer if it is data-independent.
+
+        Args:
+            user_input: The user's input string
+            scope: Memory scope from :func:`memory_scope`
+            answer: The LLM's answer
+
+        Returns:
+            bool: Whether the answer was stored
+        """
+        if not self.enabled or not answer:
+            return False
+        if not is_data_independent(user_input) or not is_data_independent(answer):
+            return False
+        query = normalize_query(user_input)
+        with self._lock:
+            existing = self._exact.get((scope, query))
+            if existing is not None:
+                self._remove(existing)
+            while len(self._entries) >= self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+            label = self._next_label
+            self._next_label += 1
+            self._entries[label] = _Entry(scope, query, answer, self.clock() + self.ttl)
+            self._exact[(scope, query)] = label
+            self.index.add(label, embed(query))
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Hit/miss counters and size
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "index": "hnswlib" if isinstance(self.index, _HNSWIndex) else "numpy",
+            }
+
+
+# Create a shared cache instance
+answer_cache = AnswerCache()
@@ -0,0 +1,208 @@
+"""
+Compact task catalog for the task identification prompt.
+
+Instead of stringifying the full TASK_PARAMS_MAP (nested JSON-RPC templates
+included) into every prompt, the LLM is shown one line per task with its
+purpose and placeholder slots. The LLM answers with slot values only and the
+full JSON-RPC request is expanded locally from the template.
+"""
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import PROMPT_TOP_K_TASKS
+from app.data.task_params import TASK_PARAMS_MAP, TASK_DESCRIPTIONS
+from app.utils.solana import is_pubkey, is_signature
+from app.utils.templates import REQUEST_BUILDERS, InvalidParamsError, template_slots
+from app.utils.tokens import estimate_tokens
+
+SLOT_HINTS = {
+    "amount": "integer lamports",
+    "addresses": "list of addresses",
+    "message": "base64 message",
+}
+
+WORD_RE = re.compile(r"[a-z]+")
+CAMEL_RE = re.compile(r"[A-Z]?[a-z]+")
+BASE58_RE = re.compile(r"[1-9A-HJ-NP-Za-km-z]{32,88}")
+
+STOPWORDS = frozenset({
+    "a", "an", "the", "of", "for", "to", "in", "on", "is", "are", "what", "whats",
+    "me", "my", "get", "give", "show", "please", "can", "you", "and", "with", "this", "that",
+})
+
+# Extra vocabulary that users commonly use for a task but that is not in its name or purpose
+TASK_SYNONYMS = {
+    "getBalance": "sol lamports wallet how much",
+    "getMultipleBalances": "sol lamports wallets portfolio balances addresses",
+    "getTransactionDetails": "tx txn signature transfer",
+    "getHealth": "healthy status up down",
+    "getGasPrices": "fee fees cost",
+    "getTokenLargestAccounts": "holders whales top biggest",
+    "getTokenAccountsByOwner": "owned holdings wallet tokens",
+    "getContractMetadata": "program contract",
+    "requestAirdrop": "faucet devnet free",
+    "getSupply": "circulating total",
+    "getInflationRate": "inflation validator foundation",
+}
+
+
+def _words(text: str) -> List[str]:
+    return [word for word in WORD_RE.findall(text.lower()) if word not in STOPWORDS]
+
+
+def _vocabulary(task_name: str) -> List[str]:
+    words = [word.lower() for word in CAMEL_RE.findall(task_name)]
+    words += _words(TASK_DESCRIPTIONS.get(task_name, ""))
+    words += _words(TASK_SYNONYMS.get(task_name, ""))
+    return [word for word in words if word not in STOPWORDS]
+
+
+def build_catalog() -> Dict[str, Dict[str, Any]]:
+    """
+    Precompute the compact catalog entry of every task.
+
+    Returns:
+        dict: Task name mapped to its purpose, slots and vocabulary
+    """
+    catalog = {}
+    for name, params in TASK_PARAMS_MAP.items():
+        slots = template_slots(params["data"])
+        catalog[name] = {
+            "purpose": TASK_DESCRIPTIONS.get(name, name),
+            "slots": slots,
+            "vocabulary": set(_vocabulary(name)),
+        }
+    return catalog
+
+
+TASK_CATALOG = build_catalog()
+
+# Inverse document frequency of each vocabulary word across tasks
+_document_frequency = Counter(word for entry in TASK_CATALOG.values() for word in entry["vocabulary"])
+WORD_WEIGHTS = {
+    word: math.log(1 + len(TASK_CATALOG) / count) for word, count in _document_frequency.items()
+}
+
+
+def format_task(name: str) -> str:
+    """Render one catalog line, e.g. ``getBalance(address): Get balance for an address``."""
+    entry = TASK_CATALOG[name]
+    slots = ", ".join(
+        f"{slot}: {SLOT_HINTS[slot]}" if slot in SLOT_HINTS else slot for slot in entry["slots"]
+    )
+    return f"{name}({slots}): {entry['purpose']}"
+
+
+def format_catalog(task_names: Optional[List[str]] = None) -> str:
+    """
+    Render the compact catalog injected into the prompt.
+
+    Args:
+        task_names: Subset of tasks to include, all tasks if None
+
+    Returns:
+        str: One line per task
+    """
+    names = task_names if task_names is not None else list(TASK_CATALOG)
+    return "\n".join(format_task(name) for name in names)
+
+
+def score_tasks(user_input: str) -> Dict[str, float]:
+    """
+    Cheap lexical relevance score of every task for a query.
+
+    Args:
+        user_input: The user's input string
+
+    Returns:
+        dict: Task name mapped to its score
+    """
+    words = set(_words(user_input))
+    values = BASE58_RE.findall(user_input)
+    has_pubkey = any(is_pubkey(value) for value in values)
+    has_signature = any(is_signature(value) for value in values)
+
+    scores = {}
+    for name, entry in TASK_CATALOG.items():
+        score = sum(WORD_WEIGHTS[word] for word in words & entry["vocabulary"])
+        if name.lower() in user_input.lower():
+            score += 10
+        if has_signature and "signature" in entry["slots"]:
+            score += 1
+        if has_pubkey and any(slot != "signature" for slot in entry["slots"]):
+            score += 0.5
+        scores[name] = score
+    return scores
+
+
+def select_tasks(user_input: str, top_k: int = PROMPT_TOP_K_TASKS) -> List[str]:
+    """
+    Choose the tasks to show the LLM for a query.
+
+    Args:
+        user_input: The user's input string
+        top_k: Number of candidates to keep, 0 keeps every task
+
+    Returns:
+        list: Task names in catalog order
+    """
+    if top_k <= 0 or top_k >= len(TASK_CATALOG):
+        return list(TASK_CATALOG)
+    scores = score_tasks(user_input)
+    ranked = sorted(scores, key=lambda name: scores[name], reverse=True)
+    if scores[ranked[0]] <= 0:
+        # Nothing looks relevant: likely conversational, so show everything compactly
+        return list(TASK_CATALOG)
+    selected = set(ranked[:top_k])
+    return [name for name in TASK_CATALOG if name in selected]
+
+
+def expand_task_data(task_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Expand the slot values chosen by the LLM into the full JSON-RPC request.
+
+    Args:
+        task_name: Task chosen by the LLM
+        data: Slot values, or an already complete JSON-RPC request
+
+    Returns:
+        dict: The JSON-RPC request
+
+    Raises:
+        InvalidParamsError: If a slot required by the task's template is empty or
+            malformed, or a complete request calls another method than the task's
+    """
+    builder = REQUEST_BUILDERS.get(task_name)
+    if builder is None:
+        return data
+    if "method" in data:
+        # Only the task's own method may be sent; anything else could be any upstream call
+        if data["method"] != builder.method:
+            raise InvalidParamsError(
+                f"Method {data['method']!r} does not match task {task_name} ({builder.method})"
+            )
+        # A complete request is checked at the template's slot positions
+        return builder.validate(data)
+    return builder(data)
+
+
+def prompt_token_report(user_input: Optional[str] = None, top_k: int = PROMPT_TOP_K_TASKS) -> Dict[str, int]:
+    """
+    Compare the prompt size of the full template map with the compact catalog.
+
+    Args:
+        user_input: Optional query used to size the top-k subset
+        top_k: Number of candidates kept for the subset
+
+    Returns:
+        dict: Estimated token counts
+    """
+    report = {
+        "full_task_params_map_tokens": estimate_tokens(TASK_PARAMS_MAP),
+        "compact_catalog_tokens": estimate_tokens(format_catalog()),
+    }
+    if user_input is not None:
+        report["selected_catalog_tokens"] = estimate_tokens(format_catalog(select_tasks(user_input, top_k)))
+    return report
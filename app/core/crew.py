@@ -1,10 +1,41 @@
 """
 Crew management for orchestrating agents and tasks.
 """
-from crewai import Crew
-from app.core.memory import conversation_memory
-from app.data.task_params import TASK_PARAMS_MAP
-from typing import Dict, Any, Optional, Union
+from crewai import Crew, Task
+from app.config.settings import (
+    ENABLE_FAST_ROUTER,
+    LLM_RENDERING,
+    BATCH_IDENTIFY_WORKERS,
+    QUERY_SINGLE_FLIGHT,
+    CREW_POOL_PREWARM,
+    CREW_MEMORY,
+    AIRDROP_JOBS_ENABLED,
+)
+from app.core.answer_cache import answer_cache, memory_scope
+from app.core.catalog import expand_task_data, format_catalog, select_tasks
+from app.core.crew_pool import CrewPool
+from app.core.memory import memory_store, ConversationMemory
+from app.core.renderers import has_renderer, render_result
+from app.core.router import intent_router
+from app.core.streaming import phrasing_messages, split_tokens, stream_completion
+from app.core.tasks import FirstAgentOutput
+from app.utils.metrics import STAGE_SECONDS, record_llm_tokens, span, token_counts
+from app.utils.singleflight import SingleFlight
+from app.utils.tokens import estimate_tokens
+from app.utils.text import normalize_query
+from app.utils.tools import call_rpc, call_rpc_batch
+from app.services.jobs import airdrop_jobs
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+# Concurrent identical queries share one task identification
+query_flight = SingleFlight("query")
+
+# Pooled blockchain tasks receive the request data explicitly instead of reading
+# the shared task identifier's output through task context
+TASK_DATA_SUFFIX = "\nUse this request data: {data}"
 
 class BlockchainCrew:
     """
@@ -26,58 +57,249 @@ class BlockchainCrew:
         self.get_task = get_task
         self.task_map = task_map
         
-        # Initialize the first crew for task identification
-        self.task_identifier_crew = Crew(
-            agents=[self.task_define_agent],
-            tasks=[self.get_task],
-            memory=True,
+        # Crews are built once and reused; the task identifier is needed by most queries
+        self.identifier_pool = CrewPool("identifier", self._build_identifier_crew)
+        self.identifier_pool.warm()
+        self.task_pools = {
+            name: CrewPool(name, lambda name=name: self._build_task_crew(name))
+            for name in self.task_map
+        }
+        if CREW_POOL_PREWARM:
+            for pool in self.task_pools.values():
+                pool.warm()
+    
+    def _build_identifier_crew(self) -> Crew:
+        """Build a task identifier crew with its own agent and task copies."""
+        agent = self.task_define_agent.copy()
+        return Crew(
+            agents=[agent],
+            tasks=[self.get_task.copy([agent], {})],
+            memory=CREW_MEMORY,
+            verbose=True,
+            llm=self.task_define_agent.llm
+        )
+    
+    def _build_task_crew(self, task_name: str) -> Crew:
+        """Build a crew for one blockchain task with its own agent and task copies."""
+        agent = self.get_agent.copy()
+        template = self.task_map[task_name]
+        task = Task(
+            description=template.description + TASK_DATA_SUFFIX,
+            expected_output=template.expected_output,
+            agent=agent
+        )
+        return Crew(
+            agents=[agent],
+            tasks=[task],
+            memory=CREW_MEMORY,
             verbose=True,
             llm=self.task_define_agent.llm
         )
     
-    def process_query(self, user_input: str) -> Dict[str, Any]:
+    def pool_stats(self) -> Dict[str, Any]:
         """
-        Process a user query through the crew workflow.
+        Get statistics of the crew pools that have been used.
+        
+        Returns:
+            dict: Pool name mapped to its statistics
+        """
+        pools = [self.identifier_pool] + [pool for pool in self.task_pools.values() if pool.built]
+        return {pool.name: pool.stats() for pool in pools}
+    
+    @staticmethod
+    def kickoff(crew: Crew, stage: str, inputs: Dict[str, Any]):
+        """
+        Kick off a crew inside a timing span and record its LLM token usage.
+        
+        Args:
+            crew: The crew to run
+            stage: Stage name for metrics
+            inputs: Inputs interpolated into the crew's tasks
+            
+        Returns:
+            CrewOutput: The crew's output
+        """
+        # Pooled crews accumulate usage across runs, so only the difference is recorded
+        prompt_before, completion_before = token_counts(crew.calculate_usage_metrics())
+        with span(stage):
+            output = crew.kickoff(inputs=inputs)
+        prompt_after, completion_after = token_counts(output.token_usage)
+        record_llm_tokens(stage, prompt_after - prompt_before, completion_after - completion_before)
+        return output
+    
+    @staticmethod
+    def parse_identification(crew_output) -> Optional[FirstAgentOutput]:
+        """
+        Convert the task identifier crew output into a FirstAgentOutput.
+        
+        Args:
+            crew_output: Result of the task identifier crew
+            
+        Returns:
+            FirstAgentOutput or None if the query was conversational
+            
+        Raises:
+            InvalidParamsError: If the LLM left a slot of the chosen task empty or malformed, or chose another method
+        """
+        output = crew_output.to_dict()
+        if not output.get("task"):
+            return None
+        task = output["task"]
+        return FirstAgentOutput(task=task, data=expand_task_data(task, output.get("data") or {}))
+    
+    def identify_task(self, user_input: str, session_id: Optional[str] = None,
+                      memory: Optional[ConversationMemory] = None) -> Tuple[Optional[FirstAgentOutput], Optional[str]]:
+        """
+        Identify the task for a query, using the LLM only when the router cannot.
         
         Args:
             user_input: The user's input string
+            session_id: Session the query belongs to
+            memory: The session's conversation memory, None for no context
             
         Returns:
-            dict: Response data
+            tuple: The identified task (or None) and the conversational answer (or None)
         """
-        # Add user input to memory
-        conversation_memory.add_user_message(user_input)
+        if QUERY_SINGLE_FLIGHT:
+            key = (session_id, normalize_query(user_input))
+            result, _ = query_flight.do(key, lambda: self._identify_task(user_input, memory))
+            return result
+        return self._identify_task(user_input, memory)
+    
+    def _identify_task(self, user_input: str, memory: Optional[ConversationMemory]) -> Tuple[Optional[FirstAgentOutput], Optional[str]]:
+        """Run the router and, if needed, the task identifier crew."""
+        # Try the deterministic router before paying for an LLM call
+        with span("route"):
+            task_result = intent_router.route(user_input) if ENABLE_FAST_ROUTER else None
+        if task_result is not None:
+            return task_result, None
+        
+        # The current query is the last message in memory; the rest is its context
+        history = memory.get_memory() if memory is not None else []
+        scope = memory_scope(history[:-1] if memory is not None else history)
+        cached_answer = answer_cache.get(user_input, scope)
+        if cached_answer is not None:
+            return None, cached_answer
         
         # Prepare inputs for the task identifier
         inputs = {
             "text": user_input, 
-            "task_params_map": TASK_PARAMS_MAP, 
-            "memory": conversation_memory.get_memory()
+            "task_params_map": format_catalog(select_tasks(user_input)), 
+            "memory": history
         }
         
         # Identify the task
-        task_result = self.task_identifier_crew.kickoff(inputs=inputs)
+        with self.identifier_pool.checkout() as crew:
+            crew_output = self.kickoff(crew, "identify", inputs)
+        task_result = self.parse_identification(crew_output)
+        if task_result is None:
+            answer_cache.put(user_input, scope, crew_output.raw)
+            return None, crew_output.raw
+        return task_result, None
+    
+    @staticmethod
+    def render_task(task_result: FirstAgentOutput, response: Dict[str, Any]) -> Optional[str]:
+        """
+        Render an RPC response for an identified task without the LLM.
         
-        # Handle conversational responses (no blockchain task needed)
-        if not hasattr(task_result, 'task') or not task_result.task:
-            conversation_memory.add_assistant_message(task_result.raw)
-            return {"response": task_result.raw, "task_executed": None}
+        Args:
+            task_result: The identified task
+            response: The JSON-RPC response
+            
+        Returns:
+            str or None if the result could not be rendered
+        """
+        try:
+            with span("render"):
+                return render_result(task_result.task, task_result.data, response)
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            print(f'Error rendering {task_result.task}: {e}')
+            return None
+    
+    def phrase_response(self, user_input: str, task_result: FirstAgentOutput, response: Dict[str, Any]) -> str:
+        """
+        Phrase an RPC response that was already fetched with the LLM, without running any tool.
         
-        # If a valid blockchain task is identified, execute it
-        if task_result.task in self.task_map:
-            task = self.task_map[task_result.task]
+        Args:
+            user_input: The user's input string
+            task_result: The identified task
+            response: The JSON-RPC response
+            
+        Returns:
+            str: The LLM's answer
+        """
+        messages = phrasing_messages(user_input, task_result, response)
+        with span("phrase"):
+            answer = "".join(stream_completion(self.get_agent.llm, messages))
+        record_llm_tokens("phrase", estimate_tokens(messages), estimate_tokens(answer))
+        return answer
+    
+    def submit_airdrop(self, task_result: FirstAgentOutput) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Submit an airdrop as a background job instead of waiting for its confirmation.
+        
+        Args:
+            task_result: The identified requestAirdrop task
             
-            # Create a crew for the specific blockchain task
-            blockchain_crew = Crew(
-                agents=[self.get_agent],
-                tasks=[task],
-                memory=True,
-                verbose=True,
-                llm=self.task_define_agent.llm
-            )
+        Returns:
+            tuple: The RPC response and the response dict, with the job id if the airdrop was accepted
+        """
+        response, job = airdrop_jobs.submit_airdrop(task_result.data)
+        answer = self.render_task(task_result, response) or f"Unable to render result for task: {task_result.task}"
+        result = {"task_executed": task_result.task, "data_used": task_result.data}
+        if job is not None:
+            answer += f" Its confirmation and the updated balance are reported at /jobs/{job.id}."
+            result["job_id"] = job.id
+        return response, dict(result, response=answer)
+    
+    def process_query(self, user_input: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Process a user query through the crew workflow.
+        
+        Args:
+            user_input: The user's input string
+            session_id: Session whose conversation memory provides context
             
-            # Execute the blockchain task
-            blockchain_result = blockchain_crew.kickoff(inputs={"data": task_result.data})
+        Returns:
+            dict: Response data
+        """
+        conversation_memory = memory_store.get(session_id)
+        
+        # Add user input to memory
+        conversation_memory.add_user_message(user_input)
+        
+        task_result, answer = self.identify_task(user_input, session_id, conversation_memory)
+        
+        # Handle conversational responses (no blockchain task needed)
+        if task_result is None:
+            conversation_memory.add_assistant_message(answer)
+            return {"response": answer, "task_executed": None}
+        
+        # Airdrops return a job at once; the transaction is confirmed in the background
+        if AIRDROP_JOBS_ENABLED and task_result.task == "requestAirdrop":
+            _, result = self.submit_airdrop(task_result)
+            conversation_memory.add_assistant_message(result["response"])
+            return result
+        
+        # Render structured results directly unless LLM phrasing was requested
+        if not LLM_RENDERING and has_renderer(task_result.task):
+            response = call_rpc(task_result.data)
+            answer = self.render_task(task_result, response)
+            if answer is None:
+                # The call already ran and may have changed state, so only its phrasing is left to the LLM
+                answer = self.phrase_response(user_input, task_result, response)
+            conversation_memory.add_assistant_message(answer)
+            return {
+                "response": answer,
+                "task_executed": task_result.task,
+                "data_used": task_result.data
+            }
+        
+        # If a valid blockchain task is identified, execute it
+        if task_result.task in self.task_pools:
+            # Execute the blockchain task on a pooled crew
+            with self.task_pools[task_result.task].checkout() as blockchain_crew:
+                blockchain_result = self.kickoff(blockchain_crew, "blockchain_crew", {"data": task_result.data})
             
             # Add result to memory
             conversation_memory.add_assistant_message(blockchain_result.raw)
@@ -92,6 +314,130 @@ class BlockchainCrew:
             error_message = f"Unable to process task: {task_result.task}"
             conversation_memory.add_assistant_message(error_message)
             return {"response": error_message, "task_executed": None}
+    
+    def stream_query(self, user_input: str, session_id: Optional[str] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Process a user query, yielding events as each stage completes.
+        
+        Events are ("task", {"task", "data"}) once the task is identified,
+        ("rpc_result", response) once the RPC call returns, ("token", text) for
+        each piece of the answer and finally ("final", response dict) with the
+        same fields as :meth:`process_query`. Conversational queries skip the
+        task and RPC events.
+        
+        Args:
+            user_input: The user's input string
+            session_id: Session whose conversation memory provides context
+            
+        Returns:
+            Iterator of (event name, payload) tuples
+        """
+        conversation_memory = memory_store.get(session_id)
+        conversation_memory.add_user_message(user_input)
+        
+        task_result, answer = self.identify_task(user_input, session_id, conversation_memory)
+        if task_result is None:
+            for token in split_tokens(answer):
+                yield "token", token
+            conversation_memory.add_assistant_message(answer)
+            yield "final", {"response": answer, "task_executed": None}
+            return
+        
+        if task_result.task not in self.task_pools and not has_renderer(task_result.task):
+            error_message = f"Unable to process task: {task_result.task}"
+            conversation_memory.add_assistant_message(error_message)
+            yield "final", {"response": error_message, "task_executed": None}
+            return
+        
+        yield "task", {"task": task_result.task, "data": task_result.data}
+        if AIRDROP_JOBS_ENABLED and task_result.task == "requestAirdrop":
+            response, result = self.submit_airdrop(task_result)
+            yield "rpc_result", response
+            for token in split_tokens(result["response"]):
+                yield "token", token
+            conversation_memory.add_assistant_message(result["response"])
+            yield "final", result
+            return
+        
+        response = call_rpc(task_result.data)
+        yield "rpc_result", response
+        
+        answer = None
+        if not LLM_RENDERING and has_renderer(task_result.task):
+            answer = self.render_task(task_result, response)
+            if answer is not None:
+                for token in split_tokens(answer):
+                    yield "token", token
+        if answer is None:
+            # The RPC result is already known, so the LLM only has to phrase it
+            parts = []
+            messages = phrasing_messages(user_input, task_result, response)
+            start = time.perf_counter()
+            for token in stream_completion(self.get_agent.llm, messages):
+                parts.append(token)
+                yield "token", token
+            answer = "".join(parts)
+            STAGE_SECONDS.observe(time.perf_counter() - start, stage="stream_phrase")
+            record_llm_tokens("stream_phrase", estimate_tokens(messages), estimate_tokens(answer))
+        
+        conversation_memory.add_assistant_message(answer)
+        yield "final", {
+            "response": answer,
+            "task_executed": task_result.task,
+            "data_used": task_result.data
+        }
+    
+    def process_batch(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Process several independent queries, coalescing their RPC calls.
+        
+        Tasks are identified concurrently, identical JSON-RPC payloads are
+        deduplicated and all remaining calls are sent as a single JSON-RPC batch.
+        Results are rendered deterministically and returned in request order.
+        Batch queries are not recorded in the conversation memory.
+        
+        Args:
+            queries: The user's input strings
+            
+        Returns:
+            list: One response dict per query, with an "error" key for failed items
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(queries)
+        identified: List[Tuple[int, FirstAgentOutput]] = []
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(len(queries), BATCH_IDENTIFY_WORKERS))) as pool:
+            # Each identification runs in a copy of the caller's context to keep its priority and deadline
+            futures = [pool.submit(contextvars.copy_context().run, self.identify_task, query) for query in queries]
+            for index, future in enumerate(futures):
+                try:
+                    task_result, answer = future.result()
+                except Exception as e:
+                    results[index] = {"response": f"Error processing query: {str(e)}", "task_executed": None, "error": str(e)}
+                    continue
+                if task_result is None:
+                    results[index] = {"response": answer, "task_executed": None}
+                elif not has_renderer(task_result.task):
+                    error_message = f"Unable to process task: {task_result.task}"
+                    results[index] = {"response": error_message, "task_executed": None, "error": error_message}
+                else:
+                    identified.append((index, task_result))
+        
+        responses = call_rpc_batch([task_result.data for _, task_result in identified])
+        for (index, task_result), response in zip(identified, responses):
+            answer = self.render_task(task_result, response)
+            result = {
+                "response": answer if answer is not None else f"Unable to render result for task: {task_result.task}",
+                "task_executed": task_result.task,
+                "data_used": task_result.data
+            }
+            if isinstance(response, dict) and "error" in response:
+                result["error"] = result["response"]
+            elif AIRDROP_JOBS_ENABLED and task_result.task == "requestAirdrop" and isinstance(response.get("result"), str):
+                address, lamports = task_result.data["params"][:2]
+                result["job_id"] = airdrop_jobs.track(address, lamports, response["result"]).id
+            results[index] = result
+        
+        return results
 
 def create_blockchain_crew(task_define_agent, get_agent, get_task, task_map):
     """
@@ -0,0 +1,132 @@
+"""
+Pools of pre-built Crew instances reused across requests.
+
+Constructing a Crew with ``memory=True`` initializes its memory stores, which
+costs tens to hundreds of milliseconds. A pool builds crews once (lazily, up to
+a maximum size) and hands them out one request at a time. ``Crew.kickoff``
+interpolates inputs into its agents and tasks and stores task outputs in place,
+so every pooled crew owns its own copies of them and is never used by two
+requests at once.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List
+
+from app.config.settings import CREW_POOL_SIZE
+
+
+class CrewPool:
+    """Thread-safe pool of interchangeable crews built by a factory."""
+
+    def __init__(self, name: str, factory: Callable[[], Any], max_size: int = CREW_POOL_SIZE):
+        """
+        Initialize an empty pool.
+
+        Args:
+            name: Label used when reporting statistics
+            factory: Callable building a new, independent crew
+            max_size: Maximum number of crews built; checkouts block beyond it
+        """
+        self.name = name
+        self.factory = factory
+        self.max_size = max(1, max_size)
+        self._condition = threading.Condition()
+        self._idle: List[Any] = []
+        self.built = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.build_seconds = 0.0
+
+    def _build(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return self.factory()
+        finally:
+            with self._condition:
+                self.build_seconds += time.perf_counter() - start
+
+    def warm(self, count: int = 1) -> None:
+        """
+        Build crews ahead of the first request.
+
+        Args:
+            count: Number of idle crews to have available, capped at max_size
+        """
+        while True:
+            with self._condition:
+                if len(self._idle) >= count or self.built >= self.max_size:
+                    return
+                self.built += 1
+            try:
+                crew = self._build()
+            except BaseException:
+                with self._condition:
+                    self.built -= 1
+                raise
+            with self._condition:
+                self._idle.append(crew)
+                self._condition.notify()
+
+    def acquire(self) -> Any:
+        """
+        Take a crew out of the pool, building one if none is idle.
+
+        Returns:
+            A crew owned by the caller until :meth:`release`
+        """
+        with self._condition:
+            self.checkouts += 1
+            if not self._idle and self.built >= self.max_size:
+                self.waits += 1
+                while not self._idle and self.built >= self.max_size:
+                    self._condition.wait()
+            if self._idle:
+                return self._idle.pop()
+            self.built += 1
+
+        try:
+            return self._build()
+        except BaseException:
+            with self._condition:
+                self.built -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, crew: Any) -> None:
+        """
+        Return a crew to the pool.
+
+        Args:
+            crew: A crew obtained from :meth:`acquire`
+        """
+        with self._condition:
+            self._idle.append(crew)
+            self._condition.notify()
+
+    @contextmanager
+    def checkout(self) -> Iterator[Any]:
+        """Context manager holding a crew for the duration of one request."""
+        crew = self.acquire()
+        try:
+            yield crew
+        finally:
+            self.release(crew)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            dict: Crews built, idle and in use, checkouts, waits and build time
+        """
+        with self._condition:
+            return {
+                "built": self.built,
+                "idle": len(self._idle),
+                "in_use": self.built - len(self._idle),
+                "max_size": self.max_size,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "build_seconds": round(self.build_seconds, 4),
+            }
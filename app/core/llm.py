@@ -0,0 +1,33 @@
+"""
+LLM client that waits for the client-side LLM quota before every call.
+"""
+from typing import Any, Dict, List, Union
+
+from crewai import LLM
+
+from app.config.settings import LLM_COMPLETION_TOKEN_ESTIMATE
+from app.utils.rate_limit import llm_limiter
+from app.utils.tokens import estimate_tokens
+
+
+def llm_costs(messages: Union[str, List[Dict[str, str]]], max_tokens: Any = None) -> Dict[str, float]:
+    """
+    Quota cost of one LLM call: a request plus prompt and expected completion tokens.
+
+    Args:
+        messages: Prompt string or chat messages
+        max_tokens: Completion limit of the call, if set
+
+    Returns:
+        dict: Cost for the LLM limiter
+    """
+    completion = max_tokens or LLM_COMPLETION_TOKEN_ESTIMATE
+    return {"requests": 1, "tokens": estimate_tokens(messages) + completion}
+
+
+class RateLimitedLLM(LLM):
+    """crewai LLM whose calls are admitted through the shared LLM limiter."""
+
+    def call(self, messages, *args, **kwargs):
+        llm_limiter.acquire(llm_costs(messages, self.max_tokens))
+        return super().call(messages, *args, **kwargs)
@@ -1,45 +1,386 @@
 """
 Memory management for conversation context.
+
+Active sessions are held in process memory, bounded by an LRU policy. When a
+persistent backend is configured, every message is also written to it, and a
+session that is not in memory is restored from its most recent messages.
+Requests without a session get a memory of their own that is never stored.
 """
-from typing import List, Dict, Any
+import threading
+import time
+from collections import OrderedDict, deque
+from functools import partial
+from typing import Callable, Deque, List, Dict, Any, Optional
+
+from app.config.settings import (
+    MEMORY_TOKEN_BUDGET,
+    MEMORY_SUMMARY_TOKENS,
+    MEMORY_SESSION_IDLE_SECONDS,
+    MEMORY_MAX_SESSIONS,
+    MEMORY_MAX_TOTAL_TOKENS,
+    MEMORY_LOAD_MESSAGES,
+    MEMORY_BACKEND,
+    MEMORY_DB_URL,
+    SHARED_STATE,
+)
+from app.core.memory_backends import MemoryBackend, create_memory_backend
+from app.utils.shared_state import SharedState, SharedStateError, shared_state
+from app.utils.text import summarize
+from app.utils.tokens import estimate_tokens
+
+# Tokens each folded message is condensed to in the rolling summary
+SUMMARY_LINE_TOKENS = 32
+
+# Shared state key prefix of session version counters
+SESSION_VERSION_KEY = "memory:version:"
+
+
+def check_shared_memory(shared: str = SHARED_STATE, backend: str = MEMORY_BACKEND, url: str = MEMORY_DB_URL) -> None:
+    """
+    Check that conversations are stored where every worker sharing them can read them.
+
+    Redis shared state is meant for workers on several hosts. A worker reloads a
+    session from the memory backend when another worker has added to it, so the
+    backend must be a database every host reaches, not a local SQLite file.
+
+    Args:
+        shared: Shared state backend name
+        backend: Memory backend name
+        url: Memory database URL
+
+    Raises:
+        ValueError: If Redis shared state is combined with a local SQLite memory database
+    """
+    if shared == "redis" and backend == "sqlite" and url.startswith("sqlite"):
+        raise ValueError(
+            f"SHARED_STATE=redis shares sessions across hosts, but MEMORY_DB_URL={url} is local to this host; "
+            "point MEMORY_DB_URL at a database every host can reach, or use SHARED_STATE=sqlite on a single host"
+        )
+
 
 class ConversationMemory:
-    """Class to manage conversation history and context."""
-    
-    def __init__(self):
-        """Initialize an empty conversation memory."""
-        self.memory: List[Dict[str, str]] = []
-    
+    """
+    Class to manage conversation history and context for one session.
+
+    Recent messages are kept verbatim within a token budget. Older messages are
+    condensed to their most informative sentences and folded into a rolling
+    summary, which is itself capped, so the memory passed into prompts never
+    exceeds ``token_budget + summary_budget`` tokens.
+    """
+
+    def __init__(self, token_budget: int = MEMORY_TOKEN_BUDGET, summary_budget: int = MEMORY_SUMMARY_TOKENS,
+                 persist: Optional[Callable[[str, str], None]] = None,
+                 on_resize: Optional[Callable[[int], None]] = None):
+        """
+        Initialize an empty conversation memory.
+
+        Args:
+            token_budget: Token budget for verbatim recent messages
+            summary_budget: Token budget for the summary of older messages
+            persist: Called with the role and content of every added message
+            on_resize: Called with the change of the token count after every change
+        """
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.persist = persist
+        self.on_resize = on_resize
+        # Shared version this copy reflects, None if unknown
+        self.version: Optional[int] = None
+        self.memory: Deque[Dict[str, str]] = deque()
+        self.summary: Deque[str] = deque()
+        self.message_tokens = 0
+        self.summary_tokens = 0
+        self.last_access = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def token_count(self) -> int:
+        """Estimated tokens held by this session."""
+        return self.message_tokens + self.summary_tokens
+
+    def _append(self, role: str, content: str) -> None:
+        if self.persist is not None:
+            self.persist(role, content)
+        self._add(role, content)
+
+    def _add(self, role: str, content: str) -> None:
+        with self._lock:
+            before = self.token_count
+            self.memory.append({"role": role, "content": content})
+            self.message_tokens += estimate_tokens(content)
+            # Always keep the latest message, even if it alone exceeds the budget
+            while self.message_tokens > self.token_budget and len(self.memory) > 1:
+                self._fold(self.memory.popleft())
+            self.last_access = time.monotonic()
+            change = self.token_count - before
+        if self.on_resize is not None and change:
+            self.on_resize(change)
+
+    def _fold(self, message: Dict[str, str]) -> None:
+        """Move a message out of the window into the rolling summary."""
+        self.message_tokens -= estimate_tokens(message["content"])
+        line = f"{message['role']}: {summarize(message['content'], SUMMARY_LINE_TOKENS)}"
+        self.summary.append(line)
+        self.summary_tokens += estimate_tokens(line)
+        while self.summary_tokens > self.summary_budget and self.summary:
+            self.summary_tokens -= estimate_tokens(self.summary.popleft())
+
     def add_user_message(self, content: str) -> None:
         """
         Add a user message to the conversation memory.
-        
+
         Args:
             content: The content of the user message
         """
-        self.memory.append({"role": "user", "content": content})
-    
+        self._append("user", content)
+
     def add_assistant_message(self, content: str) -> None:
         """
         Add an assistant message to the conversation memory.
-        
+
         Args:
             content: The content of the assistant message
         """
-        self.memory.append({"role": "assistant", "content": content})
-    
+        self._append("assistant", content)
+
+    def restore(self, messages: List[Dict[str, str]]) -> None:
+        """
+        Replay stored messages into the window without persisting them again.
+
+        Args:
+            messages: Message dictionaries, oldest first
+        """
+        for message in messages:
+            self._add(message["role"], message["content"])
+
     def get_memory(self) -> List[Dict[str, str]]:
         """
         Get the current conversation memory.
-        
+
         Returns:
-            List of message dictionaries
+            List of message dictionaries, preceded by a summary of older turns if any
         """
-        return self.memory
-    
+        with self._lock:
+            self.last_access = time.monotonic()
+            messages = list(self.memory)
+            if self.summary:
+                summary = "Summary of earlier conversation: " + " | ".join(self.summary)
+                messages.insert(0, {"role": "system", "content": summary})
+            return messages
+
     def clear_memory(self) -> None:
         """Clear all conversation memory."""
-        self.memory = []
+        with self._lock:
+            change = -self.token_count
+            self.memory = deque()
+            self.summary = deque()
+            self.message_tokens = 0
+            self.summary_tokens = 0
+        if self.on_resize is not None and change:
+            self.on_resize(change)
+
+
+class SessionMemoryStore:
+    """
+    Registry of per-session conversation memories.
+
+    Sessions idle for longer than ``idle_seconds`` are evicted, and the least
+    recently used sessions are dropped whenever the number of sessions or the
+    total token count across all sessions exceeds its cap. Sessions are kept
+    in LRU order and the total is kept up to date as messages are added, so
+    enforcing the limits only looks at the least recently used sessions. With a backend,
+    evicted sessions are only dropped from memory and are restored from the
+    backend when they are used again.
+
+    With a shared state as well, several worker processes can serve the same
+    sessions: every message is written through to the backend and bumps the
+    session's version counter, and a worker whose copy is behind the counter
+    reloads the session from the backend.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = MEMORY_TOKEN_BUDGET,
+        summary_budget: int = MEMORY_SUMMARY_TOKENS,
+        idle_seconds: float = MEMORY_SESSION_IDLE_SECONDS,
+        max_sessions: int = MEMORY_MAX_SESSIONS,
+        max_total_tokens: int = MEMORY_MAX_TOTAL_TOKENS,
+        backend: Optional[MemoryBackend] = None,
+        load_messages: int = MEMORY_LOAD_MESSAGES,
+        shared: Optional[SharedState] = None,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            token_budget: Per-session token budget for recent messages
+            summary_budget: Per-session token budget for the rolling summary
+            idle_seconds: Seconds of inactivity after which a session is evicted
+            max_sessions: Maximum number of sessions held in memory
+            max_total_tokens: Hard cap on estimated tokens across all sessions
+            backend: Persistent storage for messages, None to keep them in memory only
+            load_messages: Most recent messages restored when a stored session is resumed
+            shared: State shared with other workers; only used together with a backend
+        """
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.idle_seconds = idle_seconds
+        self.max_sessions = max_sessions
+        self.max_total_tokens = max_total_tokens
+        self.backend = backend
+        self.load_messages = load_messages
+        self.shared = shared if backend is not None else None
+        self._sessions: "OrderedDict[str, ConversationMemory]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Estimated tokens across the registered sessions
+        self._tokens = 0
+        self.evictions = 0
+
+    def get(self, session_id: Optional[str] = None) -> ConversationMemory:
+        """
+        Get the memory for a session, creating it if needed.
+
+        Args:
+            session_id: Session identifier; without one, a new memory that is
+                neither registered nor stored is returned
+
+        Returns:
+            ConversationMemory: The session's memory
+        """
+        if not session_id:
+            # Anonymous requests must not see each other's history
+            return ConversationMemory(self.token_budget, self.summary_budget)
+        version = self._shared_version(session_id)
+        with self._lock:
+            memory = self._touch(session_id, version)
+        if memory is not None:
+            return memory
+
+        # Read the stored window outside the lock so other sessions are not held up
+        stored = self.backend.load(session_id, self.load_messages) if self.backend is not None else []
+        with self._lock:
+            memory = self._touch(session_id, version)
+            if memory is None:
+                memory = ConversationMemory(self.token_budget, self.summary_budget)
+                if self.backend is not None:
+                    memory.persist = partial(self._persist, session_id, memory)
+                memory.restore(stored)
+                memory.version = version
+                memory.on_resize = partial(self._resize, session_id, memory)
+                self._sessions[session_id] = memory
+                self._tokens += memory.token_count
+                memory.last_access = time.monotonic()
+                self._enforce_limits(keep=session_id)
+            return memory
+
+    def _resize(self, session_id: str, memory: ConversationMemory, change: int) -> None:
+        """Add a session's token count change to the total while the session is registered."""
+        with self._lock:
+            if self._sessions.get(session_id) is memory:
+                self._tokens += change
+
+    def _shared_version(self, session_id: str) -> Optional[int]:
+        """Current version of a session across workers, None without (or on failure of) the shared state."""
+        if self.shared is None:
+            return None
+        try:
+            return int(self.shared.get(SESSION_VERSION_KEY + session_id) or 0)
+        except SharedStateError as e:
+            print(f'Error reading session version: {e}')
+            return None
+
+    def _persist(self, session_id: str, memory: ConversationMemory, role: str, content: str) -> None:
+        """Store a message; with a shared state, make it visible to other workers before returning."""
+        self.backend.append(session_id, role, content)
+        if self.shared is None:
+            return
+        try:
+            self.backend.flush()
+            version = self.shared.incr(SESSION_VERSION_KEY + session_id)
+        except SharedStateError as e:
+            print(f'Error updating session version: {e}')
+            return
+        # If another worker wrote in between, this copy misses its message and is reloaded on next use
+        expected = memory.version + 1 if memory.version is not None else None
+        memory.version = version if version == expected else None
+
+    def _touch(self, session_id: str, version: Optional[int] = None) -> Optional[ConversationMemory]:
+        """Return a session held in memory and up to date, marking it as most recently used."""
+        memory = self._sessions.get(session_id)
+        if memory is not None and version is not None and memory.version != version:
+            self._drop(session_id)
+            return None
+        if memory is not None:
+            self._sessions.move_to_end(session_id)
+            memory.last_access = time.monotonic()
+            self._enforce_limits(keep=session_id)
+        return memory
+
+    def _drop(self, session_id: str) -> None:
+        """Unregister a session; called with the lock held."""
+        self._tokens -= self._sessions.pop(session_id).token_count
+
+    def _enforce_limits(self, keep: str) -> None:
+        """Evict idle sessions from the LRU head, then least recently used ones while over the caps."""
+        now = time.monotonic()
+        while self._sessions:
+            session_id, memory = next(iter(self._sessions.items()))
+            # Sessions behind the head were used more recently, so the first active one ends the scan
+            if session_id == keep or now - memory.last_access <= self.idle_seconds:
+                break
+            self._drop(session_id)
+            self.evictions += 1
+
+        while len(self._sessions) > 1 and (
+            len(self._sessions) > self.max_sessions or self._tokens > self.max_total_tokens
+        ):
+            session_id = next(iter(self._sessions))
+            if session_id == keep:
+                self._sessions.move_to_end(session_id)
+                session_id = next(iter(self._sessions))
+            self._drop(session_id)
+            self.evictions += 1
+
+    def clear(self, session_id: Optional[str] = None) -> None:
+        """
+        Drop a session's memory, or every session if no id is given.
+
+        Only the in-memory copy is dropped; stored messages are kept.
+
+        Args:
+            session_id: Session identifier
+        """
+        with self._lock:
+            if session_id is None:
+                self._sessions.clear()
+                self._tokens = 0
+            elif session_id in self._sessions:
+                self._drop(session_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get memory usage statistics.
+
+        Returns:
+            dict: Session count, total estimated tokens and evictions
+        """
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "tokens": self._tokens,
+                "max_sessions": self.max_sessions,
+                "max_total_tokens": self.max_total_tokens,
+                "evictions": self.evictions,
+                "storage": self.backend.stats() if self.backend is not None else None,
+            }
+
+    def close(self) -> None:
+        """Write buffered messages and close the backend."""
+        if self.backend is not None:
+            self.backend.close()
 
-# Create memory instance
-conversation_memory = ConversationMemory()
\ No newline at end of file
+# Create memory store instance; sessions are only shared between workers through a persistent backend
+memory_store = SessionMemoryStore(
+    backend=create_memory_backend(),
+    shared=shared_state if MEMORY_BACKEND != "memory" else None,
+)
@@ -0,0 +1,229 @@
+"""
+Persistent storage backends for conversation memory.
+
+The session store keeps active sessions in process memory and uses a backend
+to make conversations survive restarts. Appended messages are buffered and
+written behind in batches by a background thread, so adding a message never
+waits on disk, and a session that is not in memory is restored from the last
+few messages only, however long its history.
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import (
+    MEMORY_BACKEND,
+    MEMORY_DB_URL,
+    MEMORY_FLUSH_SECONDS,
+    MEMORY_FLUSH_BATCH,
+)
+
+Message = Dict[str, str]
+
+
+class MemoryBackend:
+    """Interface of conversation storage; the base class stores nothing."""
+
+    name = "memory"
+
+    def append(self, session_id: str, role: str, content: str) -> None:
+        """
+        Record a message of a session.
+
+        Args:
+            session_id: Session identifier
+            role: "user" or "assistant"
+            content: Message text
+        """
+
+    def load(self, session_id: str, limit: int) -> List[Message]:
+        """
+        Load the most recent messages of a session.
+
+        Args:
+            session_id: Session identifier
+            limit: Maximum number of messages to load
+
+        Returns:
+            list: Message dictionaries, oldest first
+        """
+        return []
+
+    def flush(self) -> None:
+        """Write any buffered messages."""
+
+    def close(self) -> None:
+        """Flush and release resources."""
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get backend statistics.
+
+        Returns:
+            dict: Backend name and write counters
+        """
+        return {"backend": self.name}
+
+
+class SQLiteMemoryBackend(MemoryBackend):
+    """
+    Conversation storage in a SQL database through SQLAlchemy, SQLite by default.
+
+    Messages are buffered and inserted in one transaction per batch, either
+    every ``flush_interval`` seconds or as soon as ``batch_size`` messages are
+    waiting. Loading a session first writes its own buffered messages, so
+    reads always see every message that was appended.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, url: str = MEMORY_DB_URL, flush_interval: float = MEMORY_FLUSH_SECONDS,
+                 batch_size: int = MEMORY_FLUSH_BATCH):
+        """
+        Configure the backend; the database is opened on first use.
+
+        Args:
+            url: SQLAlchemy database URL
+            flush_interval: Seconds between background writes
+            batch_size: Buffered messages that trigger an early write
+        """
+        self.url = url
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.written = 0
+        self.failed_flushes = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._engine = None
+        self._table = None
+        self._writer: Optional[threading.Thread] = None
+
+    def _connect(self):
+        """Create the engine and table on first use."""
+        if self._engine is not None:
+            return self._engine
+        # Imported here so that importing the memory module does not load SQLAlchemy
+        from sqlalchemy import Column, Float, Index, Integer, MetaData, String, Table, Text, create_engine, event
+
+        metadata = MetaData()
+        table = Table(
+            "conversation_messages", metadata,
+            Column("id", Integer, primary_key=True, autoincrement=True),
+            Column("session_id", String(255), nullable=False),
+            Column("role", String(16), nullable=False),
+            Column("content", Text, nullable=False),
+            Column("created_at", Float, nullable=False),
+            Index("ix_conversation_messages_session", "session_id", "id"),
+        )
+        engine = create_engine(self.url, connect_args={"check_same_thread": False} if self.url.startswith("sqlite") else {})
+        if self.url.startswith("sqlite"):
+            @event.listens_for(engine, "connect")
+            def configure(connection, _record):
+                # Readers are not blocked by the writer, and commits do not fsync on every batch
+                cursor = connection.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.close()
+        metadata.create_all(engine)
+        self._table = table
+        self._engine = engine
+        return engine
+
+    def append(self, session_id: str, role: str, content: str) -> None:
+        with self._lock:
+            self._pending.append({"session_id": session_id, "role": role, "content": content,
+                                  "created_at": time.time()})
+            pending = len(self._pending)
+            if self._writer is None and not self._closed:
+                self._writer = threading.Thread(target=self._write_behind, name="memory-writer", daemon=True)
+                self._writer.start()
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def _write_behind(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            with self._lock:
+                rows, self._pending = self._pending, []
+            if not rows:
+                return
+            try:
+                engine = self._connect()
+                with engine.begin() as connection:
+                    connection.execute(self._table.insert(), rows)
+            except Exception as e:
+                print(f'Error writing conversation memory: {e}')
+                self.failed_flushes += 1
+                # Keep the messages for the next attempt, ahead of newer ones
+                with self._lock:
+                    self._pending[:0] = rows
+                return
+            self.written += len(rows)
+
+    def load(self, session_id: str, limit: int) -> List[Message]:
+        with self._lock:
+            buffered = any(row["session_id"] == session_id for row in self._pending)
+        if buffered:
+            self.flush()
+        from sqlalchemy import select
+
+        try:
+            # Holding the flush lock waits out a batch that is being written
+            with self._flush_lock:
+                engine = self._connect()
+                table = self._table
+                query = (
+                    select(table.c.role, table.c.content)
+                    .where(table.c.session_id == session_id)
+                    .order_by(table.c.id.desc())
+                    .limit(limit)
+                )
+                with engine.connect() as connection:
+                    rows = connection.execute(query).all()
+        except Exception as e:
+            print(f'Error loading conversation memory: {e}')
+            return []
+        return [{"role": role, "content": content} for role, content in reversed(rows)]
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        if self._writer is not None:
+            self._writer.join(timeout=5)
+        self.flush()
+        if self._engine is not None:
+            self._engine.dispose()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending)
+        return {"backend": self.name, "pending": pending, "written": self.written,
+                "failed_flushes": self.failed_flushes}
+
+
+def create_memory_backend(name: str = MEMORY_BACKEND) -> MemoryBackend:
+    """
+    Create the configured memory backend.
+
+    Args:
+        name: "sqlite" for persistent storage, "memory" for process memory only
+
+    Returns:
+        MemoryBackend: The backend
+
+    Raises:
+        ValueError: If the name is not a known backend
+    """
+    if name == "sqlite":
+        return SQLiteMemoryBackend()
+    if name == "memory":
+        return MemoryBackend()
+    raise ValueError(f"Unknown memory backend: {name}")
@@ -0,0 +1,375 @@
+"""
+Deterministic renderers that turn JSON-RPC results into natural language.
+
+Each renderer receives the JSON-RPC request that was sent and the decoded
+response, and returns the sentence shown to the user. Renderers are registered
+per task name so the blockchain agent's LLM hop can be skipped for structured
+results.
+"""
+import base64
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+
+from app.utils.reducers import summarize_program_accounts, summarize_token_accounts
+from app.utils.solana import LAMPORTS_PER_SOL
+
+Renderer = Callable[[Dict[str, Any], Any], str]
+
+RENDERERS: Dict[str, Renderer] = {}
+
+MAX_LISTED_ITEMS = 10
+MAX_LISTED_BALANCES = 100
+
+
+def renderer(task_name: str) -> Callable[[Renderer], Renderer]:
+    """
+    Register a renderer for a task.
+
+    Args:
+        task_name: Task name as used in TASK_PARAMS_MAP
+
+    Returns:
+        Decorator registering the function
+    """
+    def register(func: Renderer) -> Renderer:
+        RENDERERS[task_name] = func
+        return func
+    return register
+
+
+def has_renderer(task_name: str) -> bool:
+    """Check whether a task can be rendered without the LLM."""
+    return task_name in RENDERERS
+
+
+def format_amount(value: Any, decimals: int = 0) -> str:
+    """Format an integer amount in base units as a decimal string with separators."""
+    amount = Decimal(int(value)) / (Decimal(10) ** decimals)
+    return format(amount.normalize(), ",f")
+
+
+def format_sol(lamports: Any) -> str:
+    """Format lamports as SOL."""
+    return format_amount(lamports, 9)
+
+
+def _first_param(data: Dict[str, Any]) -> Optional[str]:
+    params = data.get("params") or []
+    return params[0] if params else None
+
+
+def _value(result: Any) -> Any:
+    """Unwrap RPC results that carry a {"context", "value"} envelope."""
+    if isinstance(result, dict) and "value" in result and "context" in result:
+        return result["value"]
+    return result
+
+
+def _token_amount(amount: Dict[str, Any]) -> str:
+    ui_amount = amount.get("uiAmountString")
+    if ui_amount is None:
+        ui_amount = format_amount(amount.get("amount", 0), amount.get("decimals", 0))
+    return ui_amount
+
+
+def render_result(task_name: str, data: Dict[str, Any], response: Any) -> str:
+    """
+    Render an RPC response for a task.
+
+    Args:
+        task_name: Task name as used in TASK_PARAMS_MAP
+        data: The JSON-RPC request that was sent
+        response: The decoded JSON-RPC response
+
+    Returns:
+        str: Natural language answer
+
+    Raises:
+        KeyError: If no renderer is registered for the task
+    """
+    if isinstance(response, dict) and "error" in response:
+        error = response["error"]
+        if isinstance(error, dict):
+            return f"The Solana RPC returned an error: {error.get('message', error)}"
+        return f"Unable to complete the request: {error}"
+    if not isinstance(response, dict) or "result" not in response:
+        return "The Solana RPC returned an unexpected response."
+    return RENDERERS[task_name](data, response["result"])
+
+
+@renderer("getBalance")
+def render_balance(data: Dict[str, Any], result: Any) -> str:
+    lamports = _value(result)
+    return (
+        f"The address {_first_param(data)} has a balance of {format_sol(lamports)} SOL "
+        f"({lamports:,} lamports)."
+    )
+
+
+@renderer("getMultipleBalances")
+def render_multiple_balances(data: Dict[str, Any], result: Any) -> str:
+    addresses = _first_param(data) or []
+    accounts = _value(result) or []
+    balances = [
+        (address, account.get("lamports", 0) if isinstance(account, dict) else 0)
+        for address, account in zip(addresses, accounts)
+    ]
+    total = sum(lamports for _, lamports in balances)
+    lines = [
+        f"- {address}: {format_sol(lamports)} SOL" + ("" if account is not None else " (no account)")
+        for (address, lamports), account in zip(balances[:MAX_LISTED_BALANCES], accounts)
+    ]
+    more = len(balances) - len(lines)
+    return (
+        f"The {len(balances):,} addresses hold {format_sol(total)} SOL in total ({total:,} lamports):\n"
+        + "\n".join(lines) + (f"\n...and {more:,} more." if more > 0 else "")
+    )
+
+
+@renderer("getAccountInfo")
+def render_account_info(data: Dict[str, Any], result: Any) -> str:
+    address = _first_param(data)
+    account = _value(result)
+    if account is None:
+        return f"No account exists at {address}, so its SOL balance is 0 (greater than 0: false)."
+
+    raw = account.get("data")
+    space = account.get("space")
+    if space is None:
+        if isinstance(raw, list) and raw and raw[-1] == "base64":
+            space = len(base64.b64decode(raw[0]))
+        elif isinstance(raw, dict):
+            space = raw.get("space", 0)
+        else:
+            space = 0
+    lamports = account.get("lamports", 0)
+    kind = "an executable program" if account.get("executable") else "an account"
+    text = (
+        f"The address {address} is {kind} owned by {account.get('owner')} with a balance of "
+        f"{format_sol(lamports)} SOL and {space:,} bytes of data. "
+        f"SOL balance greater than 0: {'true' if lamports > 0 else 'false'}."
+    )
+    parsed = raw.get("parsed") if isinstance(raw, dict) else None
+    if isinstance(parsed, dict) and parsed.get("type") in PARSED_ACCOUNT_RENDERERS:
+        text += " " + PARSED_ACCOUNT_RENDERERS[parsed["type"]](parsed.get("info") or {})
+    return text
+
+
+def _describe_token_account(info: Dict[str, Any]) -> str:
+    amount = info.get("tokenAmount")
+    held = f"{_token_amount(amount)} tokens" if isinstance(amount, dict) else f"{int(info.get('amount', 0)):,} base units"
+    text = (
+        f"It is a token account for the mint {info.get('mint')}, owned by {info.get('owner')}, "
+        f"holding {held} (state: {info.get('state')})."
+    )
+    if info.get("delegate"):
+        delegated = info.get("delegatedAmount", 0)
+        delegated = _token_amount(delegated) + " tokens" if isinstance(delegated, dict) else f"{int(delegated):,} base units"
+        text += f" {info['delegate']} is delegated {delegated}."
+    if info.get("closeAuthority"):
+        text += f" Its close authority is {info['closeAuthority']}."
+    return text
+
+
+def _describe_mint(info: Dict[str, Any]) -> str:
+    decimals = info.get("decimals", 0)
+    mint_authority = info.get("mintAuthority") or "none (the supply is fixed)"
+    freeze_authority = info.get("freezeAuthority") or "none"
+    return (
+        f"It is a token mint with a supply of {format_amount(info.get('supply', 0), decimals)} tokens "
+        f"({decimals} decimals). Mint authority: {mint_authority}. Freeze authority: {freeze_authority}."
+    )
+
+
+def _describe_multisig(info: Dict[str, Any]) -> str:
+    signers = ", ".join(info.get("signers") or [])
+    return (
+        f"It is a {info.get('numRequiredSigners')}-of-{info.get('numValidSigners')} token multisig "
+        f"with signers {signers}."
+    )
+
+
+def _describe_nonce(info: Dict[str, Any]) -> str:
+    if info.get("state") != "initialized":
+        return "It is an uninitialized durable nonce account."
+    return (
+        f"It is a durable nonce account with authority {info.get('authority')}, current nonce "
+        f"{info.get('blockhash')} and a fee of {int(info.get('lamportsPerSignature', 0)):,} lamports per signature."
+    )
+
+
+# Descriptions of decoded (or jsonParsed) account data by parsed type
+PARSED_ACCOUNT_RENDERERS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "account": _describe_token_account,
+    "mint": _describe_mint,
+    "multisig": _describe_multisig,
+    "nonce": _describe_nonce,
+}
+
+
+@renderer("getHealth")
+def render_health(data: Dict[str, Any], result: Any) -> str:
+    if result == "ok":
+        return "The Solana network node is healthy."
+    return f"The Solana network node reported an unhealthy status: {result}."
+
+
+@renderer("getInflationRate")
+def render_inflation_rate(data: Dict[str, Any], result: Any) -> str:
+    return (
+        f"For epoch {result.get('epoch')}, the total inflation rate is {result.get('total', 0) * 100:.4f}%, "
+        f"with {result.get('validator', 0) * 100:.4f}% going to validators and "
+        f"{result.get('foundation', 0) * 100:.4f}% to the foundation."
+    )
+
+
+@renderer("getSupply")
+def render_supply(data: Dict[str, Any], result: Any) -> str:
+    supply = _value(result)
+    return (
+        f"The total SOL supply is {format_sol(supply.get('total', 0))} SOL, of which "
+        f"{format_sol(supply.get('circulating', 0))} SOL is circulating and "
+        f"{format_sol(supply.get('nonCirculating', 0))} SOL is non-circulating."
+    )
+
+
+@renderer("getTokenSupply")
+def render_token_supply(data: Dict[str, Any], result: Any) -> str:
+    supply = _value(result)
+    return (
+        f"The token mint {_first_param(data)} has a total supply of {_token_amount(supply)} tokens "
+        f"({int(supply.get('amount', 0)):,} base units, {supply.get('decimals', 0)} decimals)."
+    )
+
+
+@renderer("getTokenAccountBalance")
+def render_token_account_balance(data: Dict[str, Any], result: Any) -> str:
+    balance = _value(result)
+    return (
+        f"The token account {_first_param(data)} holds {_token_amount(balance)} tokens "
+        f"({int(balance.get('amount', 0)):,} base units, {balance.get('decimals', 0)} decimals)."
+    )
+
+
+@renderer("getTokenLargestAccounts")
+def render_token_largest_accounts(data: Dict[str, Any], result: Any) -> str:
+    accounts: List[Dict[str, Any]] = _value(result) or []
+    if not accounts:
+        return f"No token accounts were found for the mint {_first_param(data)}."
+    lines = [
+        f"{index}. {account.get('address')}: {_token_amount(account)}"
+        for index, account in enumerate(accounts[:MAX_LISTED_ITEMS], start=1)
+    ]
+    return (
+        f"The largest token accounts for the mint {_first_param(data)} are:\n" + "\n".join(lines)
+    )
+
+
+def _summary(result: Any, summarize: Callable[[List[Any]], Dict[str, Any]]) -> Dict[str, Any]:
+    """Summary of an account listing, reducing it here if the RPC layer did not."""
+    value = _value(result)
+    if isinstance(value, list):
+        return summarize(value)
+    return value or summarize([])
+
+
+def _more(summary: Dict[str, Any], listed: int) -> str:
+    more = summary["count"] - listed
+    if summary.get("truncated"):
+        return f"\n...and more (only the first {summary['count']:,} were read)."
+    return f"\n...and {more:,} more." if more > 0 else ""
+
+
+def _render_token_accounts(data: Dict[str, Any], result: Any, relation: str) -> str:
+    summary = _summary(result, summarize_token_accounts)
+    address = _first_param(data)
+    if not summary["count"]:
+        return f"No token accounts {relation} {address} were found."
+    lines = []
+    for entry in summary["top"][:MAX_LISTED_ITEMS]:
+        line = f"- {entry.get('pubkey')}: {_token_amount(entry.get('tokenAmount', {}))} of mint {entry.get('mint')}"
+        if entry.get("delegatedAmount"):
+            line += f" ({_token_amount(entry['delegatedAmount'])} delegated)"
+        lines.append(line)
+    empty = f", {summary['empty_accounts']:,} of them empty" if summary.get("empty_accounts") else ""
+    return (
+        f"Found {summary['count']:,} token accounts {relation} {address} across {summary['mints']:,} mints{empty}. "
+        f"Largest balances:\n" + "\n".join(lines) + _more(summary, len(lines))
+    )
+
+
+@renderer("getTokenAccountsByOwner")
+def render_token_accounts_by_owner(data: Dict[str, Any], result: Any) -> str:
+    return _render_token_accounts(data, result, "owned by")
+
+
+@renderer("getTokenAccountsByDelegate")
+def render_token_accounts_by_delegate(data: Dict[str, Any], result: Any) -> str:
+    return _render_token_accounts(data, result, "delegated to")
+
+
+@renderer("getContractMetadata")
+def render_contract_metadata(data: Dict[str, Any], result: Any) -> str:
+    summary = _summary(result, summarize_program_accounts)
+    address = _first_param(data)
+    if not summary["count"]:
+        return f"No matching accounts were found for the program {address}."
+    lines = [
+        f"- {entry.get('pubkey')}: owner {entry.get('owner')}, "
+        f"{format_sol(entry.get('lamports', 0))} SOL, {entry.get('space', 0)} bytes"
+        for entry in summary["top"][:MAX_LISTED_ITEMS]
+    ]
+    return (
+        f"The program {address} has {summary['count']:,} matching accounts holding "
+        f"{format_sol(summary['total_lamports'])} SOL in total:\n" + "\n".join(lines) + _more(summary, len(lines))
+    )
+
+
+@renderer("getTransactionDetails")
+def render_transaction(data: Dict[str, Any], result: Any) -> str:
+    signature = _first_param(data)
+    if result is None:
+        return f"The transaction {signature} was not found. It may be pending or not yet confirmed."
+    meta = result.get("meta") or {}
+    message = (result.get("transaction") or {}).get("message", {})
+    keys = [key.get("pubkey") if isinstance(key, dict) else key for key in message.get("accountKeys", [])]
+
+    status = "failed" if meta.get("err") else "succeeded"
+    block_time = result.get("blockTime")
+    when = (
+        datetime.fromtimestamp(block_time, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+        if block_time else "an unknown time"
+    )
+    parts = [
+        f"The transaction {signature} {status} in slot {result.get('slot')} at {when}, "
+        f"paying a fee of {format_sol(meta.get('fee', 0))} SOL."
+    ]
+    if keys:
+        parts.append(f"It was signed by {keys[0]}.")
+
+    changes = []
+    for key, pre, post in zip(keys, meta.get("preBalances", []), meta.get("postBalances", [])):
+        if pre != post:
+            sign = "+" if post > pre else "-"
+            changes.append(f"{key} {sign}{format_sol(abs(post - pre))} SOL")
+    if changes:
+        parts.append("Balance changes: " + ", ".join(changes[:MAX_LISTED_ITEMS]) + ".")
+    return " ".join(parts)
+
+
+@renderer("requestAirdrop")
+def render_airdrop(data: Dict[str, Any], result: Any) -> str:
+    params = data.get("params") or [None, 0]
+    return (
+        f"An airdrop of {format_sol(params[1])} SOL to {params[0]} was submitted "
+        f"with transaction signature {result}."
+    )
+
+
+@renderer("getGasPrices")
+def render_fee_for_message(data: Dict[str, Any], result: Any) -> str:
+    fee = _value(result)
+    if fee is None:
+        return "The fee could not be determined because the message's blockhash has expired."
+    return f"The fee for this message is {format_sol(fee)} SOL ({fee:,} lamports)."
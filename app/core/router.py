@@ -0,0 +1,261 @@
+"""
+Rule-based intent router that resolves unambiguous queries without the LLM.
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.tasks import FirstAgentOutput
+from app.data.task_params import TASK_PARAMS_MAP
+from app.utils.rpc_client import MUTATING_METHODS
+from app.utils.solana import (
+    TOKEN_PROGRAM_ID,
+    TOKEN_2022_PROGRAM_ID,
+    is_pubkey,
+    is_signature,
+    to_lamports,
+)
+from app.utils.templates import build_task_data
+
+CANDIDATE_RE = re.compile(r"[1-9A-HJ-NP-Za-km-z]{32,88}")
+AMOUNT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(sol|lamports?)\b", re.IGNORECASE)
+EXPLANATORY_RE = re.compile(
+    r"\b(explain|why|meaning|means?|define|definition|how (?:does|do|can|to|is))\b"
+)
+
+PROGRAM_IDS = {TOKEN_PROGRAM_ID, TOKEN_2022_PROGRAM_ID}
+
+
+class IntentRule:
+    """Keyword grammar for a single task."""
+
+    def __init__(
+        self,
+        phrases: List[str],
+        slot: Optional[str] = None,
+        excludes: Optional[List[str]] = None,
+        program: bool = False,
+        amount: bool = False,
+    ):
+        """
+        Initialize the rule.
+
+        Args:
+            phrases: Phrases of which at least one must appear in the query
+            slot: Placeholder filled from the query (a pubkey, "signature", or "addresses"
+                for two or more pubkeys), None for no input
+            excludes: Phrases that disqualify the rule
+            program: Whether the template needs a programId
+            amount: Whether the template needs an airdrop amount
+        """
+        self.phrases = [re.compile(r"\b" + re.escape(phrase) + r"\b") for phrase in phrases]
+        self.slot = slot
+        self.excludes = [re.compile(r"\b" + re.escape(phrase) + r"\b") for phrase in excludes or []]
+        self.program = program
+        self.amount = amount
+
+    def phrase_score(self, text: str) -> int:
+        """Return the length of the longest matching phrase, 0 if none match."""
+        if any(pattern.search(text) for pattern in self.excludes):
+            return 0
+        return max((len(p.pattern) for p in self.phrases if p.search(text)), default=0)
+
+
+INTENT_GRAMMAR: Dict[str, IntentRule] = {
+    "getBalance": IntentRule(
+        ["balance", "how much sol", "how many sol", "lamports in"],
+        slot="address", excludes=["token"],
+    ),
+    "getMultipleBalances": IntentRule(
+        ["balance", "balances", "how much sol", "how many sol", "portfolio", "holdings"],
+        slot="addresses", excludes=["token"],
+    ),
+    "getTokenAccountBalance": IntentRule(
+        ["token account balance", "token balance", "balance of token account"],
+        slot="tokenAccountPubkey",
+    ),
+    "getAccountInfo": IntentRule(
+        ["account info", "account information", "account details", "account data"],
+        slot="address",
+    ),
+    "getTokenSupply": IntentRule(["supply"], slot="address"),
+    "getSupply": IntentRule(
+        ["total supply", "circulating supply", "sol supply", "supply of sol",
+         "current supply", "solana supply", "supply of solana"],
+    ),
+    "getInflationRate": IntentRule(
+        ["inflation rate", "current inflation", "inflation now", "solana inflation",
+         "inflation on solana", "inflation of solana"],
+    ),
+    "getHealth": IntentRule(
+        ["healthy", "network health", "health status", "health of", "network status",
+         "cluster health", "node health", "rpc health"],
+    ),
+    "getTokenLargestAccounts": IntentRule(
+        ["largest accounts", "largest token accounts", "largest holders", "top holders",
+         "biggest holders", "top accounts", "whales"],
+        slot="address",
+    ),
+    "getTokenAccountsByOwner": IntentRule(
+        ["token accounts owned", "token accounts of", "token accounts for",
+         "token accounts by owner", "tokens owned by", "tokens held by"],
+        slot="address", excludes=["delegate", "delegated"], program=True,
+    ),
+    "getTokenAccountsByDelegate": IntentRule(
+        ["delegated to", "token accounts by delegate", "delegate"],
+        slot="address", program=True,
+    ),
+    "getContractMetadata": IntentRule(
+        ["program metadata", "contract metadata", "program accounts", "metadata"],
+        slot="address",
+    ),
+    "getTransactionDetails": IntentRule(
+        ["transaction", "tx", "txn", "signature"],
+        slot="signature",
+    ),
+    "requestAirdrop": IntentRule(["airdrop"], slot="address", amount=True),
+}
+
+
+class ExtractedInput:
+    """Addresses, signatures and amounts found in a query."""
+
+    def __init__(self, text: str):
+        """
+        Extract structured values from the query.
+
+        Args:
+            text: The user's input string
+        """
+        self.text = " ".join(text.lower().split())
+        self.pubkeys: List[str] = []
+        self.signatures: List[str] = []
+        for candidate in CANDIDATE_RE.findall(text):
+            if is_signature(candidate):
+                self.signatures.append(candidate)
+            elif is_pubkey(candidate):
+                self.pubkeys.append(candidate)
+
+        self.amount: Optional[int] = None
+        amounts = AMOUNT_RE.findall(text)
+        if len(amounts) == 1:
+            self.amount = to_lamports(*amounts[0])
+
+
+class IntentRouter:
+    """
+    Deterministic pre-router for the task identification step.
+
+    Returns a populated FirstAgentOutput when exactly one task matches the
+    query's keywords and inputs, and None whenever the query is ambiguous or
+    conversational so the caller can fall back to the LLM. Methods that change
+    state are always left to the LLM, since keywords cannot tell "airdrop 1 SOL"
+    from "do not airdrop 1 SOL".
+    """
+
+    def __init__(self, grammar: Dict[str, IntentRule] = INTENT_GRAMMAR):
+        """
+        Initialize the router.
+
+        Args:
+            grammar: Mapping of task name to its keyword rule
+        """
+        self.grammar = {task: rule for task, rule in grammar.items() if task in TASK_PARAMS_MAP}
+        self.method_names = {
+            task: re.compile(r"\b" + re.escape(task.lower()) + r"\b") for task in self.grammar
+        }
+
+    def _fill_slots(self, rule: IntentRule, extracted: ExtractedInput) -> Optional[Dict[str, Any]]:
+        """Return placeholder values for a rule, or None if its inputs are not satisfied."""
+        values: Dict[str, Any] = {}
+        # A repeated address is one input, so "balance of A A" is a single-address query
+        pubkeys = list(dict.fromkeys(extracted.pubkeys))
+
+        if rule.program:
+            programs = [key for key in pubkeys if key in PROGRAM_IDS]
+            pubkeys = [key for key in pubkeys if key not in PROGRAM_IDS]
+            if len(programs) > 1:
+                return None
+            if programs:
+                values["programId"] = programs[0]
+            elif "2022" in extracted.text:
+                values["programId"] = TOKEN_2022_PROGRAM_ID
+            else:
+                values["programId"] = TOKEN_PROGRAM_ID
+
+        if rule.slot is None:
+            if pubkeys or extracted.signatures:
+                return None
+        elif rule.slot == "addresses":
+            if len(pubkeys) < 2 or extracted.signatures:
+                return None
+            values["addresses"] = pubkeys
+        elif rule.slot == "signature":
+            if len(extracted.signatures) != 1 or pubkeys:
+                return None
+            values["signature"] = extracted.signatures[0]
+        else:
+            if len(pubkeys) != 1 or extracted.signatures:
+                return None
+            values[rule.slot] = pubkeys[0]
+
+        if rule.amount:
+            if extracted.amount is None:
+                return None
+            values["amount"] = extracted.amount
+
+        return values
+
+    def candidates(self, user_input: str) -> List[Tuple[str, int, Dict[str, Any]]]:
+        """
+        List every task whose grammar and inputs match the query.
+
+        Args:
+            user_input: The user's input string
+
+        Returns:
+            list: (task name, match score, placeholder values) tuples
+        """
+        extracted = ExtractedInput(user_input)
+        matches = []
+        for task, rule in self.grammar.items():
+            if self.method_names[task].search(extracted.text):
+                score = 1000
+            else:
+                score = rule.phrase_score(extracted.text)
+            if not score:
+                continue
+            values = self._fill_slots(rule, extracted)
+            if values is not None:
+                matches.append((task, score, values))
+        return matches
+
+    def route(self, user_input: str) -> Optional[FirstAgentOutput]:
+        """
+        Resolve a query to a task without the LLM when it is unambiguous.
+
+        Args:
+            user_input: The user's input string
+
+        Returns:
+            FirstAgentOutput or None if the LLM should decide
+        """
+        if EXPLANATORY_RE.search(user_input.lower()):
+            return None
+
+        matches = self.candidates(user_input)
+        if not matches:
+            return None
+
+        matches.sort(key=lambda match: match[1], reverse=True)
+        if len(matches) > 1 and matches[0][1] == matches[1][1]:
+            return None
+
+        task, _, values = matches[0]
+        data = build_task_data(task, values)
+        if data.get("method") in MUTATING_METHODS:
+            return None
+        return FirstAgentOutput(task=task, data=data)
+
+
+# Create a router instance
+intent_router = IntentRouter()
@@ -0,0 +1,93 @@
+"""
+Helpers for streaming answers token by token.
+
+CrewAI returns an agent's answer only once it is complete, so streamed answers
+that need the LLM are phrased by a direct streaming completion using the
+agent's LLM configuration. Answers that are already complete (rendered
+results, conversational replies) are split into word tokens.
+"""
+import json
+import re
+from typing import Any, Dict, Iterator, List
+
+from app.core.llm import llm_costs
+from app.core.tasks import FirstAgentOutput
+from app.utils.rate_limit import llm_limiter
+
+TOKEN_RE = re.compile(r"\S+\s*|\s+")
+
+PHRASING_INSTRUCTIONS = (
+    "You are an expert on the Solana blockchain. Answer the user's question using only the "
+    "JSON-RPC result below. Give the answer in natural language, not JSON. "
+    "Convert lamports to SOL by dividing by 1000000000 where it helps."
+)
+
+
+def split_tokens(text: str) -> Iterator[str]:
+    """
+    Split a complete answer into word tokens, keeping the whitespace.
+
+    Args:
+        text: The answer
+
+    Returns:
+        Iterator of tokens whose concatenation is the original text
+    """
+    for match in TOKEN_RE.finditer(text or ""):
+        yield match.group(0)
+
+
+def phrasing_messages(user_input: str, task_result: FirstAgentOutput, response: Any) -> List[Dict[str, str]]:
+    """
+    Build the prompt asking the LLM to phrase an RPC result.
+
+    Args:
+        user_input: The user's input string
+        task_result: The identified task
+        response: The JSON-RPC response
+
+    Returns:
+        list: Chat messages
+    """
+    return [
+        {"role": "system", "content": PHRASING_INSTRUCTIONS},
+        {
+            "role": "user",
+            "content": (
+                f"Question: {user_input}\n"
+                f"Task: {task_result.task}\n"
+                f"Request: {json.dumps(task_result.data)}\n"
+                f"Result: {json.dumps(response)}"
+            ),
+        },
+    ]
+
+
+def stream_completion(llm: Any, messages: List[Dict[str, str]]) -> Iterator[str]:
+    """
+    Stream a chat completion with the settings of a CrewAI LLM.
+
+    Args:
+        llm: The crewai LLM whose model, key and temperature are used
+        messages: Chat messages
+
+    Returns:
+        Iterator of text deltas
+    """
+    import litellm
+
+    llm_limiter.acquire(llm_costs(messages, llm.max_tokens))
+    params = {
+        "model": llm.model,
+        "messages": messages,
+        "temperature": llm.temperature,
+        "api_key": llm.api_key,
+        "api_base": llm.api_base,
+        "timeout": llm.timeout,
+        "stream": True,
+    }
+    params = {key: value for key, value in params.items() if value is not None}
+    for chunk in litellm.completion(**params):
+        text = chunk.choices[0].delta.content if chunk.choices else None
+        if text:
+            yield text
@@ -24,7 +24,7 @@ def initialize_tasks(task_define_agent, get_agent):
     get_task = Task(
         description='Identify the task needed to be performed in {text}. Return getAccountInfo is the user wants to send SOL to someone.'
                     'If the user is just conversing and there is no task to be performed, converse with the user like a human and take into consideration {memory} as well',
-        expected_output='Give me the name of the task from getAccountInfo, getContractMetadata, getGasPrices, getTransactionDetails, getHealth. Also give the task data from the task_params_map with the populated curly braces if there are any'
+        expected_output='Give me the name of the task from the task catalog. Also give the task data as an object mapping each slot listed in brackets after the task name in the catalog to its value from {text}, or an empty object if the task has no slots'
                         'Give output with "task" field and "data" field if user is not conversing'
                         'Converse with the user if the user is just conversing and answer him without any additional commentary. Answer like a human. Make no mention that it is a conversational query',
         agent=task_define_agent,
@@ -81,6 +81,13 @@ def initialize_tasks(task_define_agent, get_agent):
         agent=get_agent,
     )
 
+    getMultipleBalances = Task(
+        description='Get the balances of the given addresses, convert them to SOL and add up the total',
+        expected_output='Balance of each address in SOL and the total, in sentence form and not json',
+        context=[get_task],
+        agent=get_agent,
+    )
+
     getInflationRate = Task(
         description='Fetch the current inflation rate details of the blockchain, including the total, validator, and foundation inflation rates.',
         expected_output='Inflation rate details including total inflation rate, validator inflation rate, and foundation inflation rate in a sentence format.',
@@ -139,6 +146,7 @@ def initialize_tasks(task_define_agent, get_agent):
         "getAccountInfo": getAccountInfo,
         "requestAirdrop": requestAirdrop,
         "getBalance": getBalance,
+        "getMultipleBalances": getMultipleBalances,
         "getInflationRate": getInflationRate,
         "getSupply": getSupply,
         "getTokenAccountBalance": getTokenAccountBalance,
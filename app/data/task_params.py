@@ -32,7 +32,12 @@ TASK_PARAMS_MAP = {
                                 "bytes": "3Mc6vR"
                             }
                         }
-                    ]
+                    ],
+                    "encoding": "base64",
+                    "dataSlice": {
+                        "offset": 0,
+                        "length": 0
+                    }
                 }
             ]
         }
@@ -89,6 +94,23 @@ TASK_PARAMS_MAP = {
             ]
         }
     },
+    "getMultipleBalances": {
+        "data": {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "getMultipleAccounts",
+            "params": [
+                "{addresses}",
+                {
+                    "encoding": "base64",
+                    "dataSlice": {
+                        "offset": 0,
+                        "length": 0
+                    }
+                }
+            ]
+        }
+    },
     "getInflationRate": {
         "data": {
             "jsonrpc": "2.0",
@@ -165,4 +187,23 @@ TASK_PARAMS_MAP = {
             ]
         }
     }
-}
\ No newline at end of file
+}
+
+# One-line purpose of each task, used for the compact prompt catalog and the /tasks listing
+TASK_DESCRIPTIONS = {
+    "getAccountInfo": "Get account information for an address",
+    "getContractMetadata": "Fetch contract metadata and accounts of a program",
+    "getGasPrices": "Get current gas prices (fee for a message)",
+    "getTransactionDetails": "Get details for a transaction",
+    "getHealth": "Check blockchain network health",
+    "requestAirdrop": "Request an airdrop of SOL",
+    "getBalance": "Get balance for an address",
+    "getMultipleBalances": "Get balances of several addresses at once",
+    "getInflationRate": "Get current inflation rate",
+    "getSupply": "Get total, circulating and non-circulating SOL supply",
+    "getTokenAccountBalance": "Get token account balance",
+    "getTokenAccountsByDelegate": "Get token accounts by delegate",
+    "getTokenAccountsByOwner": "Get token accounts by owner",
+    "getTokenLargestAccounts": "Get largest token accounts",
+    "getTokenSupply": "Get total supply of a token mint"
+}
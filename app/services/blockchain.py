@@ -1,10 +1,17 @@
 """
 Service layer for blockchain operations.
+
+CrewAI, litellm and the agents are heavy to import and build, so nothing is
+imported or constructed at module import. The service is built on first use
+or in the background at startup, and its state drives the readiness endpoint.
 """
-from app.core.agents import initialize_agents
-from app.core.tasks import initialize_tasks
-from app.core.crew import create_blockchain_crew
-from typing import Dict, Any
+import threading
+from app.utils.profiling import startup_timer
+from app.utils.rate_limit import RateLimitTimeout
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+# Heavy modules imported when the service is first built, in dependency order
+HEAVY_IMPORTS = ("litellm", "crewai", "app.core.agents", "app.core.tasks", "app.core.crew")
 
 class BlockchainService:
     """
@@ -13,35 +20,146 @@ class BlockchainService:
     
     def __init__(self):
         """Initialize the blockchain service with agents, tasks, and crew."""
+        with startup_timer.stage("imports"):
+            modules = [startup_timer.timed_import(name) for name in HEAVY_IMPORTS]
+        agents_module, tasks_module, crew_module = modules[-3:]
+        
         # Initialize agents
-        self.task_define_agent, self.get_agent = initialize_agents()
+        with startup_timer.stage("agents"):
+            self.task_define_agent, self.get_agent = agents_module.initialize_agents()
         
         # Initialize tasks
-        self.get_task, self.task_map = initialize_tasks(self.task_define_agent, self.get_agent)
+        with startup_timer.stage("tasks"):
+            self.get_task, self.task_map = tasks_module.initialize_tasks(self.task_define_agent, self.get_agent)
         
         # Create blockchain crew
-        self.crew = create_blockchain_crew(
-            self.task_define_agent,
-            self.get_agent,
-            self.get_task,
-            self.task_map
-        )
-    
-    def process_query(self, query: str) -> Dict[str, Any]:
+        with startup_timer.stage("crew"):
+            self.crew = crew_module.create_blockchain_crew(
+                self.task_define_agent,
+                self.get_agent,
+                self.get_task,
+                self.task_map
+            )
+    
+    def process_query(self, query: str, session_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Process a user query through the blockchain crew.
         
         Args:
             query: The user's input text
+            session_id: Conversation session identifier
             
         Returns:
             dict: Response data from the crew
         """
         try:
-            return self.crew.process_query(query)
+            return self.crew.process_query(query, session_id=session_id)
+        except RateLimitTimeout:
+            raise
         except Exception as e:
             error_message = f"Error processing query: {str(e)}"
             return {"response": error_message, "task_executed": None, "error": str(e)}
+    
+    def stream_query(self, query: str, session_id: Optional[str] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Process a user query, yielding an event per completed stage.
+        
+        Args:
+            query: The user's input text
+            session_id: Conversation session identifier
+            
+        Returns:
+            Iterator of (event name, payload) tuples, ending with "final" or "error"
+        """
+        try:
+            yield from self.crew.stream_query(query, session_id=session_id)
+        except Exception as e:
+            yield "error", {"response": f"Error processing query: {str(e)}", "task_executed": None, "error": str(e)}
+    
+    def process_batch(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Process several independent queries through the blockchain crew.
+        
+        Args:
+            queries: The user's input texts
+            
+        Returns:
+            list: One response dict per query, in request order
+        """
+        try:
+            return self.crew.process_batch(queries)
+        except RateLimitTimeout:
+            raise
+        except Exception as e:
+            error_message = f"Error processing query: {str(e)}"
+            return [{"response": error_message, "task_executed": None, "error": str(e)} for _ in queries]
+
+_service: Optional[BlockchainService] = None
+_service_error: Optional[str] = None
+_service_lock = threading.Lock()
+
+def get_blockchain_service() -> BlockchainService:
+    """
+    Get the shared blockchain service, building it on first use.
+    
+    Concurrent callers wait for a single initialization. A failed
+    initialization is retried by the next caller.
+    
+    Returns:
+        BlockchainService: The initialized service
+    """
+    global _service, _service_error
+    if _service is not None:
+        return _service
+    with _service_lock:
+        if _service is None:
+            try:
+                _service = BlockchainService()
+                _service_error = None
+            except Exception as e:
+                _service_error = str(e)
+                print(f'Error initializing blockchain service: {e}')
+                raise
+    return _service
 
-# Create a singleton instance
-blockchain_service = BlockchainService()
\ No newline at end of file
+def get_ready_service() -> Optional[BlockchainService]:
+    """Return the blockchain service if it has been built, without building it."""
+    return _service
+
+def initialize_in_background() -> threading.Thread:
+    """
+    Build the blockchain service on a daemon thread.
+    
+    Returns:
+        threading.Thread: The initialization thread
+    """
+    def initialize():
+        try:
+            get_blockchain_service()
+        except Exception:
+            return
+        print(f'Blockchain service ready: {startup_timer.report()}')
+    
+    thread = threading.Thread(target=initialize, name="service-init", daemon=True)
+    thread.start()
+    return thread
+
+def service_status() -> Dict[str, Any]:
+    """
+    Get the initialization state of the blockchain service.
+    
+    Returns:
+        dict: "ready", "initializing", "failed" or "not_started", with any error and the startup timing report
+    """
+    if _service is not None:
+        status = "ready"
+    elif _service_lock.locked():
+        status = "initializing"
+    elif _service_error is not None:
+        status = "failed"
+    else:
+        status = "not_started"
+    result = {"status": status, "startup": startup_timer.report()}
+    if status == "failed":
+        result["error"] = _service_error
+    return result
\ No newline at end of file
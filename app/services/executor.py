@@ -0,0 +1,237 @@
+"""
+Bounded worker pool for running blocking query processing off the event loop.
+"""
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional
+
+from app.config.settings import QUERY_WORKERS, QUERY_QUEUE_SIZE, QUERY_RETRY_AFTER
+from app.utils.metrics import QUEUE_SECONDS
+
+# Marks the end of a streamed iterator
+_END = object()
+
+
+class QueueFullError(Exception):
+    """Raised when the admission queue has no room for another query."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Query queue is full")
+        self.retry_after = retry_after
+
+
+class QueryExecutor:
+    """
+    Thread pool with a concurrency limit and a bounded admission queue.
+
+    At most ``max_workers`` queries run at once and at most ``queue_size`` more
+    wait for a worker. Anything beyond that is rejected immediately with
+    :class:`QueueFullError` so callers can shed load instead of piling up.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = QUERY_WORKERS,
+        queue_size: int = QUERY_QUEUE_SIZE,
+        retry_after: int = QUERY_RETRY_AFTER,
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Number of queries processed concurrently
+            queue_size: Number of queries allowed to wait for a worker
+            retry_after: Seconds suggested to rejected clients before retrying
+        """
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.retry_after = retry_after
+
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._wait_last = 0.0
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        """Lazily created worker pool."""
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="query-worker"
+                    )
+        return self._pool
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Admit a call into the pool.
+
+        Args:
+            fn: Blocking callable to execute
+            args: Positional arguments for the callable
+            kwargs: Keyword arguments for the callable
+
+        Returns:
+            Future: Future resolving to the callable's result
+
+        Raises:
+            QueueFullError: If all workers are busy and the queue is full
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.queue_size:
+                self._rejected += 1
+                raise QueueFullError(self.retry_after)
+            self._pending += 1
+
+        submitted_at = time.perf_counter()
+        # Run in the submitter's context so request priority and deadline follow the work
+        context = contextvars.copy_context()
+
+        def job():
+            waited = time.perf_counter() - submitted_at
+            QUEUE_SECONDS.observe(waited)
+            with self._lock:
+                self._running += 1
+                self._wait_total += waited
+                self._wait_last = waited
+                self._wait_max = max(self._wait_max, waited)
+            try:
+                return context.run(fn, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        def done(_future: Future):
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+
+        try:
+            future = self.pool.submit(job)
+        except RuntimeError:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(done)
+        return future
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking callable in the pool without blocking the event loop.
+
+        Args:
+            fn: Blocking callable to execute
+            args: Positional arguments for the callable
+            kwargs: Keyword arguments for the callable
+
+        Returns:
+            The callable's result
+
+        Raises:
+            QueueFullError: If all workers are busy and the queue is full
+        """
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def stream(self, fn: Callable[..., Iterator[Any]], *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        """
+        Drain a blocking iterator in the pool and relay its items to the event loop.
+
+        The call is admitted immediately, so a full queue is reported before any
+        item is streamed. If the consumer stops early, the iterator is closed
+        before it produces its next item.
+
+        Args:
+            fn: Blocking callable returning an iterator
+            args: Positional arguments for the callable
+            kwargs: Keyword arguments for the callable
+
+        Returns:
+            AsyncIterator: The iterator's items, re-raising its exception if any
+
+        Raises:
+            QueueFullError: If all workers are busy and the queue is full
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+
+        def put(item: Any, error: Optional[BaseException] = None) -> None:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, (item, error))
+            except RuntimeError:
+                # The event loop is gone; nobody is listening any more
+                cancelled.set()
+
+        def produce():
+            iterator = None
+            try:
+                iterator = fn(*args, **kwargs)
+                for item in iterator:
+                    if cancelled.is_set():
+                        break
+                    put(item)
+            except BaseException as e:
+                put(_END, e)
+            else:
+                put(_END)
+            finally:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+
+        self.submit(produce)
+
+        async def consume():
+            try:
+                while True:
+                    item, error = await queue.get()
+                    if item is _END:
+                        if error is not None:
+                            raise error
+                        return
+                    yield item
+            finally:
+                cancelled.set()
+
+        return consume()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get queue depth and wait time statistics.
+
+        Returns:
+            dict: Current executor statistics
+        """
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "max_workers": self.max_workers,
+                "queue_size": self.queue_size,
+                "running": self._running,
+                "queue_depth": self._pending - self._running,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "wait_seconds_avg": self._wait_total / started if started else 0.0,
+                "wait_seconds_max": self._wait_max,
+                "wait_seconds_last": self._wait_last,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+
+# Create a shared executor instance
+query_executor = QueryExecutor()
@@ -0,0 +1,414 @@
+"""
+Background jobs for airdrops.
+
+An airdrop is submitted in the request and returned as a job straight away;
+confirming that the transaction landed and reading the new balance happens in
+the background. A single poller thread checks every pending signature with
+one batched getSignatureStatuses call per round, at background priority, and
+backs off while nothing changes. Job state is available from ``get`` (and so
+from GET /jobs/{id}), is published to the shared state for other workers, and
+is POSTed to a webhook when a job finishes.
+"""
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.config.settings import (
+    AIRDROP_CONFIRMATION,
+    JOB_POLL_INITIAL_SECONDS,
+    JOB_POLL_MAX_SECONDS,
+    JOB_TIMEOUT_SECONDS,
+    JOB_RETENTION_SECONDS,
+    JOB_WEBHOOK_URL,
+)
+from app.utils.rate_limit import PRIORITY_BACKGROUND, RateLimitTimeout, request_context
+from app.utils.rpc_client import dumps, loads
+from app.utils.shared_state import SharedState, SharedStateError, shared_state
+from app.utils.solana import LAMPORTS_PER_SOL
+from app.utils.tools import call_rpc, call_rpc_batch
+
+# Signatures accepted by one getSignatureStatuses call
+SIGNATURE_STATUSES_LIMIT = 256
+
+# Order in which a transaction reaches each commitment
+COMMITMENT_LEVELS = {"processed": 0, "confirmed": 1, "finalized": 2}
+
+# Statuses after which a job is no longer polled
+FINAL_STATUSES = frozenset({"confirmed", "failed", "expired"})
+
+# Shared state key prefix of published jobs
+JOB_KEY = "job:"
+
+# Finished jobs kept in memory, beyond which the oldest are dropped early
+MAX_JOBS = 10000
+
+# Seconds to wait for the webhook receiver
+WEBHOOK_TIMEOUT = 5.0
+
+
+class Job:
+    """State of one airdrop."""
+
+    def __init__(self, address: str, lamports: int, signature: str, deadline: float):
+        self.id = uuid.uuid4().hex
+        self.address = address
+        self.lamports = lamports
+        self.signature = signature
+        self.deadline = deadline
+        self.status = "pending"
+        # Commitment the transaction has reached so far, None until it is seen
+        self.confirmation_status: Optional[str] = None
+        self.slot: Optional[int] = None
+        self.balance: Optional[int] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.updated_at = self.created_at
+        self.finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINAL_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Describe the job.
+
+        Returns:
+            dict: Job id, status, transaction details and, once confirmed, the new balance
+        """
+        return {
+            "id": self.id,
+            "type": "airdrop",
+            "status": self.status,
+            "address": self.address,
+            "lamports": self.lamports,
+            "signature": self.signature,
+            "confirmation_status": self.confirmation_status,
+            "slot": self.slot,
+            "balance": self.balance,
+            "balance_sol": self.balance / LAMPORTS_PER_SOL if self.balance is not None else None,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+def post_webhook(url: str, job: Dict[str, Any]) -> None:
+    """POST a finished job to a webhook."""
+    try:
+        httpx.post(url, content=dumps(job), headers={"Content-Type": "application/json"},
+                   timeout=WEBHOOK_TIMEOUT)
+    except httpx.HTTPError as e:
+        print(f'Error delivering job webhook: {e}')
+
+
+class AirdropJobs:
+    """Tracker submitting airdrops and confirming them in the background."""
+
+    def __init__(
+        self,
+        confirmation: str = AIRDROP_CONFIRMATION,
+        poll_initial: float = JOB_POLL_INITIAL_SECONDS,
+        poll_max: float = JOB_POLL_MAX_SECONDS,
+        timeout: float = JOB_TIMEOUT_SECONDS,
+        retention: float = JOB_RETENTION_SECONDS,
+        webhook_url: str = JOB_WEBHOOK_URL,
+        shared: Optional[SharedState] = None,
+        call: Callable[[dict], dict] = call_rpc,
+        call_batch: Callable[[List[dict]], List[dict]] = call_rpc_batch,
+        notify: Callable[[str, Dict[str, Any]], None] = post_webhook,
+    ):
+        """
+        Initialize the tracker; the poller thread starts with the first job.
+
+        Args:
+            confirmation: Commitment a job waits for ("processed", "confirmed" or "finalized")
+            poll_initial: Seconds before the first poll and after any poll that saw a change
+            poll_max: Longest interval between polls
+            timeout: Seconds after which a transaction short of the target commitment expires
+            retention: Seconds a finished job is kept
+            webhook_url: URL notified of finished jobs, empty for none
+            shared: State shared with other workers, where jobs are published
+            call: Sends one JSON-RPC request
+            call_batch: Sends several JSON-RPC requests as one batch
+            notify: Delivers a finished job to the webhook URL
+        """
+        if confirmation not in COMMITMENT_LEVELS:
+            raise ValueError(f"Unknown commitment: {confirmation}")
+        self.confirmation = confirmation
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.timeout = timeout
+        self.retention = retention
+        self.webhook_url = webhook_url
+        self.shared = shared
+        self.call = call
+        self.call_batch = call_batch
+        self.notify = notify
+
+        self._condition = threading.Condition()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._pending: Dict[str, Job] = {}
+        self._delay = poll_initial
+        self._next_poll = 0.0
+        self._poller: Optional[threading.Thread] = None
+        self._stopped = False
+        self.polls = 0
+        self.completed = 0
+        self.failed = 0
+        self.expired = 0
+
+    def submit_airdrop(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Job]]:
+        """
+        Send a requestAirdrop request and track its confirmation.
+
+        Args:
+            data: requestAirdrop JSON-RPC request with address and lamports as params
+
+        Returns:
+            tuple: The RPC response and the job, None if the airdrop was refused
+        """
+        response = self.call(data)
+        signature = response.get("result") if isinstance(response, dict) else None
+        if not isinstance(signature, str):
+            return response, None
+        address, lamports = data["params"][:2]
+        return response, self.track(address, lamports, signature)
+
+    def track(self, address: str, lamports: int, signature: str) -> Job:
+        """
+        Track the confirmation of an airdrop that was already sent.
+
+        Args:
+            address: Recipient address
+            lamports: Amount requested
+            signature: Transaction signature returned by requestAirdrop
+
+        Returns:
+            Job: The new job
+        """
+        now = time.monotonic()
+        job = Job(address, lamports, signature, now + self.timeout)
+        with self._condition:
+            self._prune(now)
+            # A new job is checked soon even if the poller has backed off for older ones
+            if not self._pending or self._next_poll > now + self.poll_initial:
+                self._next_poll = now + self.poll_initial
+                self._delay = self.poll_initial
+            self._jobs[job.id] = job
+            self._pending[job.id] = job
+            if self._poller is None and not self._stopped:
+                self._poller = threading.Thread(target=self._poll_loop, name="airdrop-jobs", daemon=True)
+                self._poller.start()
+            self._condition.notify()
+        self._publish(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look a job up, in this worker or in the shared state.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            dict or None if the job is unknown or expired
+        """
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return job.to_dict()
+        if self.shared is None:
+            return None
+        try:
+            stored = self.shared.get(JOB_KEY + job_id)
+        except SharedStateError as e:
+            print(f'Error reading job: {e}')
+            return None
+        return loads(stored) if stored is not None else None
+
+    def _prune(self, now: float) -> None:
+        """Drop the oldest finished jobs past their retention; called with the lock held."""
+        while self._jobs:
+            job = next(iter(self._jobs.values()))
+            if job.finished_at is None or (len(self._jobs) < MAX_JOBS and now - job.finished_at < self.retention):
+                break
+            self._jobs.popitem(last=False)
+
+    def _poll_loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    wait = self._next_poll - time.monotonic()
+                    if self._pending and wait <= 0:
+                        break
+                    self._condition.wait(wait if self._pending else None)
+                if self._stopped:
+                    return
+            changed = self.poll()
+            with self._condition:
+                # Poll again soon after progress, back off while every transaction is still unseen
+                self._delay = self.poll_initial if changed else min(self._delay * 2, self.poll_max)
+                self._next_poll = time.monotonic() + self._delay
+
+    def poll(self) -> int:
+        """
+        Check every pending job once.
+
+        All pending signatures are sent in one JSON-RPC batch of
+        getSignatureStatuses calls, and the balances of the jobs that reached
+        the target commitment are then read in a second batch.
+
+        Returns:
+            int: Number of jobs whose status changed
+        """
+        with self._condition:
+            jobs = list(self._pending.values())
+        if not jobs:
+            return 0
+        self.polls += 1
+        chunks = [jobs[offset:offset + SIGNATURE_STATUSES_LIMIT] for offset in range(0, len(jobs), SIGNATURE_STATUSES_LIMIT)]
+        requests = [
+            {"jsonrpc": "2.0", "id": index, "method": "getSignatureStatuses",
+             "params": [[job.signature for job in chunk], {"searchTransactionHistory": False}]}
+            for index, chunk in enumerate(chunks)
+        ]
+        try:
+            with request_context(PRIORITY_BACKGROUND, self.poll_max):
+                responses = self.call_batch(requests)
+        except RateLimitTimeout:
+            return 0
+
+        now = time.monotonic()
+        changed: List[Job] = []
+        landed: List[Job] = []
+        for chunk, response in zip(chunks, responses):
+            result = response.get("result") if isinstance(response, dict) else None
+            if not isinstance(result, dict):
+                # The poll failed; unseen jobs may still expire
+                statuses = [None] * len(chunk)
+            else:
+                statuses = result.get("value") or [None] * len(chunk)
+            for job, status in zip(chunk, statuses):
+                if self._update(job, status, now):
+                    changed.append(job)
+                    if job.status == "pending" and self._reached(job):
+                        landed.append(job)
+        if landed:
+            self._read_balances(landed)
+        for job in changed:
+            self._publish(job)
+            if job.finished:
+                self._finish(job)
+        return len(changed)
+
+    def _reached(self, job: Job) -> bool:
+        return COMMITMENT_LEVELS.get(job.confirmation_status, -1) >= COMMITMENT_LEVELS[self.confirmation]
+
+    def _update(self, job: Job, status: Optional[Dict[str, Any]], now: float) -> bool:
+        """Apply a signature status to a job; returns whether the job changed."""
+        # Jobs are read and pruned under the lock, so they only change under it
+        with self._condition:
+            if status is not None and status.get("err") is not None:
+                job.slot = status.get("slot")
+                self._end(job, "failed", str(status["err"]))
+            elif status is not None and (status.get("confirmationStatus") or "processed") != job.confirmation_status:
+                job.confirmation_status = status.get("confirmationStatus") or "processed"
+                job.slot = status.get("slot")
+                job.updated_at = time.time()
+            elif now >= job.deadline:
+                # Unseen, or seen but stuck below the target commitment
+                if job.confirmation_status is None:
+                    self._end(job, "expired", "The transaction was not seen before the job timed out")
+                else:
+                    self._end(job, "expired", f"The transaction did not reach {self.confirmation} "
+                                              f"commitment before the job timed out")
+            else:
+                return False
+        return True
+
+    def _end(self, job: Job, status: str, error: Optional[str] = None) -> None:
+        """Give a job its final status; called with the lock held."""
+        job.status = status
+        job.error = error
+        job.updated_at = time.time()
+        job.finished_at = time.monotonic()
+
+    def _read_balances(self, jobs: List[Job]) -> None:
+        """Read the balances of landed airdrops and complete their jobs."""
+        # minContextSlot makes sure the balance already includes the airdrop, whatever is cached
+        requests = [
+            {"jsonrpc": "2.0", "id": index, "method": "getBalance",
+             "params": [job.address, {"commitment": self.confirmation, "minContextSlot": job.slot or 0}]}
+            for index, job in enumerate(jobs)
+        ]
+        try:
+            with request_context(PRIORITY_BACKGROUND, self.poll_max):
+                responses = self.call_batch(requests)
+        except RateLimitTimeout:
+            responses = [{}] * len(jobs)
+        with self._condition:
+            for job, response in zip(jobs, responses):
+                result = response.get("result") if isinstance(response, dict) else None
+                if isinstance(result, dict):
+                    job.balance = result.get("value")
+                self._end(job, "confirmed")
+
+    def _finish(self, job: Job) -> None:
+        with self._condition:
+            self._pending.pop(job.id, None)
+            if job.status == "confirmed":
+                self.completed += 1
+            elif job.status == "failed":
+                self.failed += 1
+            else:
+                self.expired += 1
+        if self.webhook_url:
+            self.notify(self.webhook_url, job.to_dict())
+
+    def _publish(self, job: Job) -> None:
+        """Make the job's current state visible to other workers."""
+        if self.shared is None:
+            return
+        try:
+            self.shared.set(JOB_KEY + job.id, dumps(job.to_dict()), self.timeout + self.retention)
+        except SharedStateError as e:
+            print(f'Error publishing job: {e}')
+
+    def stop(self) -> None:
+        """Stop the poller thread; pending jobs are no longer checked."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._poller is not None:
+            self._poller.join(timeout=5)
+        # A job tracked later starts a new poller
+        with self._condition:
+            self._poller = None
+            self._stopped = False
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get job statistics.
+
+        Returns:
+            dict: Pending and finished job counts and the current poll interval
+        """
+        with self._condition:
+            return {
+                "pending": len(self._pending),
+                "tracked": len(self._jobs),
+                "completed": self.completed,
+                "failed": self.failed,
+                "expired": self.expired,
+                "polls": self.polls,
+                "poll_interval": self._delay,
+            }
+
+
+# Create a shared airdrop job tracker
+airdrop_jobs = AirdropJobs(shared=shared_state)
@@ -0,0 +1,246 @@
+"""
+Local decoding of base64 account data into typed fields.
+
+getAccountInfo is requested with base64 encoding, which leaves an opaque blob.
+Accounts with well known layouts (SPL Token accounts, mints and multisigs of
+both token programs, and system nonce accounts) are decoded here with
+precompiled ``struct`` layouts read straight from a memoryview over the decoded
+bytes, so no slices are copied except the 32-byte keys being base58 encoded.
+The decoded account is returned in the same shape as the RPC's jsonParsed
+encoding, which the renderers and the LLM already understand.
+"""
+import binascii
+import struct
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.utils.solana import TOKEN_2022_PROGRAM_ID, TOKEN_PROGRAM_ID, b58encode
+
+SYSTEM_PROGRAM_ID = "11111111111111111111111111111111"
+
+TOKEN_ACCOUNT_SIZE = 165
+MINT_SIZE = 82
+MULTISIG_SIZE = 355
+NONCE_ACCOUNT_SIZE = 80
+MAX_MULTISIG_SIGNERS = 11
+
+# Token-2022 accounts with extensions are longer than the base layout; the byte
+# after the token account layout tells mints and accounts apart
+TOKEN_2022_ACCOUNT_TYPE_OFFSET = TOKEN_ACCOUNT_SIZE
+TOKEN_2022_ACCOUNT_TYPES = {1: "mint", 2: "account"}
+
+ACCOUNT_STATES = {0: "uninitialized", 1: "initialized", 2: "frozen"}
+NONCE_STATES = {0: "uninitialized", 1: "initialized"}
+
+# Little-endian layouts; a COption is a u32 tag followed by the value
+TOKEN_ACCOUNT = struct.Struct("<32s32sQI32sBIQQI32s")
+MINT = struct.Struct("<I32sQBBI32s")
+MULTISIG_HEADER = struct.Struct("<BBB")
+NONCE_ACCOUNT = struct.Struct("<II32s32sQ")
+PUBKEY = struct.Struct("<32s")
+
+TOKEN_PROGRAMS = {TOKEN_PROGRAM_ID: "spl-token", TOKEN_2022_PROGRAM_ID: "spl-token-2022"}
+
+
+@lru_cache(maxsize=4096)
+def _encode_key(raw: bytes) -> str:
+    # Mints, owners and authorities repeat across accounts in bulk decodes
+    return b58encode(raw)
+
+
+def _option(tag: int, value: Any) -> Any:
+    return value if tag else None
+
+
+def _option_key(tag: int, raw: bytes) -> Optional[str]:
+    return _encode_key(raw) if tag else None
+
+
+def decode_token_account(data: memoryview) -> Dict[str, Any]:
+    """
+    Decode an SPL Token account.
+
+    Args:
+        data: Account data, at least 165 bytes
+
+    Returns:
+        dict: mint, owner, amount, delegate, state, isNative (rent-exempt reserve
+        of wrapped SOL accounts), delegatedAmount and closeAuthority
+    """
+    (mint, owner, amount, delegate_tag, delegate, state, native_tag, native,
+     delegated_amount, close_tag, close_authority) = TOKEN_ACCOUNT.unpack_from(data)
+    return {
+        "mint": _encode_key(mint),
+        "owner": _encode_key(owner),
+        "amount": amount,
+        "delegate": _option_key(delegate_tag, delegate),
+        "state": ACCOUNT_STATES.get(state, f"unknown({state})"),
+        "isNative": bool(native_tag),
+        "rentExemptReserve": _option(native_tag, native),
+        "delegatedAmount": delegated_amount,
+        "closeAuthority": _option_key(close_tag, close_authority),
+    }
+
+
+def decode_mint(data: memoryview) -> Dict[str, Any]:
+    """
+    Decode an SPL Token mint.
+
+    Args:
+        data: Account data, at least 82 bytes
+
+    Returns:
+        dict: mintAuthority, supply, decimals, isInitialized and freezeAuthority
+    """
+    authority_tag, authority, supply, decimals, initialized, freeze_tag, freeze_authority = MINT.unpack_from(data)
+    return {
+        "mintAuthority": _option_key(authority_tag, authority),
+        "supply": supply,
+        "decimals": decimals,
+        "isInitialized": bool(initialized),
+        "freezeAuthority": _option_key(freeze_tag, freeze_authority),
+    }
+
+
+def decode_multisig(data: memoryview) -> Dict[str, Any]:
+    """
+    Decode an SPL Token multisig.
+
+    Args:
+        data: Account data, at least 355 bytes
+
+    Returns:
+        dict: numRequiredSigners, numValidSigners, isInitialized and signers
+    """
+    required, valid, initialized = MULTISIG_HEADER.unpack_from(data)
+    offset = MULTISIG_HEADER.size
+    signers = [
+        _encode_key(PUBKEY.unpack_from(data, offset + index * PUBKEY.size)[0])
+        for index in range(min(valid, MAX_MULTISIG_SIGNERS))
+    ]
+    return {
+        "numRequiredSigners": required,
+        "numValidSigners": valid,
+        "isInitialized": bool(initialized),
+        "signers": signers,
+    }
+
+
+def decode_nonce_account(data: memoryview) -> Dict[str, Any]:
+    """
+    Decode a system program durable nonce account.
+
+    Args:
+        data: Account data, at least 80 bytes
+
+    Returns:
+        dict: state, authority, blockhash and lamportsPerSignature
+    """
+    version, state, authority, blockhash, lamports_per_signature = NONCE_ACCOUNT.unpack_from(data)
+    if state != 1:
+        return {"version": version, "state": NONCE_STATES.get(state, f"unknown({state})")}
+    return {
+        "version": version,
+        "state": "initialized",
+        "authority": _encode_key(authority),
+        "blockhash": _encode_key(blockhash),
+        "lamportsPerSignature": lamports_per_signature,
+    }
+
+
+def _token_layout(size: int, data: memoryview) -> Optional[str]:
+    if size == TOKEN_ACCOUNT_SIZE:
+        return "account"
+    if size == MINT_SIZE:
+        return "mint"
+    if size == MULTISIG_SIZE:
+        return "multisig"
+    if size > TOKEN_ACCOUNT_SIZE:
+        return TOKEN_2022_ACCOUNT_TYPES.get(data[TOKEN_2022_ACCOUNT_TYPE_OFFSET])
+    return None
+
+
+TOKEN_DECODERS = {"account": decode_token_account, "mint": decode_mint, "multisig": decode_multisig}
+
+
+def decode_account_data(owner: str, data: memoryview) -> Optional[Dict[str, Any]]:
+    """
+    Decode account data of a known layout.
+
+    Args:
+        owner: Program owning the account
+        data: Raw account data
+
+    Returns:
+        dict in the jsonParsed shape ({"program", "parsed": {"type", "info"}, "space"}),
+        or None if the layout is not known
+    """
+    size = len(data)
+    program = TOKEN_PROGRAMS.get(owner)
+    try:
+        if program is not None:
+            layout = _token_layout(size, data)
+            if layout is None:
+                return None
+            info = TOKEN_DECODERS[layout](data)
+        elif owner == SYSTEM_PROGRAM_ID and size == NONCE_ACCOUNT_SIZE:
+            program, layout = "nonce", "nonce"
+            info = decode_nonce_account(data)
+        else:
+            return None
+    except struct.error:
+        return None
+    return {"program": program, "parsed": {"type": layout, "info": info}, "space": size}
+
+
+def decode_account(account: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Replace the base64 data of an RPC account object by its decoded fields.
+
+    Args:
+        account: Account as returned by getAccountInfo (or getMultipleAccounts) with base64 encoding
+
+    Returns:
+        The account with decoded data, or the account unchanged if it has no
+        base64 data or an unknown layout
+    """
+    if not isinstance(account, dict):
+        return account
+    raw = account.get("data")
+    if not (isinstance(raw, list) and len(raw) == 2 and raw[1] == "base64"):
+        return account
+    try:
+        data = memoryview(binascii.a2b_base64(raw[0]))
+    except (binascii.Error, TypeError):
+        return account
+    parsed = decode_account_data(account.get("owner"), data)
+    if parsed is None:
+        return account
+    return dict(account, data=parsed, space=account.get("space", parsed["space"]))
+
+
+def decode_accounts(accounts: Iterable[Optional[Dict[str, Any]]]) -> List[Optional[Dict[str, Any]]]:
+    """Decode many accounts, e.g. the value of a getMultipleAccounts response."""
+    return [decode_account(account) for account in accounts]
+
+
+def decode_response(data: Dict[str, Any], response: Any) -> Any:
+    """
+    Decode the account data in a getAccountInfo or getMultipleAccounts response.
+
+    Args:
+        data: The JSON-RPC request
+        response: The decoded JSON-RPC response
+
+    Returns:
+        The response with known account layouts decoded; other responses unchanged
+    """
+    method = data.get("method") if isinstance(data, dict) else None
+    if method not in ("getAccountInfo", "getMultipleAccounts") or not isinstance(response, dict):
+        return response
+    result = response.get("result")
+    if not isinstance(result, dict) or "value" not in result:
+        return response
+    value = result["value"]
+    decoded = decode_accounts(value) if isinstance(value, list) else decode_account(value)
+    return dict(response, result=dict(result, value=decoded))
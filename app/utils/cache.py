@@ -0,0 +1,283 @@
+"""
+In-process cache for JSON-RPC responses with per-method freshness policies.
+
+With a shared state configured, responses that stay fresh long enough are also
+stored there, so that every worker process benefits from any worker's fetch.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.config.settings import RPC_CACHE_ENABLED, RPC_CACHE_MAX_BYTES, RPC_CACHE_EPOCH_TTL, SHARED_CACHE_MIN_TTL
+from app.utils.rpc_client import dumps, loads
+from app.utils.shared_state import SharedState, SharedStateError, shared_state
+
+# Average Solana slot duration in seconds
+SLOT_SECONDS = 0.4
+
+FOREVER = float("inf")
+
+
+class CachePolicy:
+    """Freshness rule for one JSON-RPC method."""
+
+    def __init__(
+        self,
+        ttl: float,
+        processed_ttl: Optional[float] = None,
+        cacheable: Optional[Callable[[Dict[str, Any], Any], bool]] = None,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            ttl: Seconds a response stays fresh at confirmed or finalized commitment
+            processed_ttl: Seconds a response stays fresh at processed commitment, defaults to one slot
+            cacheable: Optional predicate deciding whether a response may be stored
+        """
+        self.ttl = ttl
+        self.processed_ttl = SLOT_SECONDS if processed_ttl is None else processed_ttl
+        self.cacheable = cacheable
+
+    def ttl_for(self, data: Dict[str, Any]) -> float:
+        """Return the TTL for a request, taking its commitment level into account."""
+        if request_commitment(data) == "processed":
+            return min(self.ttl, self.processed_ttl)
+        return self.ttl
+
+
+def request_commitment(data: Dict[str, Any]) -> str:
+    """Return the commitment level of a request, defaulting to finalized."""
+    for param in data.get("params") or []:
+        if isinstance(param, dict) and "commitment" in param:
+            return param["commitment"]
+    return "finalized"
+
+
+def _transaction_found(data: Dict[str, Any], result: Any) -> bool:
+    """A missing transaction may still land, so null results are not stored."""
+    return result is not None
+
+
+class _TransactionPolicy(CachePolicy):
+    """Finalized transactions never change; anything else lives for one slot."""
+
+    def ttl_for(self, data: Dict[str, Any]) -> float:
+        return FOREVER if request_commitment(data) == "finalized" else SLOT_SECONDS
+
+
+# Methods without a policy (requestAirdrop, getSignatureStatuses, ...) are never cached.
+CACHE_POLICIES: Dict[str, CachePolicy] = {
+    "getBalance": CachePolicy(ttl=2.0),
+    "getAccountInfo": CachePolicy(ttl=2.0),
+    "getMultipleAccounts": CachePolicy(ttl=2.0),
+    "getTokenAccountBalance": CachePolicy(ttl=2.0),
+    "getTokenAccountsByOwner": CachePolicy(ttl=5.0),
+    "getTokenAccountsByDelegate": CachePolicy(ttl=5.0),
+    "getTokenSupply": CachePolicy(ttl=5.0),
+    "getTokenLargestAccounts": CachePolicy(ttl=10.0),
+    "getProgramAccounts": CachePolicy(ttl=30.0),
+    "getFeeForMessage": CachePolicy(ttl=SLOT_SECONDS),
+    "getHealth": CachePolicy(ttl=2.0),
+    "getSupply": CachePolicy(ttl=60.0),
+    "getInflationRate": CachePolicy(ttl=RPC_CACHE_EPOCH_TTL),
+    "getTransaction": _TransactionPolicy(ttl=FOREVER, cacheable=_transaction_found),
+}
+
+
+def cache_key(data: Dict[str, Any]) -> str:
+    """
+    Build a canonical cache key for a JSON-RPC request.
+
+    The request id and jsonrpc version are ignored and object keys are sorted,
+    so equivalent requests share an entry.
+
+    Args:
+        data: The JSON-RPC request object
+
+    Returns:
+        str: Canonical key
+    """
+    return json.dumps(
+        [data.get("method"), data.get("params") or []],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+
+class RPCCache:
+    """Thread-safe LRU cache of JSON-RPC responses bounded by total size in bytes."""
+
+    def __init__(
+        self,
+        max_bytes: int = RPC_CACHE_MAX_BYTES,
+        policies: Optional[Dict[str, CachePolicy]] = None,
+        enabled: bool = RPC_CACHE_ENABLED,
+        clock: Callable[[], float] = time.monotonic,
+        shared: Optional[SharedState] = None,
+        shared_min_ttl: float = SHARED_CACHE_MIN_TTL,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Upper bound on the serialized size of all cached responses
+            policies: Per-method freshness policies
+            enabled: Whether lookups and stores are performed at all
+            clock: Monotonic time source
+            shared: State shared with other workers, consulted on local misses
+            shared_min_ttl: Shortest TTL worth storing in the shared state
+        """
+        self.max_bytes = max_bytes
+        self.policies = CACHE_POLICIES if policies is None else policies
+        self.enabled = enabled
+        self.clock = clock
+        self.shared = shared
+        self.shared_min_ttl = shared_min_ttl
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _policy(self, data: Any) -> Optional[CachePolicy]:
+        if not self.enabled or not isinstance(data, dict):
+            return None
+        return self.policies.get(data.get("method"))
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a fresh response for a request.
+
+        Args:
+            data: The JSON-RPC request object
+
+        Returns:
+            dict: Cached response carrying the request's id, or None on a miss
+        """
+        if self._policy(data) is None:
+            return None
+        key = cache_key(data)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if entry is not None:
+            response = entry[2]
+        else:
+            response = self._get_shared(key)
+            with self._lock:
+                if response is None:
+                    self.misses += 1
+                    return None
+                self.shared_hits += 1
+        return dict(response, id=data.get("id", response.get("id")))
+
+    def _get_shared(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look a response up in the shared state and keep a local copy for its remaining lifetime."""
+        if self.shared is None:
+            return None
+        try:
+            stored = self.shared.get("rpc:" + key)
+        except SharedStateError as e:
+            print(f'Error reading shared cache: {e}')
+            return None
+        if stored is None:
+            return None
+        expires_at, response = loads(stored)
+        ttl = FOREVER if expires_at is None else expires_at - time.time()
+        if ttl <= 0:
+            return None
+        self._store(key, response, ttl, len(stored))
+        return response
+
+    def set(self, data: Dict[str, Any], response: Any) -> bool:
+        """
+        Store a response if the method's policy allows it.
+
+        Args:
+            data: The JSON-RPC request object
+            response: The decoded JSON-RPC response
+
+        Returns:
+            bool: Whether the response was stored
+        """
+        policy = self._policy(data)
+        if policy is None or not isinstance(response, dict) or "result" not in response:
+            return False
+        if policy.cacheable is not None and not policy.cacheable(data, response["result"]):
+            return False
+        ttl = policy.ttl_for(data)
+        if ttl <= 0:
+            return False
+
+        encoded = dumps(response)
+        if len(encoded) > self.max_bytes:
+            return False
+        key = cache_key(data)
+        self._store(key, response, ttl, len(encoded))
+        if self.shared is not None and ttl >= self.shared_min_ttl:
+            expires_at = None if ttl == FOREVER else time.time() + ttl
+            try:
+                self.shared.set("rpc:" + key, dumps([expires_at, response]), None if ttl == FOREVER else ttl)
+            except SharedStateError as e:
+                print(f'Error writing shared cache: {e}')
+        return True
+
+    def _store(self, key: str, response: Dict[str, Any], ttl: float, size: int) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (self.clock() + ttl, size, response)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: Hit/miss counters and current size
+        """
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+# Create a shared cache instance
+rpc_cache = RPCCache(shared=shared_state)
@@ -0,0 +1,182 @@
+"""
+Incremental parsing of JSON-RPC responses whose result is a large array.
+
+Only the array at ``result`` or ``result.value`` is streamed: its elements are
+decoded one at a time as bytes arrive, so memory holds a single element and
+the unread part of the current chunk. Every other member of the response
+(``jsonrpc``, ``id``, ``context``, ``error``) is small and decoded whole.
+"""
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, List
+
+_decoder = json.JSONDecoder()
+
+WHITESPACE = " \t\n\r"
+
+
+class JSONStreamError(ValueError):
+    """Raised when a streamed response is not valid JSON."""
+
+
+class StreamedRPCResponse:
+    """
+    Pull parser over the byte chunks of a JSON-RPC response.
+
+    Iterate :meth:`items` to receive the elements of the result array, then
+    read :attr:`envelope` for the remaining members. The array path is given by
+    :attr:`array_path` (``["result"]`` or ``["result", "value"]``) and is empty
+    when the result was not an array, in which case the envelope holds it.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self.envelope: Dict[str, Any] = {}
+        self.array_path: List[str] = []
+        self._result: Dict[str, Any] = {}
+        self._items = self._parse()
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping consumed text."""
+        if self._eof:
+            return False
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            self._buffer = self._buffer[self._pos:] + self._text.decode(chunk)
+            self._pos = 0
+            return True
+        self._buffer = self._buffer[self._pos:] + self._text.decode(b"", final=True)
+        self._pos = 0
+        self._eof = True
+        return False
+
+    def _peek(self) -> str:
+        """Next non-whitespace character, reading more input as needed."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise JSONStreamError("Unexpected end of response")
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise JSONStreamError(f"Expected {char!r} at offset {self._pos}")
+        self._pos += 1
+
+    def _value(self) -> Any:
+        """Decode one complete JSON value, reading more input until it is complete."""
+        self._peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise JSONStreamError(str(e))
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _members(self) -> Iterator[str]:
+        """Walk the keys of an object whose opening brace has been consumed."""
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            if not isinstance(key, str):
+                raise JSONStreamError("Object keys must be strings")
+            self._expect(":")
+            yield key
+            separator = self._peek()
+            self._pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise JSONStreamError(f"Expected ',' or '}}' at offset {self._pos - 1}")
+
+    def _array(self) -> Iterator[Any]:
+        """Yield the elements of an array whose opening bracket has been consumed."""
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._value()
+            separator = self._peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise JSONStreamError(f"Expected ',' or ']' at offset {self._pos - 1}")
+
+    def _result_object(self) -> Iterator[Any]:
+        for key in self._members():
+            if key == "value" and self._peek() == "[":
+                self._pos += 1
+                self.array_path = ["result", "value"]
+                yield from self._array()
+            else:
+                self._result[key] = self._value()
+
+    def items(self) -> Iterator[Any]:
+        """
+        Iterator over the elements of the result array as they are parsed.
+
+        The response is parsed once; every call returns the same iterator.
+
+        Raises:
+            JSONStreamError: While iterating, if the response is not a valid JSON object
+        """
+        return self._items
+
+    def _parse(self) -> Iterator[Any]:
+        self._expect("{")
+        for key in self._members():
+            if key != "result":
+                self.envelope[key] = self._value()
+                continue
+            start = self._peek()
+            if start == "[":
+                self._pos += 1
+                self.array_path = ["result"]
+                yield from self._array()
+            elif start == "{":
+                self._pos += 1
+                yield from self._result_object()
+                self.envelope["result"] = self._result
+            else:
+                self.envelope["result"] = self._value()
+
+    def finish(self) -> Dict[str, Any]:
+        """Parse the rest of the response, discarding unread array elements."""
+        for _ in self.items():
+            pass
+        return self.envelope
+
+    def build(self, replacement: Any) -> Dict[str, Any]:
+        """
+        Assemble the response with the streamed array replaced by another value.
+
+        Members after the array are only present if it was read to the end.
+
+        Args:
+            replacement: Value placed where the array was (typically a summary of it)
+
+        Returns:
+            dict: The JSON-RPC response
+        """
+        response = dict(self.envelope)
+        if self.array_path == ["result"]:
+            response["result"] = replacement
+        elif self.array_path == ["result", "value"]:
+            response["result"] = dict(self._result, value=replacement)
+        return response
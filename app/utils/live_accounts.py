@@ -0,0 +1,386 @@
+"""
+Live in-memory view of the most requested accounts over the RPC WebSocket.
+
+Hot addresses (exchange wallets, popular mints) are asked for again and again
+through getBalance, getAccountInfo and getTokenAccountBalance. When enabled,
+a background thread keeps an ``accountSubscribe`` subscription open for the
+most frequently requested accounts and a ``slotSubscribe`` subscription as a
+heartbeat. Each subscribed account is seeded with one getAccountInfo snapshot
+and then updated from notifications, so queries for it are answered from
+memory without an RPC call.
+
+Request counts are halved at every rebalance, so accounts that stop being
+asked for are unsubscribed. After a dropped connection the client reconnects
+with exponential backoff and subscribes again; nothing is served while the
+connection is down or the slot heartbeat has stalled.
+"""
+import asyncio
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config.settings import (
+    SOLANA_WS_URL,
+    LIVE_ACCOUNTS_MAX,
+    LIVE_ACCOUNTS_MIN_HITS,
+    LIVE_ACCOUNTS_REBALANCE_SECONDS,
+    LIVE_ACCOUNTS_STALE_SECONDS,
+    LIVE_ACCOUNTS_RECONNECT_MAX_DELAY,
+)
+from app.utils.cache import request_commitment
+from app.utils.rate_limit import PRIORITY_BACKGROUND, RateLimitTimeout, request_context
+from app.utils.rpc_client import RPCClientError, dumps, loads
+
+# Methods answered from the live view; each takes the account address as first parameter
+LIVE_METHODS = frozenset({"getBalance", "getAccountInfo", "getTokenAccountBalance"})
+
+# Encoding of the account subscriptions; getAccountInfo is only served for requests asking for it
+SUBSCRIPTION_ENCODING = "jsonParsed"
+
+# Seconds to wait for the answer to a subscribe or unsubscribe request
+WS_REQUEST_TIMEOUT = 10.0
+
+
+class LiveAccount:
+    """Latest known state of one subscribed account."""
+
+    __slots__ = ("address", "subscription", "slot", "value", "ready")
+
+    def __init__(self, address: str, subscription: int):
+        self.address = address
+        self.subscription = subscription
+        self.slot = -1
+        self.value: Any = None
+        self.ready = False
+
+
+def _fetch_snapshot(payload: Dict[str, Any]) -> Any:
+    """Fetch an account through the RPC router at background priority."""
+    from app.utils.rpc_router import rpc_router
+    with request_context(PRIORITY_BACKGROUND, WS_REQUEST_TIMEOUT):
+        return rpc_router.call(payload)
+
+
+class LiveAccountView:
+    """Subscription-backed view of hot accounts."""
+
+    def __init__(
+        self,
+        ws_url: str = SOLANA_WS_URL,
+        max_accounts: int = LIVE_ACCOUNTS_MAX,
+        min_hits: int = LIVE_ACCOUNTS_MIN_HITS,
+        rebalance_interval: float = LIVE_ACCOUNTS_REBALANCE_SECONDS,
+        stale_after: float = LIVE_ACCOUNTS_STALE_SECONDS,
+        reconnect_max_delay: float = LIVE_ACCOUNTS_RECONNECT_MAX_DELAY,
+        commitment: str = "finalized",
+        fetch: Callable[[Dict[str, Any]], Any] = _fetch_snapshot,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Configure the view; nothing connects until :meth:`start`.
+
+        Args:
+            ws_url: Solana RPC WebSocket endpoint
+            max_accounts: Upper bound on subscribed accounts
+            min_hits: Requests (after decay) an account needs to be subscribed
+            rebalance_interval: Seconds between subscription changes
+            stale_after: Seconds without a slot notification after which nothing is served
+            reconnect_max_delay: Upper bound of the reconnect backoff
+            commitment: Commitment of the subscriptions; only requests at this commitment are served
+            fetch: Sends the snapshot getAccountInfo request of a new subscription
+            clock: Monotonic time source
+        """
+        self.ws_url = ws_url
+        self.max_accounts = max_accounts
+        self.min_hits = min_hits
+        self.rebalance_interval = rebalance_interval
+        self.stale_after = stale_after
+        self.reconnect_max_delay = reconnect_max_delay
+        self.commitment = commitment
+        self.fetch = fetch
+        self.clock = clock
+
+        self._lock = threading.Lock()
+        self._hits: Dict[str, float] = {}
+        self._accounts: Dict[str, LiveAccount] = {}
+        self._by_subscription: Dict[int, LiveAccount] = {}
+        self.slot: Optional[int] = None
+        self._slot_seen = float("-inf")
+        self.connected = False
+        self.running = False
+        self.served = 0
+        self.notifications = 0
+        self.reconnects = 0
+
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._ws = None
+
+    # Called from request threads
+
+    def _address(self, data: Any) -> Optional[str]:
+        """Account of a request the live view could answer, None for any other request."""
+        if not self.running or not isinstance(data, dict) or data.get("method") not in LIVE_METHODS:
+            return None
+        params = data.get("params") or []
+        if not params or not isinstance(params[0], str) or request_commitment(data) != self.commitment:
+            return None
+        options = next((param for param in params[1:] if isinstance(param, dict)), {})
+        if "dataSlice" in options:
+            return None
+        # Account data must come back in the shape the request asked for
+        if data["method"] == "getAccountInfo" and options.get("encoding") != SUBSCRIPTION_ENCODING:
+            return None
+        return params[0]
+
+    def record_access(self, data: Dict[str, Any]) -> None:
+        """Count a request towards its account's subscription priority, if the live view could answer it."""
+        address = self._address(data)
+        if address is None:
+            return
+        with self._lock:
+            self._hits[address] = self._hits.get(address, 0) + 1
+
+    def is_fresh(self) -> bool:
+        """Whether the connection is up and slot notifications are arriving."""
+        return self.connected and self.clock() - self._slot_seen <= self.stale_after
+
+    def lookup(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Answer a request from the live view.
+
+        Args:
+            data: The JSON-RPC request object
+
+        Returns:
+            dict: JSON-RPC response built from the subscribed account, or None
+            if the account is not live or the request asks for something else
+            (another commitment or encoding, a data slice)
+        """
+        address = self._address(data)
+        if address is None:
+            return None
+        with self._lock:
+            account = self._accounts.get(address)
+            if account is None or not account.ready or not self.is_fresh():
+                return None
+            slot, value = account.slot, account.value
+
+        method = data["method"]
+        if method == "getBalance":
+            result = value["lamports"] if value else 0
+        elif method == "getTokenAccountBalance":
+            parsed = value.get("data") if value else None
+            info = parsed.get("parsed", {}).get("info", {}) if isinstance(parsed, dict) else {}
+            if "tokenAmount" not in info:
+                return None
+            result = info["tokenAmount"]
+        else:
+            result = value
+        with self._lock:
+            self.served += 1
+        return {"jsonrpc": "2.0", "id": data.get("id"), "result": {"context": {"slot": slot}, "value": result}}
+
+    def hot_accounts(self) -> List[str]:
+        """Addresses that should currently be subscribed, most requested first."""
+        with self._lock:
+            ranked = sorted(self._hits.items(), key=lambda item: item[1], reverse=True)
+        return [address for address, hits in ranked[:self.max_accounts] if hits >= self.min_hits]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get live view statistics.
+
+        Returns:
+            dict: Connection state, current slot, subscription and serving counters
+        """
+        with self._lock:
+            return {
+                "running": self.running,
+                "connected": self.connected,
+                "fresh": self.is_fresh(),
+                "slot": self.slot,
+                "subscribed": len(self._accounts),
+                "ready": sum(1 for account in self._accounts.values() if account.ready),
+                "tracked": len(self._hits),
+                "served": self.served,
+                "notifications": self.notifications,
+                "reconnects": self.reconnects,
+            }
+
+    # Lifecycle
+
+    def start(self) -> None:
+        """Start the subscriber thread."""
+        if self._thread is not None:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._run()), name="live-accounts", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Close the connection and stop the subscriber thread."""
+        self.running = False
+        thread, loop, stop = self._thread, self._loop, self._stop
+        if loop is not None and stop is not None:
+            loop.call_soon_threadsafe(stop.set)
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+    # Subscriber loop
+
+    def _update(self, account: LiveAccount, slot: int, value: Any) -> None:
+        with self._lock:
+            if slot >= account.slot:
+                account.slot, account.value, account.ready = slot, value, True
+
+    def _disconnected(self) -> None:
+        with self._lock:
+            self.connected = False
+            # Subscriptions do not survive the connection; the next session subscribes again
+            self._accounts.clear()
+            self._by_subscription.clear()
+
+    async def _run(self) -> None:
+        from websockets.asyncio.client import connect
+        from websockets.exceptions import WebSocketException
+
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        if not self.running:
+            return
+        delay = 0.5
+        while self.running and not self._stop.is_set():
+            try:
+                async with connect(self.ws_url, open_timeout=WS_REQUEST_TIMEOUT, max_size=None) as ws:
+                    delay = 0.5
+                    await self._session(ws)
+            except (OSError, asyncio.TimeoutError, WebSocketException, ConnectionError, RPCClientError) as e:
+                print(f'Error in live account subscriptions: {e}')
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                # A malformed message leaves the session in an unknown state; start a new one
+                print(f'Error in live account message: {e}')
+            self._disconnected()
+            if self._stop.is_set():
+                break
+            self.reconnects += 1
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, self.reconnect_max_delay)
+
+    async def _session(self, ws) -> None:
+        """Subscribe to slots, then keep the account subscriptions in line with demand."""
+        self._ws = ws
+        reader = asyncio.create_task(self._read(ws))
+        stopped = asyncio.create_task(self._stop.wait())
+        try:
+            await self._request("slotSubscribe", [])
+            with self._lock:
+                self.connected = True
+            while not self._stop.is_set():
+                await self._rebalance()
+                done, _ = await asyncio.wait(
+                    [reader, stopped], timeout=self.rebalance_interval, return_when=asyncio.FIRST_COMPLETED
+                )
+                if reader in done:
+                    reader.result()
+                    raise ConnectionError("WebSocket closed")
+        finally:
+            reader.cancel()
+            stopped.cancel()
+            self._ws = None
+
+    async def _read(self, ws) -> None:
+        try:
+            async for message in ws:
+                self._dispatch(loads(message))
+        finally:
+            # Requests still waiting for an answer will not get one on this connection
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("WebSocket closed"))
+            self._pending.clear()
+
+    def _dispatch(self, message: Dict[str, Any]) -> None:
+        """Resolve a pending request or apply a notification."""
+        if message.get("id") in self._pending:
+            future = self._pending.pop(message["id"])
+            if future.done():
+                return
+            if "error" in message:
+                future.set_exception(RPCClientError(str(message["error"])))
+            else:
+                future.set_result(message.get("result"))
+            return
+        method = message.get("method")
+        params = message.get("params") or {}
+        if method == "slotNotification":
+            with self._lock:
+                self.slot = params.get("result", {}).get("slot", self.slot)
+                self._slot_seen = self.clock()
+        elif method == "accountNotification":
+            with self._lock:
+                account = self._by_subscription.get(params.get("subscription"))
+                self.notifications += 1
+            if account is not None:
+                result = params.get("result") or {}
+                self._update(account, result.get("context", {}).get("slot", 0), result.get("value"))
+
+    async def _request(self, method: str, params: List[Any]) -> Any:
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        await self._ws.send(dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}).decode())
+        return await asyncio.wait_for(future, timeout=WS_REQUEST_TIMEOUT)
+
+    async def _rebalance(self) -> None:
+        """Subscribe newly hot accounts, unsubscribe cold ones and decay the request counts."""
+        desired = self.hot_accounts()
+        with self._lock:
+            for address in list(self._hits):
+                self._hits[address] /= 2
+                if self._hits[address] < 1:
+                    del self._hits[address]
+            cold = [account for address, account in self._accounts.items() if address not in desired]
+            for account in cold:
+                del self._accounts[account.address]
+                self._by_subscription.pop(account.subscription, None)
+            new = [address for address in desired if address not in self._accounts]
+
+        for account in cold:
+            try:
+                await self._request("accountUnsubscribe", [account.subscription])
+            except RPCClientError as e:
+                print(f'Error unsubscribing {account.address}: {e}')
+        for address in new:
+            config = {"encoding": SUBSCRIPTION_ENCODING, "commitment": self.commitment}
+            try:
+                subscription = await self._request("accountSubscribe", [address, config])
+            except RPCClientError as e:
+                print(f'Error subscribing {address}: {e}')
+                continue
+            account = LiveAccount(address, subscription)
+            with self._lock:
+                self._accounts[address] = account
+                self._by_subscription[subscription] = account
+            # Notifications only report changes; seed the account with its current state
+            payload = {"jsonrpc": "2.0", "id": 1, "method": "getAccountInfo", "params": [address, config]}
+            try:
+                response = await asyncio.get_running_loop().run_in_executor(None, self.fetch, payload)
+            except (RPCClientError, RateLimitTimeout) as e:
+                print(f'Error fetching {address}: {e}')
+                continue
+            result = response.get("result") if isinstance(response, dict) else None
+            if isinstance(result, dict) and "context" in result:
+                self._update(account, result["context"].get("slot", 0), result.get("value"))
+
+
+# Create a shared live view instance
+live_accounts = LiveAccountView()
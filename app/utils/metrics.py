@@ -0,0 +1,269 @@
+"""
+In-process metrics with Prometheus text exposition and optional tracing.
+
+Metrics are plain counters, gauges and histograms kept in memory and rendered
+on demand by the /metrics endpoint, so recording a sample costs a lock and a
+few additions. When OTEL_ENABLED is set and the opentelemetry packages are
+installed, :func:`span` also opens an OpenTelemetry span around the block.
+"""
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.config.settings import OTEL_ENABLED, OTEL_SERVICE_NAME
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base class of labelled metrics."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """Add to the count of a label combination."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        """Set the value of a label combination."""
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observations over cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label combination: bucket counts (last slot is +Inf), sum and count
+        self._values: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Record one observation."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[2] if state else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, ([*state[0]], state[1], state[2])) for key, state in self._values.items())
+        lines = self.header()
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> Any:
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.register(Histogram(
+    "solana_assistant_stage_seconds", "Duration of query processing stages", ["stage"]
+))
+RPC_CALL_SECONDS = registry.register(Histogram(
+    "solana_assistant_rpc_call_seconds", "Duration of JSON-RPC calls by method and outcome", ["method", "status"]
+))
+QUEUE_SECONDS = registry.register(Histogram(
+    "solana_assistant_queue_seconds", "Time queries wait for a worker"
+))
+REQUEST_SECONDS = registry.register(Histogram(
+    "solana_assistant_http_request_seconds", "HTTP request latency by route and status", ["path", "status"]
+))
+LLM_TOKENS = registry.register(Counter(
+    "solana_assistant_llm_tokens_total", "LLM tokens used by stage", ["stage", "kind"]
+))
+EXECUTOR_RUNNING = registry.register(Gauge(
+    "solana_assistant_executor_running", "Queries currently being processed"
+))
+EXECUTOR_QUEUE_DEPTH = registry.register(Gauge(
+    "solana_assistant_executor_queue_depth", "Queries waiting for a worker"
+))
+
+_tracer = None
+if OTEL_ENABLED:
+    try:
+        from opentelemetry import trace
+        _tracer = trace.get_tracer(OTEL_SERVICE_NAME)
+    except ImportError:
+        print("Warning: OTEL_ENABLED is set but opentelemetry is not installed")
+
+
+def configure_tracing() -> bool:
+    """
+    Install an OTLP exporting tracer provider if tracing is enabled.
+
+    The exporter reads the standard OTEL_EXPORTER_OTLP_* environment variables.
+
+    Returns:
+        bool: Whether spans are exported
+    """
+    if _tracer is None:
+        return False
+    try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError as e:
+        print(f'Error configuring tracing: {e}')
+        return False
+    provider = TracerProvider(resource=Resource.create({"service.name": OTEL_SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    return True
+
+
+@contextmanager
+def span(stage: str, **attributes: Any) -> Iterator[None]:
+    """
+    Time a processing stage into the stage histogram and, if enabled, a trace span.
+
+    Args:
+        stage: Stage name used as the histogram label and span name
+        attributes: Span attributes (not used as metric labels)
+    """
+    start = time.perf_counter()
+    if _tracer is None:
+        try:
+            yield
+        finally:
+            STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+        return
+    with _tracer.start_as_current_span(stage, attributes=attributes):
+        try:
+            yield
+        finally:
+            STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+
+
+def record_rpc_call(method: str, status: str, seconds: float) -> None:
+    """Record the outcome and duration of a JSON-RPC call."""
+    RPC_CALL_SECONDS.observe(seconds, method=method, status=status)
+
+
+def token_counts(usage: Any) -> Tuple[int, int]:
+    """Prompt and completion tokens of a crewai UsageMetrics, zero when unavailable."""
+    prompt = getattr(usage, "prompt_tokens", 0)
+    completion = getattr(usage, "completion_tokens", 0)
+    if not isinstance(prompt, int) or not isinstance(completion, int):
+        return 0, 0
+    return prompt, completion
+
+
+def record_llm_tokens(stage: str, prompt: int, completion: int) -> None:
+    """Add LLM token usage of a stage."""
+    if prompt > 0:
+        LLM_TOKENS.inc(prompt, stage=stage, kind="prompt")
+    if completion > 0:
+        LLM_TOKENS.inc(completion, stage=stage, kind="completion")
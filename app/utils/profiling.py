@@ -0,0 +1,82 @@
+"""
+Startup timing: how long heavy imports and initialization stages take.
+
+For a complete per-module breakdown run ``python -X importtime main.py``; the
+report kept here covers the imports and stages the service controls, and is
+served by the readiness endpoint so regressions are visible in production.
+"""
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Any, Dict, Iterator
+
+
+class StartupTimer:
+    """Record the duration of named imports and startup stages."""
+
+    def __init__(self):
+        """Initialize an empty report."""
+        self._lock = threading.Lock()
+        self.imports: Dict[str, float] = {}
+        self.stages: Dict[str, float] = {}
+
+    def record(self, stage: str, seconds: float) -> None:
+        """
+        Record the duration of a stage measured elsewhere.
+
+        Args:
+            stage: Stage name
+            seconds: Elapsed wall time
+        """
+        with self._lock:
+            self.stages[stage] = seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Context manager timing one startup stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def timed_import(self, name: str) -> ModuleType:
+        """
+        Import a module, recording how long it took if it was not loaded yet.
+
+        Args:
+            name: Dotted module name
+
+        Returns:
+            The imported module
+        """
+        if name in sys.modules:
+            return sys.modules[name]
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        with self._lock:
+            self.imports[name] = time.perf_counter() - start
+        return module
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Get the timing report in milliseconds.
+
+        Returns:
+            dict: Per-import and per-stage durations and their total
+        """
+        with self._lock:
+            imports = {name: round(seconds * 1000, 1) for name, seconds in self.imports.items()}
+            stages = {name: round(seconds * 1000, 1) for name, seconds in self.stages.items()}
+        return {
+            "imports_ms": imports,
+            "stages_ms": stages,
+            "total_ms": round(sum(stages.values()), 1),
+        }
+
+
+# Create a shared timer instance
+startup_timer = StartupTimer()
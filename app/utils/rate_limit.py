@@ -0,0 +1,299 @@
+"""
+Client-side rate limiting of upstream quotas with priority scheduling.
+
+Each upstream (the RPC provider, the LLM) gets a limiter made of token
+buckets, for example credits per second and per minute. Callers wait in a
+priority queue: interactive queries are served before batch and background
+work, and callers of equal priority are served in arrival order. A caller
+whose deadline would pass before its turn fails immediately with
+:class:`RateLimitTimeout` rather than sending a request the upstream would
+reject with a 429.
+
+The priority and deadline of the current request travel in context
+variables, so code deep in the call stack does not need extra arguments.
+"""
+import contextvars
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from app.config.settings import (
+    RPC_CREDITS_PER_SECOND,
+    RPC_CREDITS_PER_MINUTE,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+    RATE_LIMIT_MAX_WAIT,
+)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+PRIORITY_BACKGROUND = 2
+
+request_priority: contextvars.ContextVar[int] = contextvars.ContextVar("request_priority", default=PRIORITY_INTERACTIVE)
+request_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("request_deadline", default=None)
+
+# Provider credit cost of each RPC method; unlisted methods cost DEFAULT_RPC_CREDITS
+RPC_METHOD_CREDITS = {
+    "getProgramAccounts": 10,
+    "getTokenLargestAccounts": 5,
+    "getTokenAccountsByOwner": 5,
+    "getTokenAccountsByDelegate": 5,
+    "getSignaturesForAddress": 5,
+    "getMultipleAccounts": 2,
+    "getTransaction": 2,
+    "requestAirdrop": 5,
+    "sendTransaction": 5,
+}
+DEFAULT_RPC_CREDITS = 1
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a caller cannot be admitted before its deadline."""
+
+    def __init__(self, limiter: str, retry_after: float):
+        super().__init__(f"Rate limit for {limiter} would be exceeded before the request deadline")
+        self.limiter = limiter
+        self.retry_after = retry_after
+
+
+@contextmanager
+def request_context(priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = None) -> Iterator[None]:
+    """
+    Set the priority and deadline of the work started within the block.
+
+    Args:
+        priority: One of the PRIORITY_* constants, lower is served first
+        timeout: Seconds from now until the deadline, None for no deadline
+    """
+    priority_token = request_priority.set(priority)
+    deadline_token = request_deadline.set(time.monotonic() + timeout if timeout is not None else None)
+    try:
+        yield
+    finally:
+        request_deadline.reset(deadline_token)
+        request_priority.reset(priority_token)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a fixed rate."""
+
+    def __init__(self, unit: str, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize a full bucket.
+
+        Args:
+            unit: Name of the cost dimension the bucket limits, e.g. "credits" or "tokens"
+            rate: Tokens added per second
+            capacity: Maximum tokens held, i.e. the allowed burst
+            clock: Monotonic time source
+        """
+        self.unit = unit
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` tokens are available."""
+        self._refill()
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0.0, missing / self.rate)
+
+    @property
+    def label(self) -> str:
+        """Bucket name such as ``credits/60s``."""
+        return f"{self.unit}/{self.capacity / self.rate:g}s"
+
+    def available(self) -> float:
+        """Tokens currently available."""
+        self._refill()
+        return max(0.0, self.tokens)
+
+    def take(self, amount: float) -> None:
+        """Remove tokens; callers check :meth:`wait_time` first."""
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """Priority-ordered admission against one or more token buckets."""
+
+    def __init__(self, name: str, buckets: List[TokenBucket], max_wait: float = RATE_LIMIT_MAX_WAIT,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Label used in errors and statistics
+            buckets: Buckets that must all have room for a call
+            max_wait: Longest wait in seconds for callers without a request deadline
+            clock: Monotonic time source
+        """
+        self.name = name
+        self.buckets = buckets
+        self.max_wait = max_wait
+        self.clock = clock
+        self._condition = threading.Condition()
+        self._waiters: List[List[Any]] = []
+        self._sequence = itertools.count()
+        self.admitted = 0
+        self.waited = 0
+        self.rejected = 0
+        self.wait_seconds = 0.0
+
+    def _wait_time(self, costs: Dict[str, float]) -> float:
+        return max((bucket.wait_time(costs.get(bucket.unit, 0)) for bucket in self.buckets), default=0.0)
+
+    def _take(self, costs: Dict[str, float]) -> None:
+        for bucket in self.buckets:
+            bucket.take(costs.get(bucket.unit, 0))
+
+    def acquire(self, costs: Dict[str, float], priority: Optional[int] = None,
+                deadline: Optional[float] = None) -> float:
+        """
+        Wait for this caller's turn and consume its costs.
+
+        Args:
+            costs: Cost per bucket unit, e.g. {"requests": 1, "tokens": 800}
+            priority: Scheduling priority, defaults to the request's priority
+            deadline: Monotonic deadline, defaults to the request's deadline or max_wait from now
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            RateLimitTimeout: If the caller would not be admitted before its deadline
+        """
+        if not self.buckets:
+            return 0.0
+        priority = request_priority.get() if priority is None else priority
+        if deadline is None:
+            deadline = request_deadline.get()
+        start = self.clock()
+        if deadline is None:
+            deadline = start + self.max_wait
+
+        with self._condition:
+            entry = [priority, next(self._sequence)]
+            heapq.heappush(self._waiters, entry)
+            blocked = False
+            try:
+                while True:
+                    now = self.clock()
+                    wait = self._wait_time(costs)
+                    if self._waiters[0] is entry:
+                        if wait <= 0:
+                            self._take(costs)
+                            break
+                        if now + wait > deadline:
+                            # Its turn cannot come in time: fail now instead of waiting in vain
+                            raise self._timeout(wait)
+                        blocked = True
+                        self._condition.wait(wait)
+                    else:
+                        if now >= deadline:
+                            raise self._timeout(wait)
+                        blocked = True
+                        self._condition.wait(deadline - now)
+            except RateLimitTimeout:
+                self.rejected += 1
+                raise
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+
+            self.admitted += 1
+            if not blocked:
+                return 0.0
+            waited = self.clock() - start
+            self.waited += 1
+            self.wait_seconds += waited
+            return waited
+
+    def try_acquire(self, costs: Dict[str, float]) -> bool:
+        """
+        Consume costs only if nobody is waiting and the buckets have room now.
+
+        Args:
+            costs: Cost per bucket unit
+
+        Returns:
+            bool: Whether the costs were consumed
+        """
+        with self._condition:
+            if self._waiters or self._wait_time(costs) > 0:
+                return False
+            self._take(costs)
+            self.admitted += 1
+            return True
+
+    def _timeout(self, wait: float) -> RateLimitTimeout:
+        return RateLimitTimeout(self.name, max(1, math.ceil(wait)))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get limiter statistics.
+
+        Returns:
+            dict: Admissions, waits, rejections, queue length and available tokens
+        """
+        with self._condition:
+            return {
+                "admitted": self.admitted,
+                "waited": self.waited,
+                "rejected": self.rejected,
+                "wait_seconds_total": round(self.wait_seconds, 4),
+                "queued": len(self._waiters),
+                "available": {bucket.label: round(bucket.available(), 2) for bucket in self.buckets},
+            }
+
+
+def build_buckets(limits: List[tuple]) -> List[TokenBucket]:
+    """
+    Build buckets from (unit, amount, period seconds) limits, skipping disabled ones.
+
+    Args:
+        limits: Tuples of unit name, allowed amount per period (0 disables) and period
+
+    Returns:
+        list: The enabled buckets
+    """
+    return [TokenBucket(unit, amount / period, amount) for unit, amount, period in limits if amount > 0]
+
+
+def rpc_credits(payload: Any) -> Dict[str, float]:
+    """
+    Credit cost of a JSON-RPC request or batch.
+
+    Args:
+        payload: JSON-RPC request object or batch array
+
+    Returns:
+        dict: Cost for the RPC limiter
+    """
+    requests = payload if isinstance(payload, list) else [payload]
+    total = sum(RPC_METHOD_CREDITS.get(request.get("method"), DEFAULT_RPC_CREDITS)
+                for request in requests if isinstance(request, dict))
+    return {"credits": total}
+
+
+# Shared limiters for the RPC provider and the LLM
+rpc_limiter = RateLimiter("rpc", build_buckets([
+    ("credits", RPC_CREDITS_PER_SECOND, 1),
+    ("credits", RPC_CREDITS_PER_MINUTE, 60),
+]))
+llm_limiter = RateLimiter("llm", build_buckets([
+    ("requests", LLM_REQUESTS_PER_MINUTE, 60),
+    ("tokens", LLM_TOKENS_PER_MINUTE, 60),
+]))
@@ -0,0 +1,164 @@
+"""
+Local reduction of large list results before they reach renderers or the LLM.
+
+Token account and program account listings grow with the size of the wallet
+or program. They are reduced to a fixed-size summary (count, totals and the
+top entries by balance) as the elements are read, whether they arrive from a
+streamed response or an already decoded one, so neither memory nor prompt
+size depends on the number of accounts.
+"""
+import heapq
+import itertools
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from app.config.settings import LARGE_RESULT_TOP_N, LARGE_RESULT_MAX_ITEMS
+
+Reducer = Callable[[Iterable[Any]], Dict[str, Any]]
+
+
+class TopN:
+    """Keep the `size` items with the largest keys seen so far."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._heap: List[Any] = []
+        self._order = itertools.count()
+
+    def add(self, key: float, item: Any) -> None:
+        # The counter breaks ties so that items themselves are never compared
+        entry = (key, -next(self._order), item)
+        if len(self._heap) < self.size:
+            heapq.heappush(self._heap, entry)
+        elif self.size and entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List[Any]:
+        """Kept items, largest first (earliest first among equal keys)."""
+        return [item for _, _, item in sorted(self._heap, reverse=True)]
+
+
+def _limited(items: Iterable[Any], max_items: int) -> Iterable[Any]:
+    return itertools.islice(items, max_items) if max_items > 0 else items
+
+
+def _ui_amount(amount: Dict[str, Any]) -> float:
+    try:
+        return int(amount.get("amount", 0)) / 10 ** int(amount.get("decimals", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def summarize_token_accounts(items: Iterable[Any], top_n: int = LARGE_RESULT_TOP_N,
+                             max_items: int = LARGE_RESULT_MAX_ITEMS) -> Dict[str, Any]:
+    """
+    Summarize jsonParsed token accounts.
+
+    Args:
+        items: Keyed accounts ({"pubkey", "account"}) as returned by getTokenAccountsBy*
+        top_n: Number of accounts with the largest balances to keep
+        max_items: Accounts to read before stopping (0 reads all)
+
+    Returns:
+        dict: count, empty account count, distinct mint count, top accounts and
+        whether the listing was truncated
+    """
+    iterator = iter(items)
+    top = TopN(top_n)
+    mints = set()
+    count = empty = 0
+    for keyed in _limited(iterator, max_items):
+        count += 1
+        parsed = keyed.get("account", {}).get("data", {})
+        info = parsed.get("parsed", {}).get("info", {}) if isinstance(parsed, dict) else {}
+        amount = info.get("tokenAmount", {})
+        mints.add(info.get("mint"))
+        ui_amount = _ui_amount(amount)
+        if ui_amount == 0:
+            empty += 1
+        entry = {"pubkey": keyed.get("pubkey"), "mint": info.get("mint"), "tokenAmount": amount}
+        if info.get("delegatedAmount"):
+            entry["delegatedAmount"] = info["delegatedAmount"]
+        top.add(ui_amount, entry)
+    return {
+        "count": count,
+        "empty_accounts": empty,
+        "mints": len(mints),
+        "top": top.items(),
+        "truncated": next(iterator, None) is not None,
+    }
+
+
+def summarize_program_accounts(items: Iterable[Any], top_n: int = LARGE_RESULT_TOP_N,
+                               max_items: int = LARGE_RESULT_MAX_ITEMS) -> Dict[str, Any]:
+    """
+    Summarize program accounts.
+
+    Args:
+        items: Keyed accounts ({"pubkey", "account"}) as returned by getProgramAccounts
+        top_n: Number of accounts with the most lamports to keep
+        max_items: Accounts to read before stopping (0 reads all)
+
+    Returns:
+        dict: count, total lamports and bytes, top accounts and whether the
+        listing was truncated
+    """
+    iterator = iter(items)
+    top = TopN(top_n)
+    count = total_lamports = total_space = 0
+    for keyed in _limited(iterator, max_items):
+        account = keyed.get("account", {})
+        lamports = account.get("lamports", 0)
+        space = account.get("space", 0)
+        count += 1
+        total_lamports += lamports
+        total_space += space
+        top.add(lamports, {
+            "pubkey": keyed.get("pubkey"), "owner": account.get("owner"), "lamports": lamports, "space": space,
+        })
+    return {
+        "count": count,
+        "total_lamports": total_lamports,
+        "total_space": total_space,
+        "top": top.items(),
+        "truncated": next(iterator, None) is not None,
+    }
+
+
+# Methods whose results are reduced, keyed by JSON-RPC method name
+REDUCERS: Dict[str, Reducer] = {
+    "getTokenAccountsByOwner": summarize_token_accounts,
+    "getTokenAccountsByDelegate": summarize_token_accounts,
+    "getProgramAccounts": summarize_program_accounts,
+}
+
+
+def reducer_for(data: Any) -> Optional[Reducer]:
+    """Reducer for a single JSON-RPC request, or None if its result is kept as is."""
+    if not isinstance(data, dict):
+        return None
+    return REDUCERS.get(data.get("method"))
+
+
+def reduce_response(data: Dict[str, Any], response: Any) -> Any:
+    """
+    Replace the list in a decoded response by its summary.
+
+    Responses that were already reduced while streaming, errors and results
+    of other methods are returned unchanged.
+
+    Args:
+        data: The JSON-RPC request
+        response: The decoded JSON-RPC response
+
+    Returns:
+        The response with a summary in place of the account list
+    """
+    reducer = reducer_for(data)
+    if reducer is None or not isinstance(response, dict):
+        return response
+    result = response.get("result")
+    if isinstance(result, list):
+        return dict(response, result=reducer(result))
+    if isinstance(result, dict) and isinstance(result.get("value"), list):
+        return dict(response, result=dict(result, value=reducer(result["value"])))
+    return response
@@ -0,0 +1,244 @@
+"""
+Pooled JSON-RPC client for the Solana API.
+
+A single client is shared by the CrewAI tool and any direct callers so that
+connections (and their TLS sessions) are kept alive and reused instead of being
+re-established for every blockchain call.
+"""
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import httpx
+
+from app.config.settings import (
+    SOLANA_API_URL,
+    RPC_CONNECT_TIMEOUT,
+    RPC_READ_TIMEOUT,
+    RPC_MAX_CONNECTIONS,
+    RPC_MAX_KEEPALIVE_CONNECTIONS,
+    RPC_KEEPALIVE_EXPIRY,
+    RPC_HTTP2,
+)
+from app.utils.json_stream import JSONStreamError, StreamedRPCResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with requirements.txt
+    orjson = None
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - h2 ships with requirements.txt
+    HTTP2_AVAILABLE = False
+
+JSONPayload = Union[Dict[str, Any], List[Dict[str, Any]]]
+
+JSON_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
+
+# Bytes read from the socket at a time when a response is parsed incrementally
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Methods with side effects: never deduplicated, replayed or sent twice
+MUTATING_METHODS = frozenset({"requestAirdrop", "sendTransaction", "simulateTransaction"})
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize an object to JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    import json
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def loads(content: Union[bytes, str]) -> Any:
+    """Deserialize JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(content)
+    import json
+    return json.loads(content)
+
+
+class RPCClientError(Exception):
+    """Raised when a JSON-RPC call cannot be completed."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class SolanaRPCClient:
+    """
+    Keep-alive JSON-RPC client with sync and async entry points.
+
+    The underlying httpx clients are created lazily. The async client is bound
+    to the event loop it was first used on and is recreated if called from a
+    different loop.
+    """
+
+    def __init__(
+        self,
+        url: str = SOLANA_API_URL,
+        connect_timeout: float = RPC_CONNECT_TIMEOUT,
+        read_timeout: float = RPC_READ_TIMEOUT,
+        max_connections: int = RPC_MAX_CONNECTIONS,
+        max_keepalive_connections: int = RPC_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = RPC_KEEPALIVE_EXPIRY,
+        http2: bool = RPC_HTTP2,
+    ):
+        """
+        Initialize the client configuration.
+
+        Args:
+            url: Default JSON-RPC endpoint
+            connect_timeout: Seconds allowed to establish a connection
+            read_timeout: Seconds allowed to wait for response data
+            max_connections: Upper bound on open connections
+            max_keepalive_connections: Idle connections kept in the pool
+            keepalive_expiry: Seconds an idle connection is kept alive
+            http2: Negotiate HTTP/2 when the h2 package is installed
+        """
+        self.url = url
+        self.timeout = httpx.Timeout(
+            read_timeout, connect=connect_timeout, read=read_timeout
+        )
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        if http2 and not HTTP2_AVAILABLE:
+            print("Warning: RPC_HTTP2 is enabled but the h2 package is not installed")
+        self.http2 = http2 and HTTP2_AVAILABLE
+
+        self._lock = threading.Lock()
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _client_options(self) -> Dict[str, Any]:
+        return {
+            "timeout": self.timeout,
+            "limits": self.limits,
+            "http2": self.http2,
+            "headers": JSON_HEADERS,
+        }
+
+    @property
+    def client(self) -> httpx.Client:
+        """Shared synchronous httpx client."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = httpx.Client(**self._client_options())
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """Shared asynchronous httpx client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_client = httpx.AsyncClient(**self._client_options())
+            self._async_loop = loop
+        return self._async_client
+
+    @staticmethod
+    def _decode(response: httpx.Response) -> Any:
+        if response.status_code != 200:
+            raise RPCClientError(
+                f"API call failed with status code {response.status_code}",
+                status_code=response.status_code,
+            )
+        try:
+            return loads(response.content)
+        except ValueError as e:
+            raise RPCClientError(f"Invalid JSON in API response: {e}")
+
+    def call(self, payload: JSONPayload, url: Optional[str] = None,
+             reduce: Optional[Callable[[Iterable[Any]], Any]] = None) -> Any:
+        """
+        Send a JSON-RPC request (or batch) and return the decoded response.
+
+        Args:
+            payload: JSON-RPC request object or a batch array of them
+            url: Endpoint override, defaults to the configured URL
+            reduce: Optional function consuming the elements of an array result
+                as they are parsed; its return value replaces the array
+
+        Returns:
+            The decoded JSON response
+
+        Raises:
+            RPCClientError: If the request fails or the response is not valid JSON
+        """
+        if reduce is not None:
+            return self._call_reduced(payload, url, reduce)
+        try:
+            response = self.client.post(url or self.url, content=dumps(payload))
+        except httpx.HTTPError as e:
+            raise RPCClientError(str(e) or e.__class__.__name__)
+        return self._decode(response)
+
+    def _call_reduced(self, payload: Dict[str, Any], url: Optional[str],
+                      reduce: Callable[[Iterable[Any]], Any]) -> Any:
+        """Stream a response, reducing its result array without holding it in memory."""
+        try:
+            with self.client.stream("POST", url or self.url, content=dumps(payload)) as response:
+                if response.status_code != 200:
+                    raise RPCClientError(
+                        f"API call failed with status code {response.status_code}",
+                        status_code=response.status_code,
+                    )
+                streamed = StreamedRPCResponse(response.iter_bytes(STREAM_CHUNK_SIZE))
+                summary = reduce(streamed.items())
+                if streamed.array_path:
+                    # A reducer that stopped early leaves the rest unread; the connection is dropped
+                    result = streamed.build(summary)
+                else:
+                    result = streamed.finish()
+        except httpx.HTTPError as e:
+            raise RPCClientError(str(e) or e.__class__.__name__)
+        except JSONStreamError as e:
+            raise RPCClientError(f"Invalid JSON in API response: {e}")
+        result.setdefault("id", payload.get("id"))
+        return result
+
+    async def acall(self, payload: JSONPayload, url: Optional[str] = None) -> Any:
+        """
+        Asynchronous variant of :meth:`call`.
+
+        Args:
+            payload: JSON-RPC request object or a batch array of them
+            url: Endpoint override, defaults to the configured URL
+
+        Returns:
+            The decoded JSON response
+
+        Raises:
+            RPCClientError: If the request fails or the response is not valid JSON
+        """
+        try:
+            response = await self.async_client.post(url or self.url, content=dumps(payload))
+        except httpx.HTTPError as e:
+            raise RPCClientError(str(e) or e.__class__.__name__)
+        return self._decode(response)
+
+    def close(self) -> None:
+        """Close the synchronous connection pool."""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+    async def aclose(self) -> None:
+        """Close both connection pools."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_loop = None
+        self.close()
+
+
+# Create a shared client instance
+rpc_client = SolanaRPCClient()
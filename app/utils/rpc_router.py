@@ -0,0 +1,319 @@
+"""
+Latency-aware routing of JSON-RPC calls across several Solana endpoints.
+
+Every endpoint keeps a rolling window of call latencies and outcomes. Calls go
+to the healthiest, fastest endpoint; an endpoint that fails repeatedly is
+benched for a cooldown period. Read-only calls fail over to the next endpoint
+and can optionally be hedged: if the first endpoint has not answered within
+its p95 latency, the same call is sent to the next endpoint and the first
+successful response wins. Mutating methods such as requestAirdrop are sent to
+exactly one endpoint, exactly once.
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.config.settings import (
+    SOLANA_API_URLS,
+    RPC_HEDGING,
+    RPC_HEDGE_MIN_DELAY,
+    RPC_HEDGE_MAX_DELAY,
+    RPC_HEALTH_WINDOW,
+    RPC_MAX_CONSECUTIVE_FAILURES,
+    RPC_FAILURE_COOLDOWN,
+)
+from app.utils.rate_limit import RateLimiter, rpc_credits, rpc_limiter
+from app.utils.reducers import Reducer
+from app.utils.rpc_client import JSONPayload, MUTATING_METHODS, RPCClientError, SolanaRPCClient, rpc_client
+
+# Seconds added to an endpoint's score per unit of error rate, so that
+# failures outweigh any realistic latency difference
+ERROR_PENALTY_SECONDS = 10.0
+
+
+def is_read_only(payload: JSONPayload) -> bool:
+    """
+    Check that a request (or every request of a batch) has no side effects.
+
+    Args:
+        payload: JSON-RPC request object or batch array
+
+    Returns:
+        bool: Whether the payload may be retried or sent to several endpoints
+    """
+    requests = payload if isinstance(payload, list) else [payload]
+    return all(isinstance(request, dict) and request.get("method") not in MUTATING_METHODS for request in requests)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+class EndpointHealth:
+    """Rolling latency and error statistics of one endpoint."""
+
+    def __init__(self, url: str, window: int = RPC_HEALTH_WINDOW, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize empty statistics.
+
+        Args:
+            url: Endpoint URL
+            window: Number of recent calls kept
+            clock: Monotonic time source
+        """
+        self.url = url
+        self.clock = clock
+        self.samples: Deque[Tuple[float, bool]] = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.benched_until = 0.0
+        self.calls = 0
+        self.failures = 0
+        self.hedges_won = 0
+
+    def record(self, latency: float, ok: bool, max_failures: int, cooldown: float) -> None:
+        """Add the outcome of one call, benching the endpoint after repeated failures."""
+        self.samples.append((latency, ok))
+        self.calls += 1
+        if ok:
+            self.consecutive_failures = 0
+            return
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= max_failures:
+            self.benched_until = self.clock() + cooldown
+            self.consecutive_failures = 0
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the endpoint is outside its failure cooldown."""
+        return self.clock() >= self.benched_until
+
+    @property
+    def error_rate(self) -> float:
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, ok in self.samples if not ok) / len(self.samples)
+
+    def latency(self, fraction: float) -> Optional[float]:
+        """Latency percentile of the successful calls in the window, None before the first success."""
+        latencies = [latency for latency, ok in self.samples if ok]
+        if not latencies:
+            return None
+        return percentile(latencies, fraction)
+
+    def score(self) -> float:
+        """Lower is better: median latency plus an error rate penalty; unmeasured endpoints go first."""
+        if not self.samples:
+            return 0.0
+        # Fast failures must not make an endpoint look fast
+        return (self.latency(0.5) or 0.0) + ERROR_PENALTY_SECONDS * self.error_rate
+
+    def stats(self) -> Dict[str, Any]:
+        p50, p95 = self.latency(0.5), self.latency(0.95)
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "calls": self.calls,
+            "failures": self.failures,
+            "error_rate": round(self.error_rate, 4),
+            "p50_ms": round(p50 * 1000, 2) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 2) if p95 is not None else None,
+            "hedges_won": self.hedges_won,
+        }
+
+
+class RPCRouter:
+    """Route JSON-RPC calls to the best of several endpoints, with optional hedging."""
+
+    def __init__(
+        self,
+        urls: List[str] = SOLANA_API_URLS,
+        client: SolanaRPCClient = rpc_client,
+        limiter: Optional[RateLimiter] = rpc_limiter,
+        hedging: bool = RPC_HEDGING,
+        hedge_min_delay: float = RPC_HEDGE_MIN_DELAY,
+        hedge_max_delay: float = RPC_HEDGE_MAX_DELAY,
+        window: int = RPC_HEALTH_WINDOW,
+        max_failures: int = RPC_MAX_CONSECUTIVE_FAILURES,
+        cooldown: float = RPC_FAILURE_COOLDOWN,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            urls: JSON-RPC endpoints, in order of preference before any call is measured
+            client: Pooled client used for every endpoint
+            limiter: Credit limiter every upstream call is admitted through, None for no limit
+            hedging: Send a duplicate read-only call to the next endpoint when the first is slow
+            hedge_min_delay: Lower bound in seconds of the wait before hedging
+            hedge_max_delay: Upper bound in seconds of the wait before hedging
+            window: Number of recent calls used for each endpoint's statistics
+            max_failures: Consecutive failures after which an endpoint is benched
+            cooldown: Seconds a benched endpoint is skipped
+            clock: Monotonic time source
+        """
+        if not urls:
+            raise ValueError("At least one RPC endpoint is required")
+        self.client = client
+        self.limiter = limiter
+        self.hedging = hedging
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_max_delay = hedge_max_delay
+        self.max_failures = max_failures
+        self.cooldown = cooldown
+        self.endpoints = [EndpointHealth(url, window, clock) for url in urls]
+        self.hedged_calls = 0
+
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        """Lazily created pool running hedged calls."""
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(thread_name_prefix="rpc-hedge")
+        return self._pool
+
+    def ranked(self) -> List[EndpointHealth]:
+        """
+        Order endpoints from best to worst.
+
+        Returns:
+            list: Healthy endpoints by score, then benched ones as a last resort
+        """
+        with self._lock:
+            order = {id(endpoint): index for index, endpoint in enumerate(self.endpoints)}
+            return sorted(
+                self.endpoints,
+                key=lambda endpoint: (not endpoint.healthy, endpoint.score(), order[id(endpoint)]),
+            )
+
+    def hedge_delay(self, endpoint: EndpointHealth) -> float:
+        """Seconds to wait for an endpoint before hedging: its p95 latency, clamped."""
+        with self._lock:
+            p95 = endpoint.latency(0.95)
+        if p95 is None:
+            return self.hedge_max_delay
+        return min(self.hedge_max_delay, max(self.hedge_min_delay, p95))
+
+    def _send(self, endpoint: EndpointHealth, payload: JSONPayload, reduce: Optional[Reducer] = None) -> Any:
+        """Call one endpoint and record the outcome."""
+        start = time.perf_counter()
+        try:
+            response = self.client.call(payload, url=endpoint.url, reduce=reduce)
+        except RPCClientError:
+            with self._lock:
+                endpoint.record(time.perf_counter() - start, False, self.max_failures, self.cooldown)
+            raise
+        with self._lock:
+            endpoint.record(time.perf_counter() - start, True, self.max_failures, self.cooldown)
+        return response
+
+    def call(self, payload: JSONPayload, reduce: Optional[Reducer] = None) -> Any:
+        """
+        Send a JSON-RPC request (or batch) to the best endpoint.
+
+        Args:
+            payload: JSON-RPC request object or a batch array of them
+            reduce: Optional function summarizing an array result while it is streamed
+
+        Returns:
+            The decoded JSON response
+
+        Raises:
+            RPCClientError: If every attempted endpoint failed
+            RateLimitTimeout: If the credit limiter cannot admit the call before the request deadline
+        """
+        costs = rpc_credits(payload)
+        if self.limiter is not None:
+            self.limiter.acquire(costs)
+        endpoints = self.ranked()
+        if not is_read_only(payload):
+            return self._send(endpoints[0], payload, reduce)
+        if self.hedging and len(endpoints) > 1:
+            return self._hedged(endpoints, payload, costs, reduce)
+
+        error: Optional[RPCClientError] = None
+        for attempt, endpoint in enumerate(endpoints):
+            if attempt and self.limiter is not None:
+                self.limiter.acquire(costs)
+            try:
+                return self._send(endpoint, payload, reduce)
+            except RPCClientError as e:
+                error = e
+        raise error
+
+    def _hedged(self, endpoints: List[EndpointHealth], payload: JSONPayload, costs: Dict[str, float],
+                reduce: Optional[Reducer] = None) -> Any:
+        """Race endpoints, starting the next one when the current one is slow or fails."""
+        pending: Dict[Future, EndpointHealth] = {}
+        remaining = list(endpoints)
+        error: Optional[RPCClientError] = None
+
+        def launch() -> None:
+            endpoint = remaining.pop(0)
+            pending[self.pool.submit(self._send, endpoint, payload, reduce)] = endpoint
+
+        launch()
+        while pending:
+            delay = self.hedge_delay(next(iter(pending.values()))) if remaining else None
+            done, _ = wait(list(pending), timeout=delay, return_when=FIRST_COMPLETED)
+            if not done:
+                if self.limiter is not None and not self.limiter.try_acquire(costs):
+                    # Hedges only use spare credits; keep waiting on the calls in flight
+                    remaining.clear()
+                    continue
+                with self._lock:
+                    self.hedged_calls += 1
+                launch()
+                continue
+            for future in done:
+                endpoint = pending.pop(future)
+                try:
+                    response = future.result()
+                except RPCClientError as e:
+                    error = e
+                    continue
+                if endpoint is not endpoints[0]:
+                    with self._lock:
+                        endpoint.hedges_won += 1
+                # Slower duplicates finish in the background and still update the statistics
+                return response
+            if remaining and not pending:
+                if self.limiter is not None:
+                    self.limiter.acquire(costs)
+                launch()
+        raise error
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get per-endpoint health statistics.
+
+        Returns:
+            dict: Hedging settings and the statistics of every endpoint
+        """
+        with self._lock:
+            return {
+                "hedging": self.hedging,
+                "hedged_calls": self.hedged_calls,
+                "endpoints": [endpoint.stats() for endpoint in self.endpoints],
+            }
+
+    def shutdown(self) -> None:
+        """Stop the hedging pool without waiting for outstanding duplicates."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+
+# Create a shared router instance
+rpc_router = RPCRouter()
@@ -0,0 +1,337 @@
+"""
+Key-value state shared between worker processes and nodes.
+
+Each worker process has its own caches and session memory. When the API runs
+with several workers or replicas, they coordinate through a small shared
+store: RPC responses are cached there for every worker, and session versions
+tell a worker that its in-memory copy of a conversation is out of date.
+
+Two implementations are provided: ``SQLiteState`` keeps the state in a file
+shared by the workers of one host, and ``RedisState`` speaks the Redis
+protocol (RESP) to any compatible server for several hosts. Neither needs a
+client library.
+"""
+import select
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from app.config.settings import SHARED_STATE, SHARED_STATE_URL
+
+# Expired SQLite entries are purged after every this many writes
+SQLITE_PURGE_INTERVAL = 1000
+
+# Seconds to wait for the Redis server
+REDIS_TIMEOUT = 2.0
+
+# Redis commands that may be sent again when their reply was lost
+IDEMPOTENT_COMMANDS = frozenset({"AUTH", "SELECT", "PING", "GET", "SET", "DEL"})
+
+
+class SharedStateError(Exception):
+    """Raised when the shared store cannot be reached."""
+
+
+class SharedState(ABC):
+    """Interface of a key-value store shared by every worker."""
+
+    name = "shared"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Read a value.
+
+        Args:
+            key: Key to read
+
+        Returns:
+            bytes or None if the key is missing or expired
+        """
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """
+        Write a value.
+
+        Args:
+            key: Key to write
+            value: Value to store
+            ttl: Seconds until the value expires, None to keep it
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a key."""
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """
+        Atomically increment an integer counter, starting from 0.
+
+        Args:
+            key: Counter key
+
+        Returns:
+            int: The new value
+        """
+
+    def close(self) -> None:
+        """Release connections."""
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get shared state statistics.
+
+        Returns:
+            dict: Backend name and operation counters
+        """
+        return {"backend": self.name}
+
+
+class SQLiteState(SharedState):
+    """Shared state in a SQLite file, for the worker processes of one host."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str = SHARED_STATE_URL, clock=time.time):
+        """
+        Open (or create) the state file.
+
+        Args:
+            path: Database file path
+            clock: Wall-clock time source; expiry times are compared across processes
+        """
+        self.path = path
+        self.clock = clock
+        self.writes = 0
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS shared_state (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections may not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            row = self._connection().execute(
+                "SELECT value FROM shared_state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, self.clock()),
+            ).fetchone()
+        except sqlite3.Error as e:
+            raise SharedStateError(str(e))
+        if row is None:
+            return None
+        # Counters written by incr() are stored as text
+        return row[0].encode() if isinstance(row[0], str) else bytes(row[0])
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        expires_at = None if ttl is None else self.clock() + ttl
+        try:
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO shared_state (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+            self.writes += 1
+            if self.writes % SQLITE_PURGE_INTERVAL == 0:
+                connection.execute("DELETE FROM shared_state WHERE expires_at <= ?", (self.clock(),))
+        except sqlite3.Error as e:
+            raise SharedStateError(str(e))
+
+    def delete(self, key: str) -> None:
+        try:
+            self._connection().execute("DELETE FROM shared_state WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            raise SharedStateError(str(e))
+
+    def incr(self, key: str) -> int:
+        try:
+            row = self._connection().execute(
+                "INSERT INTO shared_state (key, value, expires_at) VALUES (?, '1', NULL) "
+                "ON CONFLICT(key) DO UPDATE SET value = CAST(CAST(value AS INTEGER) + 1 AS TEXT) "
+                "RETURNING value",
+                (key,),
+            ).fetchone()
+        except sqlite3.Error as e:
+            raise SharedStateError(str(e))
+        return int(row[0])
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "path": self.path, "writes": self.writes}
+
+
+class RedisState(SharedState):
+    """Shared state on a Redis-protocol server, for several hosts."""
+
+    name = "redis"
+
+    def __init__(self, url: str = SHARED_STATE_URL, timeout: float = REDIS_TIMEOUT):
+        """
+        Configure the client; connections are opened per thread on first use.
+
+        Args:
+            url: redis://[:password@]host[:port][/db]
+            timeout: Socket timeout in seconds
+        """
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self.errors = 0
+        self._local = threading.local()
+
+    def _connect(self):
+        connection = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        reader = connection.makefile("rb")
+        self._local.connection, self._local.reader = connection, reader
+        if self.password:
+            self._execute("AUTH", self.password)
+        if self.db:
+            self._execute("SELECT", str(self.db))
+
+    @staticmethod
+    def _encode(*args: Any) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            value = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(value), value))
+        return b"".join(parts)
+
+    def _reply(self) -> Any:
+        line = self._local.reader.readline()
+        if not line:
+            raise ConnectionError("Connection closed by the server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise SharedStateError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            return None if length < 0 else self._local.reader.read(length + 2)[:-2]
+        if kind == b"*":
+            count = int(payload)
+            return None if count < 0 else [self._reply() for _ in range(count)]
+        raise SharedStateError(f"Unexpected reply {line!r}")
+
+    def _execute(self, *args: Any) -> Any:
+        self._local.connection.sendall(self._encode(*args))
+        return self._reply()
+
+    def _closed_by_server(self) -> bool:
+        """Whether an idle connection has been closed; the server sends nothing between replies."""
+        readable, _, _ = select.select([self._local.connection], [], [], 0)
+        return bool(readable)
+
+    def command(self, *args: Any) -> Any:
+        """
+        Send one command, reconnecting once if the connection was lost.
+
+        A command whose reply is lost may already have been applied, so only
+        idempotent commands are sent again after that; others are only retried
+        if the connection failed before they were sent.
+
+        Args:
+            args: Command name and arguments
+
+        Returns:
+            The decoded reply
+
+        Raises:
+            SharedStateError: If the server cannot be reached or answers with an error
+        """
+        idempotent = args[0] in IDEMPOTENT_COMMANDS
+        for attempt in range(2):
+            sent = False
+            try:
+                if getattr(self._local, "connection", None) is not None and not idempotent and self._closed_by_server():
+                    self._drop()
+                if getattr(self._local, "connection", None) is None:
+                    self._connect()
+                self._local.connection.sendall(self._encode(*args))
+                sent = True
+                return self._reply()
+            except (OSError, ConnectionError) as e:
+                self._drop()
+                if attempt or (sent and not idempotent):
+                    self.errors += 1
+                    raise SharedStateError(str(e))
+
+    def _drop(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+        self._local.connection = None
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.command("GET", key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        if ttl is None:
+            self.command("SET", key, value)
+        else:
+            self.command("SET", key, value, "PX", max(1, int(ttl * 1000)))
+
+    def delete(self, key: str) -> None:
+        self.command("DEL", key)
+
+    def incr(self, key: str) -> int:
+        return self.command("INCR", key)
+
+    def close(self) -> None:
+        self._drop()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "host": f"{self.host}:{self.port}", "errors": self.errors}
+
+
+def create_shared_state(name: str = SHARED_STATE, url: str = SHARED_STATE_URL) -> Optional[SharedState]:
+    """
+    Create the configured shared state.
+
+    Args:
+        name: "local" for none, "sqlite" or "redis"
+        url: File path (sqlite) or redis:// URL (redis)
+
+    Returns:
+        SharedState or None when state stays in the process
+
+    Raises:
+        ValueError: If the name is not a known backend
+    """
+    if name == "local":
+        return None
+    if name == "sqlite":
+        return SQLiteState(url)
+    if name == "redis":
+        return RedisState(url)
+    raise ValueError(f"Unknown shared state backend: {name}")
+
+
+# Create a shared state instance (None when every worker keeps its own state)
+shared_state = create_shared_state()
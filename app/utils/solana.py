@@ -0,0 +1,100 @@
+"""
+Solana primitives: base58 encoding and address/signature validation.
+"""
+from decimal import Decimal, InvalidOperation
+from typing import Optional, Union
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+BASE58_INDEX = {char: index for index, char in enumerate(BASE58_ALPHABET)}
+
+LAMPORTS_PER_SOL = 1_000_000_000
+PUBKEY_LENGTH = 32
+SIGNATURE_LENGTH = 64
+
+TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+TOKEN_2022_PROGRAM_ID = "TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb"
+
+
+def b58decode(value: str) -> bytes:
+    """
+    Decode a base58 string.
+
+    Args:
+        value: Base58 encoded string
+
+    Returns:
+        bytes: The decoded bytes
+
+    Raises:
+        ValueError: If the string contains characters outside the alphabet
+    """
+    number = 0
+    for char in value:
+        try:
+            number = number * 58 + BASE58_INDEX[char]
+        except KeyError:
+            raise ValueError(f"Invalid base58 character {char!r}")
+    body = number.to_bytes((number.bit_length() + 7) // 8, "big")
+    leading_zeros = len(value) - len(value.lstrip("1"))
+    return b"\x00" * leading_zeros + body
+
+
+def b58encode(data: bytes) -> str:
+    """
+    Encode bytes as base58.
+
+    Args:
+        data: Raw bytes
+
+    Returns:
+        str: Base58 encoded string
+    """
+    number = int.from_bytes(data, "big")
+    chars = []
+    while number:
+        number, remainder = divmod(number, 58)
+        chars.append(BASE58_ALPHABET[remainder])
+    leading_zeros = len(data) - len(data.lstrip(b"\x00"))
+    return "1" * leading_zeros + "".join(reversed(chars))
+
+
+def decoded_length(value: str) -> Optional[int]:
+    """Return the decoded byte length of a base58 string, or None if invalid."""
+    try:
+        return len(b58decode(value))
+    except ValueError:
+        return None
+
+
+def is_pubkey(value: str) -> bool:
+    """Check whether a string is a base58 encoded 32-byte public key."""
+    return 32 <= len(value) <= 44 and decoded_length(value) == PUBKEY_LENGTH
+
+
+def is_signature(value: str) -> bool:
+    """Check whether a string is a base58 encoded 64-byte transaction signature."""
+    return 64 <= len(value) <= 88 and decoded_length(value) == SIGNATURE_LENGTH
+
+
+def to_lamports(value: Union[str, int, float, Decimal], unit: str = "lamports") -> Optional[int]:
+    """
+    Convert an amount of SOL or lamports to a whole number of lamports.
+
+    Args:
+        value: The amount, as a number or a decimal string
+        unit: "sol" or "lamports" (case-insensitive)
+
+    Returns:
+        int: Positive lamports, or None if the amount is not a positive whole number of lamports
+    """
+    if isinstance(value, bool):
+        return None
+    try:
+        amount = Decimal(str(value))
+    except InvalidOperation:
+        return None
+    if unit.lower() == "sol":
+        amount *= LAMPORTS_PER_SOL
+    if not amount.is_finite() or amount <= 0 or amount != amount.to_integral_value():
+        return None
+    return int(amount)
@@ -0,0 +1,253 @@
+"""
+Typed request builders for the TASK_PARAMS_MAP templates.
+
+Each template is analysed once at import into a builder holding the position
+of every placeholder and the validator of its value, so building a request
+copies only the containers along those positions, fills them without searching
+the template again and shares every other part of it. Built requests are
+therefore treated as read-only.
+Placeholder values are validated (and amounts coerced to integer lamports)
+before the request exists, so malformed input is rejected locally instead of
+by the RPC provider, and each request gets its own JSON-RPC id.
+"""
+import binascii
+import itertools
+import re
+from typing import Any, Callable, Dict, List, Tuple
+
+from app.data.task_params import TASK_PARAMS_MAP
+from app.utils.solana import is_pubkey, is_signature, to_lamports
+
+PLACEHOLDER_RE = re.compile(r"^\{(\w+)\}$")
+ADDRESS_SEPARATOR_RE = re.compile(r"[\s,;]+")
+AMOUNT_TEXT_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(sol|lamports?)?\s*$", re.IGNORECASE)
+
+# Request ids are unique per process; next() on a count is atomic under the GIL
+_request_ids = itertools.count(1)
+
+
+class InvalidParamsError(ValueError):
+    """Raised when a placeholder value is missing or malformed."""
+
+
+def next_request_id() -> int:
+    """Return a fresh JSON-RPC request id."""
+    return next(_request_ids)
+
+
+def _pubkey(value: Any) -> str:
+    if not isinstance(value, str) or not is_pubkey(value.strip()):
+        raise ValueError("expected a base58 encoded 32-byte public key")
+    return value.strip()
+
+
+def _pubkey_list(value: Any) -> List[str]:
+    # The LLM may answer with a list or with the addresses in one string
+    if isinstance(value, str):
+        value = ADDRESS_SEPARATOR_RE.split(value.strip())
+    if not isinstance(value, list) or not value:
+        raise ValueError("expected a list of base58 encoded public keys")
+    return list(dict.fromkeys(_pubkey(item) for item in value))
+
+
+def _signature(value: Any) -> str:
+    if not isinstance(value, str) or not is_signature(value.strip()):
+        raise ValueError("expected a base58 encoded 64-byte transaction signature")
+    return value.strip()
+
+
+def _lamports(value: Any) -> int:
+    lamports = None
+    if isinstance(value, (int, float)):
+        lamports = to_lamports(value)
+    elif isinstance(value, str):
+        match = AMOUNT_TEXT_RE.match(value)
+        if match:
+            lamports = to_lamports(match.group(1), match.group(2) or "lamports")
+    if lamports is None:
+        raise ValueError("expected a positive whole number of lamports")
+    return lamports
+
+
+def _base64(value: Any) -> str:
+    if not isinstance(value, str) or not value:
+        raise ValueError("expected a base64 encoded message")
+    try:
+        binascii.a2b_base64(value, strict_mode=True)
+    except binascii.Error:
+        raise ValueError("expected a base64 encoded message")
+    return value
+
+
+# Validator of each placeholder; placeholders not listed are passed through
+SLOT_TYPES: Dict[str, Callable[[Any], Any]] = {
+    "address": _pubkey,
+    "addresses": _pubkey_list,
+    "tokenAccountPubkey": _pubkey,
+    "programId": _pubkey,
+    "signature": _signature,
+    "amount": _lamports,
+    "message": _base64,
+}
+
+
+def template_slots(template: Any) -> List[str]:
+    """
+    List the placeholder names used in a template, in order of appearance.
+
+    Args:
+        template: Nested template structure
+
+    Returns:
+        list: Placeholder names without braces
+    """
+    return list(dict.fromkeys(slot for slot, _ in _slot_paths(template)))
+
+
+def _slot_paths(template: Any, path: Tuple = ()) -> List[Tuple[str, Tuple]]:
+    """List (placeholder, path) pairs of a template in order of appearance."""
+    if isinstance(template, str):
+        match = PLACEHOLDER_RE.match(template)
+        return [(match.group(1), path)] if match else []
+    if isinstance(template, dict):
+        items = template.items()
+    elif isinstance(template, list):
+        items = enumerate(template)
+    else:
+        return []
+    return [pair for key, item in items for pair in _slot_paths(item, path + (key,))]
+
+
+def _replace(node: Any, path: Tuple, value: Any) -> Any:
+    """Return a copy of node with the value at path replaced, copying only along the path."""
+    if not path:
+        return value
+    head, rest = path[0], path[1:]
+    copy = dict(node) if isinstance(node, dict) else list(node)
+    copy[head] = _replace(node[head], rest, value)
+    return copy
+
+
+class RequestBuilder:
+    """
+    Builder for one request template.
+
+    Calling the builder with placeholder values validates them and returns a
+    JSON-RPC request with a unique id, sharing the template's containers that
+    hold no placeholder.
+    """
+
+    def __init__(self, task_name: str, template: Dict[str, Any]):
+        """
+        Analyse a template.
+
+        Args:
+            task_name: Task the template belongs to, used in error messages
+            template: The JSON-RPC request template
+        """
+        self.task_name = task_name
+        self.template = template
+        self.method = template.get("method")
+        self.paths = _slot_paths(template)
+        self.slots = list(dict.fromkeys(slot for slot, _ in self.paths))
+        # Containers holding a placeholder, each listed after its parent
+        self.containers = list(dict.fromkeys(
+            path[:depth] for _, path in self.paths for depth in range(1, len(path))
+        ))
+
+    def coerce(self, slot: str, value: Any) -> Any:
+        """
+        Validate one placeholder value.
+
+        Args:
+            slot: Placeholder name
+            value: Value chosen for it
+
+        Returns:
+            The value in the type the RPC expects
+
+        Raises:
+            InvalidParamsError: If the value is malformed
+        """
+        validator = SLOT_TYPES.get(slot)
+        if validator is None:
+            return value
+        try:
+            return validator(value)
+        except ValueError as e:
+            raise InvalidParamsError(f"Invalid {slot} for {self.task_name}: {value!r} ({e})")
+
+    def __call__(self, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build a request.
+
+        Args:
+            values: Mapping of placeholder name to value
+
+        Returns:
+            dict: The populated JSON-RPC request
+
+        Raises:
+            InvalidParamsError: If a placeholder has no value or a malformed one
+        """
+        missing = [slot for slot in self.slots if slot not in values]
+        if missing:
+            raise InvalidParamsError(f"Missing value for {', '.join(missing)} in task {self.task_name}")
+        coerced = {slot: self.coerce(slot, values[slot]) for slot in self.slots}
+        data = dict(self.template)
+        nodes = {(): data}
+        for prefix in self.containers:
+            parent = nodes[prefix[:-1]]
+            child = parent[prefix[-1]]
+            parent[prefix[-1]] = nodes[prefix] = dict(child) if isinstance(child, dict) else list(child)
+        for slot, path in self.paths:
+            nodes[path[:-1]][path[-1]] = coerced[slot]
+        if "id" in data:
+            data["id"] = next_request_id()
+        return data
+
+    def validate(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate the placeholder positions of an already complete request.
+
+        Args:
+            data: JSON-RPC request for this template's method
+
+        Returns:
+            dict: The request, copied along any path whose value was coerced
+
+        Raises:
+            InvalidParamsError: If a placeholder position is missing or malformed
+        """
+        for slot, path in self.paths:
+            node = data
+            try:
+                for key in path:
+                    node = node[key]
+            except (KeyError, IndexError, TypeError):
+                raise InvalidParamsError(f"Missing value for {slot} in task {self.task_name}")
+            value = self.coerce(slot, node)
+            if value != node or type(value) is not type(node):
+                data = _replace(data, path, value)
+        return data
+
+
+# Analyse every template once at import
+REQUEST_BUILDERS = {name: RequestBuilder(name, params["data"]) for name, params in TASK_PARAMS_MAP.items()}
+
+
+def build_task_data(task_name: str, values: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the JSON-RPC request for a task from its template.
+
+    Args:
+        task_name: Key into TASK_PARAMS_MAP
+        values: Mapping of placeholder name to value
+
+    Returns:
+        dict: The populated JSON-RPC request
+
+    Raises:
+        InvalidParamsError: If a placeholder has no value or a malformed one
+    """
+    return REQUEST_BUILDERS[task_name](values)
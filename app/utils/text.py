@@ -0,0 +1,81 @@
+"""
+Text helpers for user queries and conversation memory.
+"""
+import re
+from collections import Counter
+
+from app.utils.tokens import CHARS_PER_TOKEN, estimate_tokens
+
+WORD_RE = re.compile(r"\S+")
+BASE58_TOKEN_RE = re.compile(r"^[1-9A-HJ-NP-Za-km-z]{32,88}$")
+TRAILING_PUNCTUATION = "?!.,;: "
+
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+CONTENT_WORD_RE = re.compile(r"[a-z0-9']+")
+# Numbers and base58 addresses are the facts a later turn is most likely to refer back to
+VALUE_RE = re.compile(r"\d|[1-9A-HJ-NP-Za-km-z]{32,88}")
+VALUE_BONUS = 1.0
+STOPWORDS = frozenset(
+    "a an and are as at be but by can do for from has have i if in is it its let me my "
+    "of on or so that the this to was we what will with you your".split()
+)
+
+
+def normalize_query(text: str) -> str:
+    """
+    Normalize a query so trivially different phrasings compare equal.
+
+    Whitespace is collapsed, trailing punctuation dropped and words lowercased.
+    Base58 addresses and signatures are case-sensitive and kept as they are.
+
+    Args:
+        text: The user's input string
+
+    Returns:
+        str: The normalized query
+    """
+    words = []
+    for word in WORD_RE.findall(text.strip().rstrip(TRAILING_PUNCTUATION)):
+        words.append(word if BASE58_TOKEN_RE.match(word.strip(TRAILING_PUNCTUATION)) else word.lower())
+    return " ".join(words)
+
+
+def summarize(text: str, max_tokens: int) -> str:
+    """
+    Condense text to its most informative sentences.
+
+    Sentences are scored by how often their content words occur in the whole
+    text, with a bonus for sentences carrying numbers or addresses. The best
+    sentences that fit the budget are kept in their original order; if none
+    fits, the best one is cut at a word boundary.
+
+    Args:
+        text: Text to condense
+        max_tokens: Estimated token budget of the result
+
+    Returns:
+        str: The condensed text
+    """
+    text = " ".join(text.split())
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    sentences = SENTENCE_RE.split(text)
+    words = [[word for word in CONTENT_WORD_RE.findall(sentence.lower()) if word not in STOPWORDS]
+             for sentence in sentences]
+    frequencies = Counter(word for sentence_words in words for word in sentence_words)
+
+    def score(index: int) -> float:
+        value = sum(frequencies[word] for word in words[index]) / len(words[index]) if words[index] else 0.0
+        return value + (VALUE_BONUS if VALUE_RE.search(sentences[index]) else 0.0)
+
+    ranked = sorted(range(len(sentences)), key=score, reverse=True)
+    chosen, used = [], 0
+    for index in ranked:
+        cost = estimate_tokens(sentences[index]) + 1
+        if used + cost <= max_tokens:
+            chosen.append(index)
+            used += cost
+    if chosen:
+        return " ".join(sentences[index] for index in sorted(chosen))
+    cut = sentences[ranked[0]][:max(0, max_tokens * CHARS_PER_TOKEN - 3)]
+    return cut.rsplit(" ", 1)[0] + "..." if " " in cut else cut + "..."
@@ -0,0 +1,24 @@
+"""
+Token estimation helpers for prompt budgeting.
+"""
+from typing import Any
+
+# Average characters per token for English text with Gemini/GPT style tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(value: Any) -> int:
+    """
+    Estimate the number of tokens a value occupies in a prompt.
+
+    The estimate is a fast character-based heuristic; it is used for budgeting
+    and reporting, not billing.
+
+    Args:
+        value: Text, or any object that will be stringified into the prompt
+
+    Returns:
+        int: Estimated token count
+    """
+    text = value if isinstance(value, str) else str(value)
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
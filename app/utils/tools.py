@@ -1,35 +1,182 @@
-from crewai.tools.structured_tool import CrewStructuredTool
+import time
 from pydantic import BaseModel
-import requests
-from app.config.settings import SOLANA_API_URL
+from typing import Any, Dict, List
+from app.utils.accounts import decode_response
+from app.utils.cache import rpc_cache, cache_key
+from app.utils.live_accounts import live_accounts
+from app.config.settings import RPC_SINGLE_FLIGHT
+from app.utils.metrics import record_rpc_call
+from app.utils.reducers import reduce_response, reducer_for
+from app.utils.rpc_client import RPCClientError, MUTATING_METHODS
+from app.utils.rpc_router import rpc_router
+from app.utils.singleflight import SingleFlight
+
+# Concurrent identical RPC requests share one upstream call
+rpc_flight = SingleFlight("rpc")
+
+# getMultipleAccounts accepts at most this many addresses per call
+MULTIPLE_ACCOUNTS_LIMIT = 100
 
 class APICallInput(BaseModel):
     """Schema for API call input data."""
     data: dict
 
-def tool_wrapper(*args, **kwargs):
+def call_rpc(data: dict) -> dict:
     """
-    Wrapper function to execute API calls to the Solana blockchain.
+    Execute a JSON-RPC request against the Solana blockchain.
+    
+    Token and program account listings are summarized while they are read, so
+    the returned result holds counts, totals and the largest accounts rather
+    than every account. Account data of known layouts is decoded into fields.
+    Requests for accounts in the live view are answered without an RPC call.
+    getMultipleAccounts requests over the per-call limit are split into chunks
+    behind the same cache and single-flight lookup as any other read.
     
     Args:
-        kwargs: Keyword arguments containing the API request data
+        data: The JSON-RPC request object
         
     Returns:
-        dict: JSON response from the API or None if the request failed
+        dict: JSON response from the API, or a dict with an "error" message if the request failed
     """
-    url = SOLANA_API_URL
+    start = time.perf_counter()
+    method = data.get("method", "")
+    live_accounts.record_access(data)
+    live = live_accounts.lookup(data)
+    if live is not None:
+        record_rpc_call(method, "live", time.perf_counter() - start)
+        return decode_response(data, live)
+    
+    cached = rpc_cache.get(data)
+    if cached is not None:
+        record_rpc_call(method, "cache_hit", time.perf_counter() - start)
+        return cached
+    
+    if not RPC_SINGLE_FLIGHT or method in MUTATING_METHODS:
+        response, status = _fetch(data), "ok"
+    else:
+        response, shared = rpc_flight.do(cache_key(data), lambda: _fetch(data))
+        status = "shared" if shared else "ok"
+        if shared and isinstance(response, dict):
+            response = dict(response, id=data.get("id"))
     
+    if isinstance(response, dict) and "error" in response:
+        status = "error"
+    record_rpc_call(method, status, time.perf_counter() - start)
+    return response
+
+def _fetch(data: dict) -> dict:
+    """Send a request upstream and cache the (reduced) response."""
+    if data.get("method") == "getMultipleAccounts" and len((data.get("params") or [[]])[0]) > MULTIPLE_ACCOUNTS_LIMIT:
+        response = _call_chunked(data)
+        rpc_cache.set(data, response)
+        return response
     try:
-        response = requests.post(url, json=kwargs["data"])
-
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f'Error: {response.status_code}')
-            return {"error": f"API call failed with status code {response.status_code}"}
-    except requests.exceptions.RequestException as e:
+        response = rpc_router.call(data, reduce=reducer_for(data))
+    except RPCClientError as e:
         print(f'Error: {e}')
         return {"error": str(e)}
+    
+    # Summarize lists that were not already reduced while streaming, and decode raw account data
+    response = decode_response(data, reduce_response(data, response))
+    rpc_cache.set(data, response)
+    return response
+
+def _call_chunked(data: dict) -> dict:
+    """
+    Fetch a getMultipleAccounts request of any size.
+    
+    The addresses are split into chunks of the per-call limit, which are sent
+    together as one JSON-RPC batch, and the accounts are merged back in order.
+    
+    Args:
+        data: getMultipleAccounts request object
+        
+    Returns:
+        dict: One response holding every account, or the first chunk's error
+    """
+    addresses, *options = data["params"]
+    chunks = [
+        dict(data, id=index, params=[addresses[offset:offset + MULTIPLE_ACCOUNTS_LIMIT], *options])
+        for index, offset in enumerate(range(0, len(addresses), MULTIPLE_ACCOUNTS_LIMIT))
+    ]
+    responses = call_rpc_batch(chunks)
+    for response in responses:
+        if "error" in response or not isinstance(response.get("result"), dict):
+            return {"jsonrpc": "2.0", "id": data.get("id"), "error": response.get("error", "Invalid chunk response")}
+    
+    # Chunks may be answered at different slots; report the oldest
+    slot = min(response["result"].get("context", {}).get("slot", 0) for response in responses)
+    accounts = [account for response in responses for account in response["result"].get("value") or []]
+    return {"jsonrpc": "2.0", "id": data.get("id"), "result": {"context": {"slot": slot}, "value": accounts}}
+
+def call_rpc_batch(requests: List[dict]) -> List[dict]:
+    """
+    Execute several JSON-RPC requests as a single JSON-RPC 2.0 batch.
+    
+    Cached responses are served locally and identical read-only requests are
+    sent once. Each request in the outgoing batch gets a unique id so responses
+    can be matched back regardless of the order the provider returns them in.
+    Requests for account listings are sent on their own so that their results
+    can be streamed and summarized like in :func:`call_rpc`.
+    
+    Args:
+        requests: JSON-RPC request objects
+        
+    Returns:
+        list: One response per request, in request order. Failed items carry an "error" key
+    """
+    responses: List[Dict[str, Any]] = [None] * len(requests)
+    groups: Dict[str, List[int]] = {}
+    
+    for index, data in enumerate(requests):
+        cached = rpc_cache.get(data)
+        if cached is not None:
+            responses[index] = cached
+            continue
+        if reducer_for(data) is not None:
+            responses[index] = call_rpc(data)
+            continue
+        key = f"#{index}" if data.get("method") in MUTATING_METHODS else cache_key(data)
+        groups.setdefault(key, []).append(index)
+    
+    if not groups:
+        return responses
+    
+    batch = [dict(requests[indexes[0]], id=batch_id) for batch_id, indexes in enumerate(groups.values())]
+    start = time.perf_counter()
+    try:
+        results = rpc_router.call(batch)
+    except RPCClientError as e:
+        print(f'Error: {e}')
+        results = {"error": str(e)}
+    record_rpc_call("batch", "ok" if isinstance(results, list) else "error", time.perf_counter() - start)
+    
+    if isinstance(results, list):
+        by_id = {item.get("id"): item for item in results if isinstance(item, dict)}
+    else:
+        # Providers answer a rejected batch with a single error object
+        error = results.get("error", "Invalid batch response") if isinstance(results, dict) else "Invalid batch response"
+        by_id = {batch_id: {"error": error} for batch_id in range(len(batch))}
+    
+    for batch_id, indexes in enumerate(groups.values()):
+        response = decode_response(batch[batch_id], by_id.get(batch_id, {"error": "No response returned for batched request"}))
+        rpc_cache.set(batch[batch_id], response)
+        for index in indexes:
+            responses[index] = dict(response, id=requests[index].get("id"))
+    
+    return responses
+
+def tool_wrapper(*args, **kwargs):
+    """
+    Wrapper function to execute API calls to the Solana blockchain.
+    
+    Args:
+        kwargs: Keyword arguments containing the API request data
+        
+    Returns:
+        dict: JSON response from the API or None if the request failed
+    """
+    return call_rpc(kwargs["data"])
 
 def create_structured_tool():
     """
@@ -38,6 +185,8 @@ def create_structured_tool():
     Returns:
         CrewStructuredTool: A tool for making API calls
     """
+    # Imported here so that the RPC helpers can be used without loading crewai
+    from crewai.tools.structured_tool import CrewStructuredTool
     return CrewStructuredTool.from_function(
         name='Blockchain API Tool',
         description="A tool to interact with the Solana blockchain API",
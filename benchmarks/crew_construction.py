@@ -0,0 +1,69 @@
+"""
+Microbenchmark of per-query Crew construction versus pooled crew checkout.
+
+Builds the real agents and tasks, then times ``Crew(..., memory=True)`` as the
+query path used to do on every blockchain request, and ``CrewPool.checkout``
+as it does now. No LLM or RPC calls are made. Crew memory stores need an
+embedder key to be constructed, so a placeholder is set if none is present.
+
+Usage:
+    python -m benchmarks.crew_construction [iterations]
+"""
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("CHROMA_OPENAI_API_KEY", "benchmark-placeholder")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+from crewai import Crew  # noqa: E402
+
+from app.core.agents import initialize_agents  # noqa: E402
+from app.core.crew import BlockchainCrew  # noqa: E402
+from app.core.tasks import initialize_tasks  # noqa: E402
+
+TASK_NAME = "getBalance"
+
+
+def _summary(samples):
+    samples = sorted(samples)
+    return {
+        "mean_ms": round(statistics.mean(samples) * 1000, 3),
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 3),
+        "max_ms": round(samples[-1] * 1000, 3),
+    }
+
+
+def main(iterations: int = 20) -> None:
+    task_define_agent, get_agent = initialize_agents()
+    get_task, task_map = initialize_tasks(task_define_agent, get_agent)
+    crew = BlockchainCrew(task_define_agent, get_agent, get_task, task_map)
+
+    construction = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        Crew(
+            agents=[get_agent],
+            tasks=[task_map[TASK_NAME]],
+            memory=True,
+            verbose=True,
+            llm=task_define_agent.llm
+        )
+        construction.append(time.perf_counter() - start)
+
+    pool = crew.task_pools[TASK_NAME]
+    checkout = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        with pool.checkout():
+            pass
+        checkout.append(time.perf_counter() - start)
+
+    print(f"Per-query construction ({iterations} runs): {_summary(construction)}")
+    print(f"Pooled checkout ({iterations} runs, first builds the crew): {_summary(checkout)}")
+    print(f"Pool: {pool.stats()}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,84 @@
+"""
+Deterministic stand-in for the Gemini LLM used by the agents.
+
+It speaks just enough of CrewAI's ReAct format to drive both crews: the task
+identifier answers with the task chosen by the intent router (or a fixed
+conversational reply), and the blockchain agent calls the API tool once and
+then summarises the observation. A configurable sleep simulates model latency.
+The JSON conversion of conversational answers is made to fail so that crewai
+falls back to the raw text, which is what the service returns for them.
+"""
+import ast
+import json
+import re
+import time
+from typing import Any, Dict, List, Union
+
+from crewai import LLM
+
+from app.core.router import intent_router
+
+QUERY_RE = re.compile(r"performed in (.*?)\. ?Return getAccountInfo", re.DOTALL)
+REQUEST_DATA_RE = re.compile(r"Use this request data: (\{.*?\})\s*$", re.MULTILINE)
+
+CONVERSATIONAL_ANSWER = "Hello! I can look up balances, accounts, tokens and transactions on Solana."
+
+
+class FakeLLM(LLM):
+    """crewai LLM returning scripted answers after a fixed delay."""
+
+    latency = 0.0
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(model="fake/benchmark")
+        self.calls = 0
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return False
+
+    def call(self, messages: Union[str, List[Dict[str, str]]], *args: Any, **kwargs: Any) -> str:
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        self.calls += 1
+        system = messages[0]["content"] if messages else ""
+        if system.startswith("Please convert the following text into valid JSON"):
+            # Conversational answers are not JSON; failing the conversion makes crewai keep the raw text
+            raise ValueError("conversational answer")
+        if self.latency:
+            time.sleep(self.latency)
+
+        # The format instructions in the system prompt mention "Observation:" too
+        text = "\n".join(message["content"] for message in messages[1:])
+        # The blockchain agent's goal mentions the identifier, so match on the role line
+        if system.startswith("You are Task Definer and Populator"):
+            return self._identify(text)
+        if system.startswith("You are Blockchain Information Retriever"):
+            return self._retrieve(text)
+        return ""
+
+    @staticmethod
+    def _identify(text: str) -> str:
+        match = QUERY_RE.search(text)
+        task = intent_router.route(match.group(1)) if match else None
+        if task is None:
+            # Gemini converts the answer with one more (function calling) request; charge it here
+            time.sleep(FakeLLM.latency)
+            return f"Thought: I now can give a great answer\nFinal Answer: {CONVERSATIONAL_ANSWER}"
+        answer = json.dumps({"task": task.task, "data": task.data})
+        return f"Thought: I now can give a great answer\nFinal Answer: {answer}"
+
+    @staticmethod
+    def _retrieve(text: str) -> str:
+        if "Observation:" in text:
+            observation = text.rsplit("Observation:", 1)[1].strip()[:200]
+            return f"Thought: I now know the final answer\nFinal Answer: The blockchain returned: {observation}"
+        match = REQUEST_DATA_RE.search(text)
+        data = ast.literal_eval(match.group(1)) if match else {}
+        return (
+            "Thought: I need to call the blockchain API\n"
+            "Action: Blockchain API Tool\n"
+            f"Action Input: {json.dumps({'data': data})}"
+        )
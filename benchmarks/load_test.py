@@ -0,0 +1,321 @@
+"""
+Offline load test of the /query endpoint.
+
+Runs the real application in-process behind uvicorn, with the Solana RPC
+replaced by :class:`benchmarks.mock_rpc.MockSolanaRPC` and the Gemini LLM by
+:class:`benchmarks.fake_llm.FakeLLM`, so that runs need no network or API
+keys and are repeatable. Queries are drawn from a fixed mix of blockchain and
+conversational requests, each with distinct addresses so that the RPC cache
+does not hide the work.
+
+The report contains throughput, end-to-end latency percentiles, a per-stage
+breakdown (route, identify, blockchain_crew, render, queue, RPC by method)
+taken from the in-process metrics, and is saved as JSON under
+benchmarks/results/ for comparison between commits.
+
+Usage:
+    python -m benchmarks.load_test --concurrency 8 --requests 200
+    python -m benchmarks.load_test --no-router --llm-latency 0.2
+    python -m benchmarks.load_test --compare benchmarks/results/<earlier>.json
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+STAGES = ("route", "identify", "blockchain_crew", "render")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline load test of /query")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients")
+    parser.add_argument("--requests", type=int, default=200, help="Total queries to send")
+    parser.add_argument("--warmup", type=int, default=10, help="Queries sent before measuring")
+    parser.add_argument("--workers", type=int, default=None, help="QUERY_WORKERS (defaults to concurrency)")
+    parser.add_argument("--rpc-latency", type=float, default=0.02, help="Seconds added to every mock RPC response")
+    parser.add_argument("--items", type=int, default=20, help="Entries in list-shaped RPC results")
+    parser.add_argument("--llm-latency", type=float, default=0.1, help="Seconds per fake LLM call")
+    parser.add_argument("--conversational", type=float, default=0.1, help="Share of conversational queries")
+    parser.add_argument("--no-router", action="store_true", help="Send every query through the identifier LLM")
+    parser.add_argument("--llm-rendering", action="store_true", help="Phrase results with the blockchain crew")
+    parser.add_argument("--cache", action="store_true", help="Keep the RPC and answer caches enabled")
+    parser.add_argument("--output", default=None, help="Result file (defaults to benchmarks/results/)")
+    parser.add_argument("--compare", default=None, help="Earlier result file to compare against")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args: argparse.Namespace, rpc_url: str) -> None:
+    """Point the application at the mocks; must run before any app module is imported."""
+    workers = args.workers or args.concurrency
+    os.environ.update({
+        "SOLANA_API_URLS": rpc_url,
+        "QUERY_WORKERS": str(workers),
+        "QUERY_QUEUE_SIZE": str(max(args.concurrency * 2, 32)),
+        "ENABLE_FAST_ROUTER": str(not args.no_router),
+        "LLM_RENDERING": str(args.llm_rendering),
+        "RPC_CACHE_ENABLED": str(args.cache),
+        "ANSWER_CACHE_ENABLED": str(args.cache),
+        "CREW_MEMORY": "False",
+        "MEMORY_DB_URL": "sqlite:///" + os.path.join(tempfile.mkdtemp(), "conversations.db"),
+        "SERVICE_EAGER_INIT": "False",
+        "RPC_CREDITS_PER_SECOND": "0",
+        "LLM_REQUESTS_PER_MINUTE": "0",
+        "LLM_TOKENS_PER_MINUTE": "0",
+        "OTEL_ENABLED": "False",
+        "OTEL_SDK_DISABLED": "true",
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "GEMINI_API_KEY": "benchmark-placeholder",
+    })
+    os.environ.setdefault("CHROMA_OPENAI_API_KEY", "benchmark-placeholder")
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark-placeholder")
+
+
+def build_queries(count: int, conversational: float) -> List[str]:
+    """Deterministic query mix with a distinct address or signature per query."""
+    from benchmarks.mock_rpc import fake_pubkey, fake_signature
+
+    templates = [
+        "What is the balance of {address}?",
+        "list token accounts owned by {address}",
+        "show me transaction {signature}",
+        "getAccountInfo {address}",
+        "supply of {address}",
+        "Is the network healthy?",
+        "current inflation rate",
+    ]
+    talk = ["hello there", "what can you do?", "thanks, that helps"]
+    talk_every = round(1 / conversational) if conversational > 0 else 0
+    queries = []
+    for index in range(count):
+        if talk_every and index % talk_every == talk_every - 1:
+            queries.append(f"{talk[index % len(talk)]} #{index}")
+            continue
+        template = templates[index % len(templates)]
+        queries.append(template.format(address=fake_pubkey(index), signature=fake_signature(index)))
+    return queries
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Summary of latencies in milliseconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def at(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 2)
+
+    return {
+        "p50_ms": at(0.50),
+        "p95_ms": at(0.95),
+        "p99_ms": at(0.99),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+def histogram_snapshot(histogram) -> Dict[Tuple[str, ...], Tuple[float, int]]:
+    """Sum and count per label combination of a metrics Histogram."""
+    with histogram._lock:
+        return {key: (state[1], state[2]) for key, state in histogram._values.items()}
+
+
+def histogram_delta(before: Dict, after: Dict) -> Dict[Tuple[str, ...], Dict[str, float]]:
+    """Count, mean and total time per label combination between two snapshots."""
+    delta = {}
+    for key, (total, count) in after.items():
+        base_total, base_count = before.get(key, (0.0, 0))
+        calls = count - base_count
+        if calls:
+            seconds = total - base_total
+            delta[key] = {
+                "count": calls,
+                "mean_ms": round(seconds / calls * 1000, 3),
+                "total_s": round(seconds, 3),
+            }
+    return delta
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app, port: int):
+    """Run uvicorn on a background thread and wait until it accepts requests."""
+    import uvicorn
+
+    config = uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, thread
+
+
+async def drive(url: str, queries: List[str], concurrency: int) -> Tuple[List[float], Dict[str, int], float]:
+    """Send the queries with at most `concurrency` in flight."""
+    import httpx
+
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, timeout=120, limits=limits) as client:
+        async def one(query: str) -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.post("/query", json={"query": query})
+                    status = str(response.status_code)
+                except httpx.HTTPError as e:
+                    status = type(e).__name__
+                elapsed = time.perf_counter() - start
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == "200":
+                latencies.append(elapsed)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(query) for query in queries))
+        wall = time.perf_counter() - start
+    return latencies, statuses, wall
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(RESULTS_DIR)
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    from benchmarks.mock_rpc import MockSolanaRPC
+
+    mock = MockSolanaRPC(latency=args.rpc_latency, items=args.items).start()
+    configure_environment(args, mock.url)
+
+    from benchmarks.fake_llm import FakeLLM
+    FakeLLM.latency = args.llm_latency
+
+    # Agents are built from app.core.agents.RateLimitedLLM, so patch it before the service starts
+    with patch("app.core.agents.RateLimitedLLM", FakeLLM):
+        from app.services.blockchain import get_blockchain_service
+        from app.utils.metrics import QUEUE_SECONDS, RPC_CALL_SECONDS, STAGE_SECONDS
+        from main import app
+
+        # CrewAI prints every step of verbose crews; keep the report readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            init_start = time.perf_counter()
+            get_blockchain_service()
+            init_seconds = time.perf_counter() - init_start
+
+            server, thread = start_server(app, free_port())
+            url = f"http://127.0.0.1:{server.config.port}"
+            try:
+                asyncio.run(drive(url, build_queries(args.warmup, args.conversational), args.concurrency))
+                rpc_requests = mock.requests
+                before = [histogram_snapshot(metric) for metric in (STAGE_SECONDS, RPC_CALL_SECONDS, QUEUE_SECONDS)]
+                latencies, statuses, wall = asyncio.run(
+                    drive(url, build_queries(args.requests, args.conversational), args.concurrency)
+                )
+                after = [histogram_snapshot(metric) for metric in (STAGE_SECONDS, RPC_CALL_SECONDS, QUEUE_SECONDS)]
+                rpc_requests = mock.requests - rpc_requests
+            finally:
+                server.should_exit = True
+                thread.join(timeout=10)
+                mock.stop()
+
+    stages, rpc_calls, queue = (histogram_delta(b, a) for b, a in zip(before, after))
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "service_init_s": round(init_seconds, 3),
+        "requests": args.requests,
+        "statuses": statuses,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "latency": percentiles(latencies),
+        "stages": {key[0]: value for key, value in sorted(stages.items())},
+        "queue": queue.get((), {}),
+        "rpc": {f"{key[0]}:{key[1]}": value for key, value in sorted(rpc_calls.items())},
+        "upstream_rpc_requests": rpc_requests,
+    }
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Lines describing the change of the headline numbers against a baseline run."""
+    def change(new: float, old: float) -> str:
+        return f"{old} -> {new} ({(new - old) / old * 100:+.1f}%)" if old else f"{old} -> {new}"
+
+    lines = [f"vs {baseline.get('commit')} ({baseline.get('timestamp')})"]
+    lines.append(f"  throughput_rps: {change(result['throughput_rps'], baseline['throughput_rps'])}")
+    for key in ("p50_ms", "p95_ms", "p99_ms"):
+        if key in result["latency"] and key in baseline.get("latency", {}):
+            lines.append(f"  {key}: {change(result['latency'][key], baseline['latency'][key])}")
+    for stage in STAGES:
+        new, old = result["stages"].get(stage), baseline.get("stages", {}).get(stage)
+        if new and old:
+            lines.append(f"  {stage} mean_ms: {change(new['mean_ms'], old['mean_ms'])}")
+    return lines
+
+
+def report(result: Dict[str, Any]) -> List[str]:
+    latency = result["latency"]
+    lines = [
+        f"commit {result['commit']}  concurrency {result['config']['concurrency']}  "
+        f"requests {result['requests']}  statuses {result['statuses']}",
+        f"throughput {result['throughput_rps']} req/s over {result['wall_s']} s",
+        "latency " + "  ".join(f"{key[:-3]} {value} ms" for key, value in latency.items()),
+    ]
+    if result["queue"]:
+        lines.append(f"  queue: mean {result['queue']['mean_ms']} ms")
+    for stage, value in result["stages"].items():
+        lines.append(f"  {stage}: {value['count']} x {value['mean_ms']} ms")
+    for call, value in result["rpc"].items():
+        lines.append(f"  rpc {call}: {value['count']} x {value['mean_ms']} ms")
+    lines.append(f"  upstream RPC requests: {result['upstream_rpc_requests']}")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    result = run(args)
+    print("\n".join(report(result)))
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{result['commit']}.json")
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"saved {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            print("\n".join(compare(result, json.load(f))))
+    return result
+
+
+if __name__ == "__main__":
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    main()
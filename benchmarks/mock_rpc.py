@@ -0,0 +1,176 @@
+"""
+Mock Solana JSON-RPC server for offline benchmarks.
+
+Answers every method used by TASK_PARAMS_MAP (and JSON-RPC batches of them)
+with realistic, deterministic responses. Latency and the size of list-shaped
+results (token accounts, program accounts, account data) are configurable so
+that both network-bound and payload-bound scenarios can be measured.
+"""
+import base64
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+
+from app.utils.accounts import SYSTEM_PROGRAM_ID
+from app.utils.solana import TOKEN_PROGRAM_ID, b58encode
+
+
+def fake_pubkey(seed: Any) -> str:
+    """Deterministic base58 public key derived from a seed."""
+    return b58encode(hashlib.sha256(str(seed).encode()).digest())
+
+
+def fake_signature(seed: Any) -> str:
+    """Deterministic base58 transaction signature derived from a seed."""
+    digest = hashlib.sha512(str(seed).encode()).digest()
+    return b58encode(digest)
+
+
+def _token_amount(amount: int, decimals: int = 6) -> Dict[str, Any]:
+    return {
+        "amount": str(amount),
+        "decimals": decimals,
+        "uiAmount": amount / 10 ** decimals,
+        "uiAmountString": str(amount / 10 ** decimals),
+    }
+
+
+def _context(value: Any, slot: int = 300000000) -> Dict[str, Any]:
+    return {"context": {"slot": slot, "apiVersion": "2.0.0"}, "value": value}
+
+
+class MockSolanaRPC:
+    """Threaded HTTP server emulating the Solana JSON-RPC API."""
+
+    def __init__(self, latency: float = 0.0, items: int = 20, data_bytes: int = 165):
+        """
+        Configure the mock.
+
+        Args:
+            latency: Seconds added before every HTTP response
+            items: Number of entries in list results (token and program accounts)
+            data_bytes: Size of the account data returned by getAccountInfo
+        """
+        self.latency = latency
+        self.items = items
+        self.data_bytes = data_bytes
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.url = ""
+        self.methods: Dict[str, Callable[[list], Any]] = {
+            "getAccountInfo": self.get_account_info,
+            "getProgramAccounts": self.get_program_accounts,
+            "getFeeForMessage": lambda params: _context(5000),
+            "getTransaction": self.get_transaction,
+            "getHealth": lambda params: "ok",
+            "requestAirdrop": lambda params: fake_signature(params),
+            "getBalance": lambda params: _context(int(hashlib.sha256(str(params).encode()).hexdigest()[:8], 16) * 1000),
+            "getMultipleAccounts": lambda params: _context([
+                {"data": ["", "base64"], "executable": False, "owner": SYSTEM_PROGRAM_ID, "space": 0,
+                 "lamports": int(hashlib.sha256(str([address]).encode()).hexdigest()[:8], 16) * 1000}
+                for address in params[0]
+            ]),
+            "getInflationRate": lambda params: {"epoch": 700, "foundation": 0.0, "total": 0.046, "validator": 0.046},
+            "getSupply": lambda params: _context({
+                "total": 590000000000000000, "circulating": 480000000000000000,
+                "nonCirculating": 110000000000000000, "nonCirculatingAccounts": [],
+            }),
+            "getTokenAccountBalance": lambda params: _context(_token_amount(1234567890)),
+            "getTokenAccountsByDelegate": self.get_token_accounts,
+            "getTokenAccountsByOwner": self.get_token_accounts,
+            "getTokenLargestAccounts": lambda params: _context([
+                dict(_token_amount(10 ** 12 // (index + 1)), address=fake_pubkey(("largest", index)))
+                for index in range(min(self.items, 20))
+            ]),
+            "getTokenSupply": lambda params: _context(_token_amount(10 ** 15)),
+        }
+
+    def get_account_info(self, params: list) -> Dict[str, Any]:
+        data = base64.b64encode(bytes(self.data_bytes)).decode()
+        return _context({
+            "data": [data, "base64"], "executable": False, "lamports": 2039280,
+            "owner": TOKEN_PROGRAM_ID, "rentEpoch": 18446744073709551615, "space": self.data_bytes,
+        })
+
+    def get_program_accounts(self, params: list) -> list:
+        options = params[1] if len(params) > 1 and isinstance(params[1], dict) else {}
+        length = options.get("dataSlice", {}).get("length", 17)
+        return [
+            {"pubkey": fake_pubkey(("program", index)), "account": {
+                "data": [base64.b64encode(bytes(min(length, 17))).decode(), "base64"], "executable": False,
+                "lamports": 1000000 + index, "owner": params[0] if params else TOKEN_PROGRAM_ID, "space": 17,
+            }}
+            for index in range(self.items)
+        ]
+
+    def get_token_accounts(self, params: list) -> Dict[str, Any]:
+        owner = params[0] if params else fake_pubkey("owner")
+        return _context([
+            {"pubkey": fake_pubkey(("token", owner, index)), "account": {
+                "data": {"parsed": {"info": {
+                    "isNative": False, "mint": fake_pubkey(("mint", index)), "owner": owner, "state": "initialized",
+                    "tokenAmount": _token_amount(1000 * (index + 1)),
+                }, "type": "account"}, "program": "spl-token", "space": 165},
+                "executable": False, "lamports": 2039280, "owner": TOKEN_PROGRAM_ID, "space": 165,
+            }}
+            for index in range(self.items)
+        ])
+
+    def get_transaction(self, params: list) -> Dict[str, Any]:
+        keys = [fake_pubkey(("tx", index)) for index in range(3)]
+        return {
+            "slot": 300000000, "blockTime": 1735689600,
+            "meta": {"err": None, "fee": 5000, "preBalances": [2000000000, 0, 1], "postBalances": [999995000, 1000000000, 1]},
+            "transaction": {"signatures": [params[0] if params else fake_signature(0)], "message": {
+                "accountKeys": [{"pubkey": key, "signer": index == 0, "writable": index < 2} for index, key in enumerate(keys)],
+            }},
+        }
+
+    def answer(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the JSON-RPC response to one request object."""
+        handler = self.methods.get(request.get("method"))
+        if handler is None:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": -32601, "message": "Method not found"}}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": handler(request.get("params") or [])}
+
+    def start(self) -> "MockSolanaRPC":
+        """Start serving on a free local port."""
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                with mock._lock:
+                    mock.requests += 1
+                if mock.latency:
+                    time.sleep(mock.latency)
+                result = [mock.answer(item) for item in body] if isinstance(body, list) else mock.answer(body)
+                payload = json.dumps(result).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        host, port = self._server.server_address[:2]
+        self.url = f"http://{host}:{port}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
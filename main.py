@@ -1,16 +1,101 @@
+import time
+_import_start = time.perf_counter()
+
+import os
 import uvicorn
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from app.api.routes import router
+from app.config.settings import (
+    SERVICE_EAGER_INIT,
+    LIVE_ACCOUNTS_ENABLED,
+    MEMORY_BACKEND,
+    SERVER_MODE,
+    SERVER_HOST,
+    SERVER_PORT,
+    SERVER_WORKERS,
+    SHARED_STATE,
+)
+from app.core.memory import check_shared_memory, memory_store
+from app.services.blockchain import initialize_in_background
+from app.utils.live_accounts import live_accounts
+from app.utils.metrics import REQUEST_SECONDS, configure_tracing
+from app.utils.profiling import startup_timer
+from app.utils.rpc_client import rpc_client
+from app.utils.rpc_router import rpc_router
+from app.utils.shared_state import shared_state
+from app.services.executor import query_executor
+from app.services.jobs import airdrop_jobs
+
+startup_timer.record("app_import", time.perf_counter() - _import_start)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up tracing and start building the agents (and live account subscriptions) without blocking startup; release resources on shutdown."""
+    # Refuse to serve sessions that other hosts could not read back
+    check_shared_memory()
+    configure_tracing()
+    if SERVICE_EAGER_INIT:
+        initialize_in_background()
+    if LIVE_ACCOUNTS_ENABLED:
+        live_accounts.start()
+    yield
+    live_accounts.stop()
+    airdrop_jobs.stop()
+    query_executor.shutdown(wait=False)
+    memory_store.close()
+    if shared_state is not None:
+        shared_state.close()
+    rpc_router.shutdown()
+    await rpc_client.aclose()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Solana Blockchain Assistant",
     description="An AI-powered assistant for interacting with the Solana blockchain",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Include API routes
 app.include_router(router)
 
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Record the latency of every request by route template and status code."""
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    path = route.path if route is not None else "unmatched"
+    REQUEST_SECONDS.observe(time.perf_counter() - start, path=path, status=response.status_code)
+    return response
+
+def serve() -> None:
+    """
+    Run the API server.
+
+    Development mode runs one auto-reloading process. Production mode runs
+    SERVER_WORKERS processes (one per core by default) without reload; several
+    workers need state shared outside the process, so SQLite shared state is
+    used when none is configured.
+    
+    Raises:
+        ValueError: If Redis shared state is combined with a local SQLite memory database
+    """
+    check_shared_memory()
+    if SERVER_MODE != "production":
+        uvicorn.run("main:app", host=SERVER_HOST, port=SERVER_PORT, reload=True)
+        return
+    workers = SERVER_WORKERS or os.cpu_count() or 1
+    if workers > 1:
+        if SHARED_STATE == "local":
+            print("Several workers without shared state configured: using SQLite shared state")
+            # Workers are started as fresh interpreters, so they read the setting from the environment
+            os.environ["SHARED_STATE"] = "sqlite"
+        if MEMORY_BACKEND == "memory":
+            print("Warning: MEMORY_BACKEND=memory keeps each worker's conversations separate")
+    uvicorn.run("main:app", host=SERVER_HOST, port=SERVER_PORT, workers=workers, reload=False,
+                proxy_headers=True, access_log=False)
+
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    serve()
@@ -1,3 +1,7 @@
 """
 Test suite for the Solana Blockchain Assistant.
-"""
\ No newline at end of file
+"""
+import os
+
+# Keep the shared session store in process memory instead of writing conversations.db
+os.environ.setdefault("MEMORY_BACKEND", "memory")
@@ -0,0 +1,106 @@
+"""
+Local Redis-protocol stub server used by the test suite.
+"""
+import socket
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class StubRedisServer:
+    """TCP server answering the RESP commands used by the shared state."""
+
+    def __init__(self, password: Optional[str] = None):
+        self.password = password
+        self.commands: List[List[bytes]] = []
+        # Commands applied without a reply, closing the connection instead
+        self.unanswered: set = set()
+        self._data: Dict[Tuple[int, bytes], Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+        self._sockets: set = set()
+        self._server: Optional[socketserver.ThreadingTCPServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}{host}:{port}/1"
+
+    def _get(self, db: int, key: bytes) -> Optional[bytes]:
+        entry = self._data.get((db, key))
+        if entry is None or (entry[1] is not None and entry[1] <= time.time()):
+            self._data.pop((db, key), None)
+            return None
+        return entry[0]
+
+    def _execute(self, state: Dict[str, object], args: List[bytes]) -> bytes:
+        command = args[0].upper()
+        if command == b"AUTH":
+            state["authenticated"] = args[1].decode() == self.password
+            return b"+OK\r\n" if state["authenticated"] else b"-WRONGPASS invalid password\r\n"
+        if self.password and not state["authenticated"]:
+            return b"-NOAUTH Authentication required.\r\n"
+        db = state["db"]
+        with self._lock:
+            if command == b"PING":
+                return b"+PONG\r\n"
+            if command == b"SELECT":
+                state["db"] = int(args[1])
+                return b"+OK\r\n"
+            if command == b"GET":
+                value = self._get(db, args[1])
+                return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+            if command == b"SET":
+                expires_at = None
+                if len(args) == 5 and args[3].upper() == b"PX":
+                    expires_at = time.time() + int(args[4]) / 1000
+                self._data[(db, args[1])] = (args[2], expires_at)
+                return b"+OK\r\n"
+            if command == b"DEL":
+                return b":%d\r\n" % (self._data.pop((db, args[1]), None) is not None)
+            if command == b"INCR":
+                value = int(self._get(db, args[1]) or 0) + 1
+                self._data[(db, args[1])] = (str(value).encode(), None)
+                return b":%d\r\n" % value
+        return b"-ERR unknown command '%s'\r\n" % command
+
+    def drop_connections(self) -> None:
+        """Close every client connection."""
+        for connection in list(self._sockets):
+            connection.shutdown(socket.SHUT_RDWR)
+
+    def start(self) -> "StubRedisServer":
+        stub = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                state = {"db": 0, "authenticated": False}
+                stub._sockets.add(self.request)
+                while True:
+                    line = self.rfile.readline()
+                    if not line:
+                        stub._sockets.discard(self.request)
+                        return
+                    args = []
+                    for _ in range(int(line[1:-2])):
+                        length = int(self.rfile.readline()[1:-2])
+                        args.append(self.rfile.read(length + 2)[:-2])
+                    stub.commands.append(args)
+                    reply = stub._execute(state, args)
+                    if args[0].upper() in stub.unanswered:
+                        stub._sockets.discard(self.request)
+                        return
+                    self.wfile.write(reply)
+
+        class Server(socketserver.ThreadingTCPServer):
+            daemon_threads = True
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
@@ -0,0 +1,76 @@
+"""
+Local JSON-RPC stub server used by the test suite.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+
+def default_handler(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Echo the method name back as the result."""
+    return {"jsonrpc": "2.0", "id": request.get("id"), "result": request.get("method")}
+
+
+class StubRPCServer:
+    """Threaded HTTP server answering JSON-RPC requests with a handler function."""
+
+    def __init__(self, handler: Callable[[Dict[str, Any]], Any] = default_handler,
+                 latency: float = 0.0, status_code: int = 200):
+        self.handler = handler
+        self.latency = latency
+        self.status_code = status_code
+        self.requests: List[Any] = []
+        self.connections = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._url = ""
+
+    @property
+    def url(self) -> str:
+        return self._url
+
+    def start(self) -> "StubRPCServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                stub.connections += 1
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length))
+                stub.requests.append(body)
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if isinstance(body, list):
+                    result = [stub.handler(item) for item in body]
+                else:
+                    result = stub.handler(body)
+                payload = json.dumps(result).encode()
+                self.send_response(stub.status_code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        host, port = self._server.server_address[:2]
+        self._url = f"http://{host}:{port}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,123 @@
+"""
+Local Solana WebSocket stub server used by the test suite.
+"""
+import asyncio
+import itertools
+import json
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class StubWSServer:
+    """WebSocket server answering slot and account subscriptions."""
+
+    def __init__(self, slot_interval: float = 0.05):
+        self.slot_interval = slot_interval
+        self.requests: List[Tuple[str, Any]] = []
+        self.connections = 0
+        self.slot = 100
+        self._subscriptions: Dict[int, Tuple[Any, str]] = {}
+        self._ids = itertools.count(1)
+        self._sockets: set = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server = None
+        self._url = ""
+
+    @property
+    def url(self) -> str:
+        return self._url
+
+    def subscribed(self) -> List[str]:
+        """Addresses with an open account subscription."""
+        return sorted(address for _, address in list(self._subscriptions.values()) if address != "slot")
+
+    async def _send_slots(self, websocket, subscription: int) -> None:
+        while True:
+            await asyncio.sleep(self.slot_interval)
+            self.slot += 1
+            await websocket.send(json.dumps({"jsonrpc": "2.0", "method": "slotNotification", "params": {
+                "result": {"parent": self.slot - 1, "root": self.slot - 32, "slot": self.slot},
+                "subscription": subscription,
+            }}))
+
+    async def _handle(self, websocket) -> None:
+        from websockets.exceptions import ConnectionClosed
+
+        self.connections += 1
+        self._sockets.add(websocket)
+        tasks = []
+        try:
+            async for message in websocket:
+                request = json.loads(message)
+                method, params = request.get("method"), request.get("params") or []
+                self.requests.append((method, params))
+                if method in ("slotSubscribe", "accountSubscribe"):
+                    subscription = next(self._ids)
+                    self._subscriptions[subscription] = (websocket, "slot" if method == "slotSubscribe" else params[0])
+                    result: Any = subscription
+                    if method == "slotSubscribe":
+                        tasks.append(asyncio.create_task(self._send_slots(websocket, subscription)))
+                elif method == "accountUnsubscribe":
+                    result = self._subscriptions.pop(params[0], None) is not None
+                else:
+                    await websocket.send(json.dumps({"jsonrpc": "2.0", "id": request.get("id"),
+                                                     "error": {"code": -32601, "message": "Method not found"}}))
+                    continue
+                await websocket.send(json.dumps({"jsonrpc": "2.0", "id": request.get("id"), "result": result}))
+        except ConnectionClosed:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._sockets.discard(websocket)
+            for subscription, (socket, _) in list(self._subscriptions.items()):
+                if socket is websocket:
+                    del self._subscriptions[subscription]
+
+    async def _notify(self, address: str, value: Any, slot: int) -> None:
+        for subscription, (websocket, subscribed) in list(self._subscriptions.items()):
+            if subscribed == address:
+                await websocket.send(json.dumps({"jsonrpc": "2.0", "method": "accountNotification", "params": {
+                    "result": {"context": {"slot": slot}, "value": value}, "subscription": subscription,
+                }}))
+
+    def notify(self, address: str, value: Any, slot: Optional[int] = None) -> None:
+        """Push an account change to its subscribers."""
+        future = asyncio.run_coroutine_threadsafe(self._notify(address, value, slot or self.slot), self._loop)
+        future.result(timeout=5)
+
+    def send_raw(self, text: str) -> None:
+        """Send a frame as is to every client."""
+        async def send_all():
+            for websocket in list(self._sockets):
+                await websocket.send(text)
+        asyncio.run_coroutine_threadsafe(send_all(), self._loop).result(timeout=5)
+
+    def drop_connections(self) -> None:
+        """Close every client connection."""
+        async def close_all():
+            for websocket in list(self._sockets):
+                await websocket.close()
+        asyncio.run_coroutine_threadsafe(close_all(), self._loop).result(timeout=5)
+
+    def start(self) -> "StubWSServer":
+        from websockets.asyncio.server import serve
+
+        ready = threading.Event()
+
+        async def main():
+            self._server = await serve(self._handle, "127.0.0.1", 0)
+            port = self._server.sockets[0].getsockname()[1]
+            self._url = f"ws://127.0.0.1:{port}"
+            ready.set()
+            await self._server.wait_closed()
+
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_until_complete, args=(main(),), daemon=True).start()
+        ready.wait(5)
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._loop.call_soon_threadsafe(self._server.close)
+            self._server = None
@@ -0,0 +1,133 @@
+"""
+Tests for local decoding of base64 account data.
+"""
+import base64
+import struct
+import unittest
+from unittest.mock import patch
+from app.core.renderers import render_result
+from app.utils.accounts import (
+    MINT,
+    NONCE_ACCOUNT,
+    SYSTEM_PROGRAM_ID,
+    TOKEN_ACCOUNT,
+    decode_account,
+    decode_accounts,
+    decode_response,
+)
+from app.utils.cache import RPCCache
+from app.utils.solana import TOKEN_2022_PROGRAM_ID, TOKEN_PROGRAM_ID, b58decode
+from app.utils.tools import call_rpc
+
+MINT_ADDRESS = "So11111111111111111111111111111111111111112"
+OWNER = "4Nd1mBQtrMJVYVfKf2PJy9NZUZdTAsp7D4xWLs4gDB4T"
+DELEGATE = "dv1ZAGvdsz5hHLwWXsVnM94hWf1pjbKVau1QVkaMJ92"
+
+def key(address):
+    """Raw bytes of a base58 public key."""
+    return b58decode(address)
+
+def account(data, owner=TOKEN_PROGRAM_ID):
+    """RPC account object with base64 data."""
+    return {"data": [base64.b64encode(data).decode(), "base64"], "owner": owner,
+            "lamports": 2039280, "executable": False}
+
+def token_account_data(amount=5000, delegate=None, state=1):
+    """Packed SPL Token account."""
+    return TOKEN_ACCOUNT.pack(key(MINT_ADDRESS), key(OWNER), amount, 1 if delegate else 0,
+                              key(delegate) if delegate else bytes(32), state, 0, 0, 250 if delegate else 0, 0, bytes(32))
+
+class TestAccountDecoding(unittest.TestCase):
+    """Test cases for account layouts."""
+
+    def test_token_account(self):
+        """Token accounts decode to mint, owner, amount, delegate and state."""
+        decoded = decode_account(account(token_account_data(delegate=DELEGATE, state=2)))
+        self.assertEqual(decoded["data"]["program"], "spl-token")
+        self.assertEqual(decoded["data"]["parsed"]["type"], "account")
+        info = decoded["data"]["parsed"]["info"]
+        self.assertEqual(info["mint"], MINT_ADDRESS)
+        self.assertEqual(info["owner"], OWNER)
+        self.assertEqual(info["amount"], 5000)
+        self.assertEqual(info["delegate"], DELEGATE)
+        self.assertEqual(info["delegatedAmount"], 250)
+        self.assertEqual(info["state"], "frozen")
+        self.assertIsNone(info["closeAuthority"])
+        self.assertEqual(decoded["space"], 165)
+
+    def test_mint(self):
+        """Mints decode supply, decimals and optional authorities."""
+        data = MINT.pack(1, key(OWNER), 10 ** 15, 9, 1, 0, bytes(32))
+        info = decode_account(account(data))["data"]["parsed"]["info"]
+        self.assertEqual(info, {"mintAuthority": OWNER, "supply": 10 ** 15, "decimals": 9,
+                                "isInitialized": True, "freezeAuthority": None})
+
+    def test_multisig(self):
+        """Multisigs list only their valid signers."""
+        data = struct.pack("<BBB", 2, 3, 1) + key(OWNER) + key(DELEGATE) + key(MINT_ADDRESS) + bytes(32 * 8)
+        parsed = decode_account(account(data))["data"]["parsed"]
+        self.assertEqual(parsed["type"], "multisig")
+        self.assertEqual(parsed["info"]["signers"], [OWNER, DELEGATE, MINT_ADDRESS])
+        self.assertEqual(parsed["info"]["numRequiredSigners"], 2)
+
+    def test_nonce_account(self):
+        """System accounts of nonce size decode as durable nonces."""
+        data = NONCE_ACCOUNT.pack(1, 1, key(OWNER), key(DELEGATE), 5000)
+        parsed = decode_account(account(data, owner=SYSTEM_PROGRAM_ID))["data"]
+        self.assertEqual(parsed["program"], "nonce")
+        self.assertEqual(parsed["parsed"]["info"]["authority"], OWNER)
+        self.assertEqual(parsed["parsed"]["info"]["lamportsPerSignature"], 5000)
+
+    def test_token_2022_extensions(self):
+        """Token-2022 accounts longer than the base layout are told apart by their account type."""
+        data = token_account_data() + bytes([2]) + bytes(20)
+        parsed = decode_account(account(data, owner=TOKEN_2022_PROGRAM_ID))["data"]
+        self.assertEqual(parsed["program"], "spl-token-2022")
+        self.assertEqual(parsed["parsed"]["type"], "account")
+        mint = MINT.pack(0, bytes(32), 7, 2, 1, 0, bytes(32)).ljust(165, b"\0") + bytes([1])
+        parsed = decode_account(account(mint, owner=TOKEN_2022_PROGRAM_ID))["data"]["parsed"]
+        self.assertEqual(parsed["type"], "mint")
+        self.assertEqual(parsed["info"]["supply"], 7)
+
+    def test_unknown_layouts_unchanged(self):
+        """Accounts of other programs or sizes keep their raw data."""
+        other = account(bytes(17), owner=OWNER)
+        self.assertIs(decode_account(other), other)
+        self.assertIsNone(decode_account(None))
+        short = account(bytes(100))
+        self.assertIs(decode_account(short), short)
+
+    def test_bulk_decode(self):
+        """Many accounts decode in one pass, including missing ones."""
+        accounts = [account(token_account_data(amount=index)) for index in range(200)] + [None]
+        decoded = decode_accounts(accounts)
+        self.assertEqual(decoded[199]["data"]["parsed"]["info"]["amount"], 199)
+        self.assertIsNone(decoded[-1])
+
+class TestDecodedResponses(unittest.TestCase):
+    """Test cases for decoding in the RPC path and rendering."""
+
+    def response(self, data):
+        """getAccountInfo response wrapping an account."""
+        return {"jsonrpc": "2.0", "id": 1, "result": {"context": {"slot": 1}, "value": account(data)}}
+
+    def test_render_token_account(self):
+        """getAccountInfo answers describe decoded token accounts."""
+        request = {"method": "getAccountInfo", "params": [OWNER, {"encoding": "base64"}]}
+        response = decode_response(request, self.response(token_account_data(delegate=DELEGATE)))
+        text = render_result("getAccountInfo", request, response)
+        self.assertIn("165 bytes of data", text)
+        self.assertIn(f"token account for the mint {MINT_ADDRESS}", text)
+        self.assertIn("5,000 base units", text)
+        self.assertIn(f"{DELEGATE} is delegated 250 base units", text)
+
+    @patch('app.utils.tools.rpc_cache', RPCCache(enabled=False))
+    @patch('app.utils.tools.rpc_router')
+    def test_call_rpc_decodes(self, mock_router):
+        """Tool calls return decoded fields instead of the base64 blob."""
+        mock_router.call.return_value = self.response(token_account_data())
+        response = call_rpc({"jsonrpc": "2.0", "id": 1, "method": "getAccountInfo", "params": [OWNER]})
+        self.assertEqual(response["result"]["value"]["data"]["parsed"]["info"]["owner"], OWNER)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Tests for the conversational answer cache.
+"""
+import unittest
+from app.core.answer_cache import AnswerCache, embed, hnswlib, memory_scope
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestAnswerCache(unittest.TestCase):
+    """Test cases for exact and nearest-neighbour lookups."""
+
+    def setUp(self):
+        """Create a cache with a controllable clock."""
+        self.clock = FakeClock()
+        self.cache = AnswerCache(max_entries=3, ttl=60, similarity=0.8, enabled=True,
+                                 use_hnsw=False, clock=self.clock)
+        self.scope = memory_scope([])
+
+    def test_exact_match_after_normalization(self):
+        """Case and punctuation differences still hit."""
+        self.cache.put("What is Solana?", self.scope, "Solana is a blockchain.")
+        self.assertEqual(self.cache.get("what is solana", self.scope), "Solana is a blockchain.")
+        self.assertEqual(self.cache.stats()["exact_hits"], 1)
+
+    def test_semantic_match(self):
+        """Near-duplicate phrasings hit through the embedding index."""
+        self.cache.put("how do airdrops work", self.scope, "Airdrops send free tokens.")
+        self.assertEqual(self.cache.get("how does an airdrop work", self.scope), "Airdrops send free tokens.")
+        self.assertEqual(self.cache.stats()["semantic_hits"], 1)
+
+    def test_unrelated_query_misses(self):
+        """Different topics do not match."""
+        self.cache.put("what is solana", self.scope, "Solana is a blockchain.")
+        self.assertIsNone(self.cache.get("what is ethereum", self.scope))
+
+    def test_reordered_question_misses(self):
+        """Swapping the compared terms changes the question, so the answer is not reused."""
+        self.cache.put("is solana better than ethereum", self.scope, "It depends on the use case.")
+        self.assertLess(float(embed("is solana better than ethereum") @ embed("is ethereum better than solana")), 0.8)
+        self.assertIsNone(self.cache.get("is ethereum better than solana", self.scope))
+
+    def test_negated_question_misses(self):
+        """A negated question never reuses the answer of the positive one, or the reverse."""
+        self.cache.put("how do airdrops work", self.scope, "Airdrops send free tokens.")
+        cache = AnswerCache(similarity=0.5, enabled=True, use_hnsw=False, clock=self.clock)
+        cache.put("why is staking safe", self.scope, "Stake stays in your account.")
+        self.assertIsNone(self.cache.get("how do airdrops not work", self.scope))
+        self.assertIsNone(cache.get("why is staking not safe", self.scope))
+        self.assertIsNone(cache.get("why isn't staking safe", self.scope))
+
+    def test_scoped_by_memory(self):
+        """Answers are not shared across different memory windows."""
+        other = memory_scope([{"role": "user", "content": "we were talking about validators"}])
+        self.cache.put("tell me more", self.scope, "Sure.")
+        self.assertIsNone(self.cache.get("tell me more", other))
+
+    def test_data_dependent_not_cached(self):
+        """Queries or answers with numbers or addresses are never stored."""
+        self.assertFalse(self.cache.put("what happened in 2021", self.scope, "Things."))
+        self.assertFalse(self.cache.put("hello", self.scope, "Your balance is 5 SOL."))
+
+    def test_ttl_and_size_bound(self):
+        """Entries expire and the oldest are evicted beyond max_entries."""
+        for topic in ["staking", "validators", "wallets", "tokens"]:
+            self.cache.put(f"explain {topic}", self.scope, topic)
+        self.assertEqual(self.cache.stats()["entries"], 3)
+        self.assertIsNone(self.cache.get("explain staking", self.scope))
+        self.clock.now = 61
+        self.assertIsNone(self.cache.get("explain tokens", self.scope))
+
+@unittest.skipUnless(hnswlib is not None, "hnswlib is not installed")
+class TestAnswerCacheHNSW(TestAnswerCache):
+    """The same cases on the hnswlib index."""
+
+    def setUp(self):
+        """Create a cache backed by hnswlib."""
+        super().setUp()
+        self.cache = AnswerCache(max_entries=3, ttl=60, similarity=0.8, enabled=True,
+                                 use_hnsw=True, clock=self.clock)
+
+    def test_uses_hnswlib(self):
+        """The hnswlib index is selected and survives replacing evicted entries."""
+        self.assertEqual(self.cache.stats()["index"], "hnswlib")
+        for topic in ["staking", "validators", "wallets", "tokens", "fees"]:
+            self.cache.put(f"explain {topic}", self.scope, topic)
+        self.assertEqual(self.cache.get("explain fees to me", self.scope), "fees")
+
+if __name__ == '__main__':
+    unittest.main()
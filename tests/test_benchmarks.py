@@ -0,0 +1,98 @@
+"""
+Tests for the offline benchmark harness.
+"""
+import unittest
+from app.data.task_params import TASK_PARAMS_MAP
+from app.utils.metrics import Histogram
+from app.utils.rpc_client import SolanaRPCClient
+from benchmarks.fake_llm import FakeLLM
+from benchmarks.load_test import build_queries, histogram_delta, histogram_snapshot, percentiles
+from benchmarks.mock_rpc import MockSolanaRPC, fake_pubkey
+
+class TestMockRPC(unittest.TestCase):
+    """Test cases for the mock Solana RPC server."""
+
+    def test_answers_every_task_method(self):
+        """Each method in the task catalog gets a result, singly and in a batch."""
+        server = MockSolanaRPC(items=3).start()
+        client = SolanaRPCClient()
+        try:
+            payloads = [
+                {"jsonrpc": "2.0", "id": index, "method": task["data"]["method"], "params": [fake_pubkey(index)]}
+                for index, task in enumerate(TASK_PARAMS_MAP.values())
+            ]
+            for payload in payloads:
+                self.assertIn("result", client.call(payload, server.url), payload["method"])
+            batch = client.call(payloads, server.url)
+            self.assertEqual([item["id"] for item in batch], list(range(len(payloads))))
+            owner = fake_pubkey("owner")
+            accounts = client.call({"jsonrpc": "2.0", "id": 1, "method": "getTokenAccountsByOwner",
+                                   "params": [owner]}, server.url)
+            self.assertEqual(len(accounts["result"]["value"]), 3)
+        finally:
+            client.close()
+            server.stop()
+
+class TestFakeLLM(unittest.TestCase):
+    """Test cases for the scripted LLM."""
+
+    def setUp(self):
+        """Build an LLM without latency."""
+        self.llm = FakeLLM()
+
+    def test_identifier_uses_router(self):
+        """The identifier answers with the routed task as JSON."""
+        address = fake_pubkey(1)
+        answer = self.llm.call([
+            {"role": "system", "content": "You are Task Definer and Populator. ..."},
+            {"role": "user", "content": f"Identify the task needed to be performed in balance of {address}. Return getAccountInfo ..."},
+        ])
+        self.assertIn('"task": "getBalance"', answer)
+        self.assertIn(address, answer)
+
+    def test_retriever_calls_tool_then_answers(self):
+        """The blockchain agent calls the tool once and answers from the observation."""
+        messages = [
+            {"role": "system", "content": "You are Blockchain Information Retriever. ... Observation: ..."},
+            {"role": "user", "content": "Get the balance\nUse this request data: {'method': 'getBalance'}\n\nThought:"},
+        ]
+        self.assertIn('Action Input: {"data": {"method": "getBalance"}}', self.llm.call(messages))
+        messages.append({"role": "assistant", "content": "Action: ...\nObservation: 42"})
+        self.assertIn("Final Answer:", self.llm.call(messages))
+
+    def test_conversion_fails(self):
+        """Conversational answers are left for crewai to return unconverted."""
+        with self.assertRaises(ValueError):
+            self.llm.call([{"role": "system", "content": "Please convert the following text into valid JSON."}])
+
+class TestLoadTestReport(unittest.TestCase):
+    """Test cases for load test statistics."""
+
+    def test_percentiles(self):
+        """Latencies are summarised in milliseconds."""
+        summary = percentiles([index / 1000 for index in range(1, 101)])
+        self.assertEqual(summary["p50_ms"], 51)
+        self.assertEqual(summary["p99_ms"], 100)
+        self.assertEqual(summary["max_ms"], 100)
+
+    def test_histogram_delta(self):
+        """Stage breakdowns only count observations made during the run."""
+        histogram = Histogram("bench_seconds", "Test", ["stage"])
+        histogram.observe(1.0, stage="a")
+        before = histogram_snapshot(histogram)
+        histogram.observe(0.2, stage="a")
+        histogram.observe(0.4, stage="a")
+        delta = histogram_delta(before, histogram_snapshot(histogram))
+        self.assertEqual(delta[("a",)]["count"], 2)
+        self.assertAlmostEqual(delta[("a",)]["mean_ms"], 300)
+
+    def test_query_mix_is_deterministic(self):
+        """The same arguments always produce the same queries, each with its own address."""
+        queries = build_queries(20, 0.1)
+        self.assertEqual(queries, build_queries(20, 0.1))
+        self.assertIn(fake_pubkey(0), queries[0])
+        self.assertIn(fake_pubkey(7), queries[7])
+        self.assertEqual(sum(query.startswith(("hello", "what can", "thanks")) for query in queries), 2)
+
+if __name__ == '__main__':
+    unittest.main()
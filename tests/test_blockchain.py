@@ -46,7 +46,7 @@ class TestBlockchainService(unittest.TestCase):
         result = self.blockchain_service.process_query("What's the balance of this address?")
         
         # Assert that the mock was called correctly
-        self.mock_crew.process_query.assert_called_once_with("What's the balance of this address?")
+        self.mock_crew.process_query.assert_called_once_with("What's the balance of this address?", session_id=None)
         
         # Assert that the result is correct
         self.assertEqual(result["response"], "The balance is 2.5 SOL.")
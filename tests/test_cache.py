@@ -0,0 +1,94 @@
+"""
+Tests for the JSON-RPC response cache.
+"""
+import unittest
+from app.utils.cache import RPCCache, CachePolicy, cache_key
+
+def request(method, params=None, request_id=1):
+    """Build a JSON-RPC request."""
+    data = {"jsonrpc": "2.0", "id": request_id, "method": method}
+    if params is not None:
+        data["params"] = params
+    return data
+
+def ok(result, request_id=1):
+    """Build a JSON-RPC success response."""
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestRPCCache(unittest.TestCase):
+    """Test cases for cache policies and eviction."""
+
+    def setUp(self):
+        """Create a cache with a controllable clock."""
+        self.clock = FakeClock()
+        self.cache = RPCCache(max_bytes=10_000, enabled=True, clock=self.clock)
+
+    def test_key_ignores_id_and_key_order(self):
+        """Equivalent requests share a canonical key."""
+        a = request("getAccountInfo", ["addr", {"encoding": "base64", "commitment": "confirmed"}], 1)
+        b = request("getAccountInfo", ["addr", {"commitment": "confirmed", "encoding": "base64"}], 9)
+        self.assertEqual(cache_key(a), cache_key(b))
+
+    def test_hit_returns_callers_id(self):
+        """A cached response is returned with the new request's id."""
+        self.cache.set(request("getSupply", request_id=1), ok({"value": 1}, 1))
+        cached = self.cache.get(request("getSupply", request_id=42))
+        self.assertEqual(cached["id"], 42)
+        self.assertEqual(cached["result"], {"value": 1})
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_ttl_expiry(self):
+        """Entries expire after their method TTL."""
+        data = request("getBalance", ["addr"])
+        self.cache.set(data, ok(5))
+        self.clock.now = 1.0
+        self.assertIsNotNone(self.cache.get(data))
+        self.clock.now = 3.0
+        self.assertIsNone(self.cache.get(data))
+        self.assertEqual(self.cache.stats()["expirations"], 1)
+
+    def test_processed_commitment_is_one_slot(self):
+        """Processed commitment shortens the TTL to a single slot."""
+        data = request("getBalance", ["addr", {"commitment": "processed"}])
+        self.cache.set(data, ok(5))
+        self.clock.now = 0.5
+        self.assertIsNone(self.cache.get(data))
+
+    def test_finalized_transaction_cached_forever(self):
+        """Found finalized transactions never expire; missing ones are not stored."""
+        found = request("getTransaction", ["sig1", {"encoding": "jsonParsed"}])
+        missing = request("getTransaction", ["sig2", {"encoding": "jsonParsed"}])
+        self.assertTrue(self.cache.set(found, ok({"slot": 1})))
+        self.assertFalse(self.cache.set(missing, ok(None)))
+        self.clock.now = 10 ** 9
+        self.assertIsNotNone(self.cache.get(found))
+
+    def test_uncacheable_methods_and_errors(self):
+        """Airdrops and error responses are never stored."""
+        self.assertFalse(self.cache.set(request("requestAirdrop", ["addr", 1]), ok("sig")))
+        self.assertFalse(self.cache.set(request("getBalance", ["addr"]), {"error": {"code": -1}}))
+
+    def test_lru_eviction_by_bytes(self):
+        """The least recently used entries are evicted when the byte budget is exceeded."""
+        cache = RPCCache(max_bytes=105, enabled=True, clock=self.clock,
+                         policies={"getBalance": CachePolicy(ttl=60)})
+        for index in range(3):
+            cache.set(request("getBalance", [f"addr{index}"]), ok(index))
+        cache.get(request("getBalance", ["addr0"]))
+        cache.set(request("getBalance", ["addr3"]), ok(3))
+        self.assertIsNotNone(cache.get(request("getBalance", ["addr0"])))
+        self.assertIsNone(cache.get(request("getBalance", ["addr1"])))
+        self.assertLessEqual(cache.stats()["bytes"], 105)
+        self.assertGreater(cache.stats()["evictions"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Tests for the compact task catalog.
+"""
+import unittest
+from app.core.catalog import (
+    TASK_CATALOG, format_catalog, select_tasks, expand_task_data, prompt_token_report
+)
+from app.data.task_params import TASK_PARAMS_MAP
+from app.utils.solana import b58encode
+from app.utils.templates import REQUEST_BUILDERS, InvalidParamsError, build_task_data
+
+ADDRESS = "dv1ZAGvdsz5hHLwWXsVnM94hWf1pjbKVau1QVkaMJ92"
+ADDRESS_2 = b58encode(bytes(range(1, 33)))
+SIGNATURE = b58encode(bytes(range(100, 164)))
+
+class TestTaskCatalog(unittest.TestCase):
+    """Test cases for catalog rendering, selection and expansion."""
+
+    def test_catalog_lists_slots(self):
+        """Each task is one line with its placeholder slots."""
+        self.assertEqual(set(TASK_CATALOG), set(TASK_PARAMS_MAP))
+        catalog = format_catalog()
+        self.assertEqual(len(catalog.splitlines()), len(TASK_PARAMS_MAP))
+        self.assertIn("getBalance(address): Get balance for an address", catalog)
+        self.assertIn("requestAirdrop(address, amount: integer lamports)", catalog)
+        self.assertIn("getTokenAccountsByOwner(address, programId)", catalog)
+
+    def test_compact_catalog_is_smaller(self):
+        """The compact catalog is well below the full template map."""
+        report = prompt_token_report(f"who are the top holders of {ADDRESS}", top_k=3)
+        self.assertLess(report["compact_catalog_tokens"], report["full_task_params_map_tokens"])
+        self.assertLess(report["selected_catalog_tokens"], report["compact_catalog_tokens"])
+
+    def test_top_k_selection(self):
+        """Relevant tasks rank into the top-k subset."""
+        self.assertIn("getTokenLargestAccounts", select_tasks(f"top holders of {ADDRESS}", top_k=3))
+        self.assertIn("getTransactionDetails", select_tasks("details of my transfer tx", top_k=3))
+        self.assertEqual(len(select_tasks("hello there", top_k=3)), len(TASK_CATALOG))
+        self.assertEqual(len(select_tasks("balance", top_k=0)), len(TASK_CATALOG))
+
+    def test_expand_task_data(self):
+        """Slot values are expanded into the full JSON-RPC template."""
+        data = expand_task_data("getBalance", {"address": ADDRESS})
+        self.assertEqual(data["method"], "getBalance")
+        self.assertEqual(data["params"], [ADDRESS])
+        self.assertEqual(expand_task_data("getHealth", {})["method"], "getHealth")
+
+        full = {"jsonrpc": "2.0", "id": 1, "method": "getBalance", "params": [ADDRESS]}
+        self.assertIs(expand_task_data("getBalance", full), full)
+
+        with self.assertRaises(ValueError):
+            expand_task_data("getBalance", {})
+
+    def test_expand_validates_complete_requests(self):
+        """Complete requests from the LLM are checked and coerced at the slot positions."""
+        full = {"jsonrpc": "2.0", "id": 1, "method": "requestAirdrop", "params": [ADDRESS, "2 SOL"]}
+        data = expand_task_data("requestAirdrop", full)
+        self.assertEqual(data["params"], [ADDRESS, 2_000_000_000])
+        self.assertEqual(full["params"][1], "2 SOL")
+        with self.assertRaises(InvalidParamsError):
+            expand_task_data("getBalance", {"jsonrpc": "2.0", "id": 1, "method": "getBalance", "params": ["0xabc"]})
+
+    def test_expand_rejects_other_methods(self):
+        """A complete request for another method than the chosen task's is never sent."""
+        airdrop = {"jsonrpc": "2.0", "id": 1, "method": "requestAirdrop", "params": [ADDRESS, 1_000_000_000]}
+        with self.assertRaises(InvalidParamsError):
+            expand_task_data("getBalance", airdrop)
+        with self.assertRaises(InvalidParamsError):
+            expand_task_data("getHealth", {"jsonrpc": "2.0", "id": 1, "method": "sendTransaction", "params": ["AAAA"]})
+
+class TestRequestBuilders(unittest.TestCase):
+    """Test cases for the request builders."""
+
+    def test_builders_match_templates(self):
+        """Every template has a builder producing the template with its slots filled."""
+        values = {"address": ADDRESS, "addresses": [ADDRESS], "tokenAccountPubkey": ADDRESS, "programId": ADDRESS,
+                  "signature": SIGNATURE, "amount": 5, "message": "AQAB"}
+        for name, params in TASK_PARAMS_MAP.items():
+            data = build_task_data(name, values)
+            template = dict(params["data"], id=data["id"])
+            self.assertEqual(data.keys(), template.keys())
+            self.assertEqual(data["method"], template["method"])
+            self.assertEqual(len(data.get("params", [])), len(template.get("params", [])))
+        self.assertEqual(build_task_data("getTokenAccountsByOwner", values)["params"],
+                         [ADDRESS, {"programId": ADDRESS}, {"encoding": "jsonParsed"}])
+
+    def test_requests_are_independent(self):
+        """Each request has its own id and copies of the containers holding placeholders."""
+        template = TASK_PARAMS_MAP["getAccountInfo"]["data"]
+        first = build_task_data("getAccountInfo", {"address": ADDRESS})
+        second = build_task_data("getAccountInfo", {"address": ADDRESS_2})
+        self.assertNotEqual(first["id"], second["id"])
+        self.assertEqual((first["params"][0], second["params"][0]), (ADDRESS, ADDRESS_2))
+        self.assertEqual(template["params"][0], "{address}")
+        # Containers without placeholders are shared with the template instead of copied
+        self.assertIs(first["params"][1], template["params"][1])
+
+    def test_invalid_values_rejected(self):
+        """Malformed addresses, signatures, amounts and messages fail before any request is built."""
+        invalid = [
+            ("getBalance", {"address": "not-an-address"}),
+            ("getBalance", {"address": SIGNATURE}),
+            ("getBalance", {"address": 42}),
+            ("getMultipleBalances", {"addresses": []}),
+            ("getMultipleBalances", {"addresses": [ADDRESS, "bad"]}),
+            ("getTransactionDetails", {"signature": ADDRESS}),
+            ("requestAirdrop", {"address": ADDRESS, "amount": -1}),
+            ("requestAirdrop", {"address": ADDRESS, "amount": "0.5 lamports"}),
+            ("requestAirdrop", {"address": ADDRESS, "amount": "lots"}),
+            ("requestAirdrop", {"address": ADDRESS, "amount": True}),
+            ("getGasPrices", {"message": "not base64!"}),
+            ("requestAirdrop", {"address": ADDRESS}),
+        ]
+        for task, values in invalid:
+            with self.subTest(task=task, values=values), self.assertRaises(InvalidParamsError):
+                build_task_data(task, values)
+
+    def test_address_lists(self):
+        """Address lists are accepted as lists or separated strings and deduplicated."""
+        data = build_task_data("getMultipleBalances", {"addresses": f"{ADDRESS}, {ADDRESS_2} {ADDRESS}"})
+        self.assertEqual(data["params"][0], [ADDRESS, ADDRESS_2])
+
+    def test_amounts_coerced_to_lamports(self):
+        """Amounts given as floats or with a unit become integer lamports."""
+        builder = REQUEST_BUILDERS["requestAirdrop"]
+        for amount, lamports in [(1000, 1000), (1000.0, 1000), ("1000", 1000), ("0.25 sol", 250_000_000),
+                                 ("1.1 SOL", 1_100_000_000), ("7 lamports", 7)]:
+            with self.subTest(amount=amount):
+                self.assertEqual(builder({"address": ADDRESS, "amount": amount})["params"][1], lamports)
+
+if __name__ == '__main__':
+    unittest.main()
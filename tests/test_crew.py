@@ -0,0 +1,73 @@
+"""
+Tests for the blockchain crew workflow.
+"""
+import unittest
+from unittest.mock import patch, MagicMock
+from app.core.crew import BlockchainCrew
+
+ADDRESS = "dv1ZAGvdsz5hHLwWXsVnM94hWf1pjbKVau1QVkaMJ92"
+
+def balance_response(data):
+    """Return a getBalance response for a request."""
+    return {"jsonrpc": "2.0", "id": data.get("id"), "result": {"context": {"slot": 1}, "value": 1500000000}}
+
+class TestBlockchainCrew(unittest.TestCase):
+    """Test cases for query and batch processing."""
+
+    @patch('app.core.crew.Crew')
+    def setUp(self, mock_crew_class):
+        """Build a crew with a mocked task identifier."""
+        self.identifier = MagicMock()
+        mock_crew_class.return_value = self.identifier
+        self.crew = BlockchainCrew(MagicMock(), MagicMock(), MagicMock(), {"getBalance": MagicMock()})
+
+    def conversational(self, text):
+        """Mock a conversational crew output."""
+        output = MagicMock(raw=text)
+        output.to_dict.return_value = {}
+        return output
+
+    @patch('app.core.crew.call_rpc', side_effect=balance_response)
+    def test_routed_query_skips_llm(self, mock_call_rpc):
+        """Routed queries are executed and rendered without any crew kickoff."""
+        result = self.crew.process_query(f"balance of {ADDRESS}")
+        self.assertEqual(result["task_executed"], "getBalance")
+        self.assertIn("1.5 SOL", result["response"])
+        self.identifier.kickoff.assert_not_called()
+
+    @patch('app.core.crew.stream_completion', return_value=iter(["About ", "1.5 SOL."]))
+    @patch('app.core.crew.call_rpc', side_effect=balance_response)
+    def test_render_failure_phrases_fetched_response(self, mock_call_rpc, mock_stream_completion):
+        """A result that cannot be rendered is phrased by the LLM without calling the RPC again."""
+        with patch.object(BlockchainCrew, 'render_task', return_value=None):
+            result = self.crew.process_query(f"balance of {ADDRESS}")
+        self.assertEqual(result["response"], "About 1.5 SOL.")
+        mock_call_rpc.assert_called_once()
+        self.assertIn('"value": 1500000000', mock_stream_completion.call_args[0][1][1]["content"])
+        self.identifier.kickoff.assert_not_called()
+
+    def test_conversational_query(self):
+        """Queries the router cannot resolve go to the LLM."""
+        self.identifier.kickoff.return_value = self.conversational("Hello!")
+        result = self.crew.process_query("hi there")
+        self.assertEqual(result, {"response": "Hello!", "task_executed": None})
+
+    @patch('app.core.crew.call_rpc_batch')
+    def test_batch(self, mock_call_rpc_batch):
+        """Batch items are fanned back out in order with per-item errors."""
+        self.identifier.kickoff.return_value = self.conversational("Hello!")
+        mock_call_rpc_batch.side_effect = lambda requests: [
+            balance_response(requests[0]), {"error": "API call failed with status code 429"}
+        ]
+        results = self.crew.process_batch([
+            f"balance of {ADDRESS}", "hi there", "is the network healthy?"
+        ])
+
+        self.assertEqual(len(mock_call_rpc_batch.call_args[0][0]), 2)
+        self.assertIn("1.5 SOL", results[0]["response"])
+        self.assertEqual(results[1]["response"], "Hello!")
+        self.assertEqual(results[2]["task_executed"], "getHealth")
+        self.assertIn("429", results[2]["error"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Tests for the pre-built crew pools.
+"""
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from app.core.crew import BlockchainCrew
+from app.core.crew_pool import CrewPool
+
+class TestCrewPool(unittest.TestCase):
+    """Test cases for crew reuse and isolation."""
+
+    def test_reuses_built_crews(self):
+        """Sequential checkouts reuse one crew instead of building a new one."""
+        factory = MagicMock(side_effect=lambda: object())
+        pool = CrewPool("test", factory, max_size=4)
+        with pool.checkout() as first:
+            pass
+        with pool.checkout() as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(factory.call_count, 1)
+        self.assertEqual(pool.stats()["checkouts"], 2)
+
+    def test_concurrent_checkouts_are_isolated(self):
+        """A crew is never handed to two requests at once and the pool stays bounded."""
+        pool = CrewPool("test", lambda: object(), max_size=2)
+        active = set()
+        overlaps = []
+        lock = threading.Lock()
+
+        def worker():
+            with pool.checkout() as crew:
+                with lock:
+                    if id(crew) in active:
+                        overlaps.append(crew)
+                    active.add(id(crew))
+                time.sleep(0.01)
+                with lock:
+                    active.discard(id(crew))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = pool.stats()
+        self.assertEqual(overlaps, [])
+        self.assertEqual(stats["built"], 2)
+        self.assertEqual(stats["idle"], 2)
+        self.assertGreater(stats["waits"], 0)
+
+    def test_failed_build_frees_slot(self):
+        """A factory error does not permanently consume pool capacity."""
+        factory = MagicMock(side_effect=[RuntimeError("boom"), "crew"])
+        pool = CrewPool("test", factory, max_size=1)
+        with self.assertRaises(RuntimeError):
+            pool.acquire()
+        self.assertEqual(pool.acquire(), "crew")
+
+    @patch('app.core.crew.Task')
+    @patch('app.core.crew.Crew')
+    def test_blockchain_crew_reuses_task_crew(self, mock_crew_class, mock_task_class):
+        """LLM-rendered tasks run on a pooled crew built once per task."""
+        mock_crew_class.side_effect = lambda **kwargs: MagicMock(**{"kickoff.return_value": MagicMock(raw="ok")})
+        crew = BlockchainCrew(MagicMock(), MagicMock(), MagicMock(), {"getBalance": MagicMock(description="d")})
+        self.assertEqual(mock_crew_class.call_count, 1)
+
+        with patch('app.core.crew.LLM_RENDERING', True):
+            for _ in range(3):
+                result = crew.process_query("balance of dv1ZAGvdsz5hHLwWXsVnM94hWf1pjbKVau1QVkaMJ92")
+                self.assertEqual(result["response"], "ok")
+
+        self.assertEqual(mock_crew_class.call_count, 2)
+        self.assertEqual(crew.pool_stats()["getBalance"]["checkouts"], 3)
+        self.assertIn("{data}", mock_task_class.call_args.kwargs["description"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Tests for the bounded query executor.
+"""
+import asyncio
+import threading
+import unittest
+from app.services.executor import QueryExecutor, QueueFullError
+
+class TestQueryExecutor(unittest.TestCase):
+    """Test cases for admission control and statistics."""
+
+    def setUp(self):
+        """Create a small executor."""
+        self.executor = QueryExecutor(max_workers=1, queue_size=1, retry_after=3)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        """Unblock workers and stop the pool."""
+        self.release.set()
+        self.executor.shutdown()
+
+    def test_run_returns_result(self):
+        """Results from the worker are returned to the caller."""
+        result = asyncio.run(self.executor.run(lambda x: x * 2, 21))
+        self.assertEqual(result, 42)
+        self.assertEqual(self.executor.stats()["completed"], 1)
+
+    def test_rejects_when_queue_full(self):
+        """Submissions beyond workers plus queue size fail fast."""
+        running = self.executor.submit(self.release.wait)
+        queued = self.executor.submit(self.release.wait)
+        with self.assertRaises(QueueFullError) as ctx:
+            self.executor.submit(self.release.wait)
+        self.assertEqual(ctx.exception.retry_after, 3)
+
+        stats = self.executor.stats()
+        self.assertEqual(stats["queue_depth"], 1)
+        self.assertEqual(stats["rejected"], 1)
+
+        self.release.set()
+        running.result(timeout=5)
+        queued.result(timeout=5)
+        self.assertGreater(self.executor.stats()["wait_seconds_max"], 0.0)
+
+    def test_event_loop_not_blocked(self):
+        """Other coroutines make progress while a query runs."""
+        async def scenario():
+            task = asyncio.ensure_future(self.executor.run(self.release.wait, 5))
+            await asyncio.sleep(0.05)
+            self.assertFalse(task.done())
+            self.release.set()
+            return await task
+
+        self.assertTrue(asyncio.run(scenario()))
+
+if __name__ == '__main__':
+    unittest.main()
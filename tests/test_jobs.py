@@ -0,0 +1,228 @@
+"""
+Tests for background airdrop jobs.
+"""
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from fastapi.testclient import TestClient
+from app.core.crew import BlockchainCrew
+from app.services.jobs import AirdropJobs
+from app.utils.shared_state import SQLiteState
+from main import app
+
+ADDRESS = "dv1ZAGvdsz5hHLwWXsVnM94hWf1pjbKVau1QVkaMJ92"
+
+def wait_for(condition, timeout=5.0):
+    """Poll until a condition holds."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+class FakeChain:
+    """Answers requestAirdrop, getSignatureStatuses and getBalance from settable state."""
+
+    def __init__(self):
+        self.statuses = {}
+        self.balance = 2500000000
+        self.batches = []
+        self.signatures = 0
+
+    def call(self, data):
+        self.signatures += 1
+        return {"jsonrpc": "2.0", "id": data["id"], "result": f"signature{self.signatures}"}
+
+    def call_batch(self, requests):
+        self.batches.append(requests)
+        responses = []
+        for request in requests:
+            if request["method"] == "getSignatureStatuses":
+                result = {"context": {"slot": 200}, "value": [self.statuses.get(s) for s in request["params"][0]]}
+            else:
+                result = {"context": {"slot": 200}, "value": self.balance}
+            responses.append({"jsonrpc": "2.0", "id": request["id"], "result": result})
+        return responses
+
+    def set_status(self, signature, confirmation_status, err=None):
+        self.statuses[signature] = {"slot": 150, "confirmations": 0, "err": err, "confirmationStatus": confirmation_status}
+
+def airdrop(address=ADDRESS, lamports=1000000000):
+    """requestAirdrop request."""
+    return {"jsonrpc": "2.0", "id": 1, "method": "requestAirdrop", "params": [address, lamports]}
+
+class TestAirdropJobs(unittest.TestCase):
+    """Test cases for confirming airdrops in the background."""
+
+    def setUp(self):
+        """Create a tracker polling a fake chain quickly."""
+        self.chain = FakeChain()
+        self.notified = []
+        self.jobs = self.tracker()
+
+    def tearDown(self):
+        """Stop the poller."""
+        self.jobs.stop()
+
+    def tracker(self, **kwargs):
+        options = dict(poll_initial=0.01, poll_max=0.04, timeout=60, webhook_url="http://hooks.test/jobs",
+                       call=self.chain.call, call_batch=self.chain.call_batch,
+                       notify=lambda url, job: self.notified.append((url, job)))
+        options.update(kwargs)
+        return AirdropJobs(**options)
+
+    def test_confirmed_job_reports_balance(self):
+        """A job completes once its transaction reaches the target commitment, with the new balance."""
+        response, job = self.jobs.submit_airdrop(airdrop())
+        self.assertEqual(response["result"], "signature1")
+        self.assertEqual(self.jobs.get(job.id)["status"], "pending")
+
+        self.chain.set_status("signature1", "processed")
+        self.assertTrue(wait_for(lambda: self.jobs.get(job.id)["confirmation_status"] == "processed"))
+        self.assertEqual(self.jobs.get(job.id)["status"], "pending")
+        self.chain.set_status("signature1", "confirmed")
+        self.assertTrue(wait_for(lambda: self.jobs.get(job.id)["status"] == "confirmed"))
+
+        result = self.jobs.get(job.id)
+        self.assertEqual((result["balance"], result["balance_sol"], result["slot"]), (2500000000, 2.5, 150))
+        balance_request = self.chain.batches[-1][0]
+        self.assertEqual(balance_request["params"], [ADDRESS, {"commitment": "confirmed", "minContextSlot": 150}])
+        self.assertEqual(self.notified, [("http://hooks.test/jobs", result)])
+        self.assertEqual(self.jobs.stats()["completed"], 1)
+
+    def test_pending_signatures_polled_in_one_batch(self):
+        """Every pending signature is checked in a single batch of getSignatureStatuses calls."""
+        jobs = self.tracker(poll_initial=60)
+        self.addCleanup(jobs.stop)
+        for index in range(300):
+            jobs.track(ADDRESS, 1, f"signature{index}")
+        self.chain.set_status("signature299", "finalized")
+
+        self.assertEqual(jobs.poll(), 1)
+        statuses, balances = self.chain.batches
+        self.assertEqual([len(request["params"][0]) for request in statuses], [256, 44])
+        self.assertEqual({request["method"] for request in statuses}, {"getSignatureStatuses"})
+        self.assertEqual(len(balances), 1)
+        self.assertEqual(jobs.stats()["pending"], 299)
+
+    def test_backoff(self):
+        """The poll interval doubles up to the maximum while nothing changes, and resets for new jobs."""
+        self.jobs.track(ADDRESS, 1, "signature1")
+        self.assertTrue(wait_for(lambda: self.jobs.stats()["poll_interval"] == 0.04))
+        self.jobs.track(ADDRESS, 1, "signature2")
+        self.assertLess(self.jobs.stats()["poll_interval"], 0.04)
+
+    def test_failed_and_expired(self):
+        """Transactions that fail or are never seen end their jobs with an error."""
+        failed = self.jobs.track(ADDRESS, 1, "signature1")
+        self.chain.set_status("signature1", "confirmed", err={"InstructionError": [0, "Custom"]})
+        self.assertTrue(wait_for(lambda: self.jobs.get(failed.id)["status"] == "failed"))
+        self.assertIn("InstructionError", self.jobs.get(failed.id)["error"])
+
+        jobs = self.tracker(timeout=0.05)
+        self.addCleanup(jobs.stop)
+        expired = jobs.track(ADDRESS, 1, "signature2")
+        self.assertTrue(wait_for(lambda: jobs.get(expired.id)["status"] == "expired"))
+        self.assertEqual([job["status"] for _, job in self.notified], ["failed", "expired"])
+
+    def test_stuck_below_target_expires(self):
+        """A transaction seen but never reaching the target commitment expires at the deadline."""
+        jobs = self.tracker(timeout=0.05)
+        self.addCleanup(jobs.stop)
+        job = jobs.track(ADDRESS, 1, "signature1")
+        self.chain.set_status("signature1", "processed")
+        self.assertTrue(wait_for(lambda: jobs.get(job.id)["status"] == "expired"))
+        self.assertEqual(jobs.get(job.id)["confirmation_status"], "processed")
+        self.assertIn("confirmed commitment", jobs.get(job.id)["error"])
+        self.assertEqual(jobs.stats()["pending"], 0)
+
+    def test_prune_skips_jobs_being_finished(self):
+        """Pruning keeps a job whose final status is set but whose finish time is not yet."""
+        jobs = self.tracker(poll_initial=60)
+        self.addCleanup(jobs.stop)
+        job = jobs.track(ADDRESS, 1, "signature1")
+        job.status = "confirmed"
+        jobs.track(ADDRESS, 1, "signature2")
+        self.assertIsNotNone(jobs.get(job.id))
+
+    def test_refused_airdrop_has_no_job(self):
+        """An airdrop the faucet refuses is reported without a job."""
+        self.jobs.call = lambda data: {"jsonrpc": "2.0", "id": 1, "error": {"code": 429, "message": "Too many requests"}}
+        response, job = self.jobs.submit_airdrop(airdrop())
+        self.assertIsNone(job)
+        self.assertIn("error", response)
+        self.assertEqual(self.jobs.stats()["tracked"], 0)
+
+    def test_jobs_visible_to_other_workers(self):
+        """Jobs are published to the shared state for workers that did not create them."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        state = SQLiteState(os.path.join(directory.name, "state.db"))
+        self.addCleanup(state.close)
+        worker_a, worker_b = self.tracker(shared=state), self.tracker(shared=state)
+        self.addCleanup(worker_a.stop)
+
+        job = worker_a.track(ADDRESS, 1, "signature1")
+        self.assertEqual(worker_b.get(job.id)["status"], "pending")
+        self.chain.set_status("signature1", "finalized")
+        self.assertTrue(wait_for(lambda: worker_b.get(job.id)["status"] == "confirmed"))
+        self.assertIsNone(worker_b.get("unknown"))
+
+class TestAirdropQueries(unittest.TestCase):
+    """Test cases for airdrop queries and the jobs endpoints."""
+
+    @patch('app.core.crew.Crew')
+    def setUp(self, mock_crew_class):
+        """Build a crew whose task identifier picks requestAirdrop, and a tracker on a fake chain."""
+        output = MagicMock()
+        output.to_dict.return_value = {"task": "requestAirdrop", "data": {"address": ADDRESS, "amount": 1000000000}}
+        mock_crew_class.return_value.kickoff.return_value = output
+        self.crew = BlockchainCrew(MagicMock(), MagicMock(), MagicMock(), {"requestAirdrop": MagicMock()})
+        self.chain = FakeChain()
+        self.jobs = AirdropJobs(poll_initial=0.01, poll_max=0.04, webhook_url="",
+                                call=self.chain.call, call_batch=self.chain.call_batch)
+        self.addCleanup(self.jobs.stop)
+        for target in ('app.core.crew.airdrop_jobs', 'app.api.routes.airdrop_jobs'):
+            patcher = patch(target, self.jobs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_query_returns_job(self):
+        """Airdrop queries answer with a job id instead of waiting for confirmation."""
+        result = self.crew.process_query(f"airdrop 1 SOL to {ADDRESS}")
+        self.assertEqual(result["task_executed"], "requestAirdrop")
+        self.assertIn("signature1", result["response"])
+        self.assertIn(f"/jobs/{result['job_id']}", result["response"])
+        self.assertEqual(self.chain.batches, [])
+
+        client = TestClient(app)
+        self.assertEqual(client.get(f"/jobs/{result['job_id']}").json()["status"], "pending")
+        self.assertEqual(client.get("/jobs/unknown").status_code, 404)
+
+    def test_stream_query_returns_job(self):
+        """Streamed airdrop queries end with the job id in the final event."""
+        events = list(self.crew.stream_query(f"airdrop 1 SOL to {ADDRESS}"))
+        self.assertEqual([name for name, _ in events][:2], ["task", "rpc_result"])
+        self.assertEqual(events[-1][0], "final")
+        self.assertIsNotNone(self.jobs.get(events[-1][1]["job_id"]))
+
+    def test_job_events(self):
+        """The events endpoint streams status changes until the job finishes."""
+        # The first poll waits until the stream has reported the pending job
+        self.jobs.poll_initial = 0.3
+        job = self.jobs.track(ADDRESS, 1000000000, "signature1")
+        self.chain.set_status("signature1", "confirmed")
+        with patch('app.api.routes.JOB_POLL_INITIAL_SECONDS', 0.01):
+            response = TestClient(app).get(f"/jobs/{job.id}/events")
+
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        statuses = [json.loads(block.split("data: ", 1)[1])["status"] for block in response.text.strip().split("\n\n")]
+        self.assertEqual(statuses[0], "pending")
+        self.assertEqual(statuses[-1], "confirmed")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+Tests for streamed parsing and local reduction of large RPC results.
+"""
+import json
+import tracemalloc
+import unittest
+from unittest.mock import patch
+from app.core.renderers import render_result
+from app.utils.cache import RPCCache
+from app.utils.json_stream import JSONStreamError, StreamedRPCResponse
+from app.utils.reducers import reduce_response, summarize_program_accounts, summarize_token_accounts
+from app.utils.rpc_client import SolanaRPCClient
+from app.utils.rpc_router import RPCRouter
+from app.utils.tools import call_rpc
+from tests.stub_rpc import StubRPCServer
+
+OWNER = "4Nd1mBQtrMJVYVfKf2PJy9NZUZdTAsp7D4xWLs4gDB4T"
+
+def token_account(index, amount, mint="Mint111"):
+    """Build a jsonParsed token account."""
+    return {"pubkey": f"Acct{index}", "account": {"data": {"parsed": {"info": {
+        "mint": mint, "owner": OWNER,
+        "tokenAmount": {"amount": str(amount), "decimals": 6, "uiAmountString": str(amount / 10 ** 6)},
+    }}}, "lamports": 2039280}}
+
+def token_response(count):
+    """getTokenAccountsByOwner response with `count` accounts."""
+    accounts = [token_account(index, index * 1000, mint=f"Mint{index % 3}") for index in range(count)]
+    return {"jsonrpc": "2.0", "result": {"context": {"slot": 5}, "value": accounts}, "id": 1}
+
+def chunked(payload, size):
+    """Split encoded JSON into chunks of `size` bytes."""
+    data = json.dumps(payload).encode()
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+class TestStreamedResponse(unittest.TestCase):
+    """Test cases for the incremental response parser."""
+
+    def test_value_array_across_small_chunks(self):
+        """Elements of result.value are yielded intact even when split over many chunks."""
+        response = token_response(25)
+        streamed = StreamedRPCResponse(chunked(response, 7))
+        items = list(streamed.items())
+        self.assertEqual(items, response["result"]["value"])
+        self.assertEqual(streamed.array_path, ["result", "value"])
+        self.assertEqual(streamed.build("summary"), dict(response, result={"context": {"slot": 5}, "value": "summary"}))
+
+    def test_top_level_array_and_split_numbers(self):
+        """A result array is streamed and numbers split across chunks are not cut short."""
+        response = {"jsonrpc": "2.0", "result": [{"lamports": 123456789}] * 3, "id": 987654}
+        streamed = StreamedRPCResponse(chunked(response, 3))
+        self.assertEqual(list(streamed.items()), response["result"])
+        self.assertEqual(streamed.envelope["id"], 987654)
+
+    def test_non_array_results_are_kept(self):
+        """Errors and scalar results end up in the envelope."""
+        error = {"jsonrpc": "2.0", "error": {"code": -32600, "message": "bad"}, "id": 1}
+        streamed = StreamedRPCResponse(chunked(error, 5))
+        self.assertEqual(list(streamed.items()), [])
+        self.assertEqual(streamed.finish(), error)
+
+    def test_invalid_json(self):
+        """Truncated responses raise."""
+        with self.assertRaises(JSONStreamError):
+            list(StreamedRPCResponse([b'{"result": [{"a": 1}, {"b"']).items())
+
+    def test_memory_bounded_by_element(self):
+        """Reducing a streamed listing holds far less than the response itself."""
+        response = token_response(20000)
+        chunks = chunked(response, 64 * 1024)
+        size = sum(len(chunk) for chunk in chunks)
+        tracemalloc.start()
+        summary = summarize_token_accounts(StreamedRPCResponse(iter(chunks)).items())
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertEqual(summary["count"], 20000)
+        self.assertLess(peak, size // 4)
+
+class TestReducers(unittest.TestCase):
+    """Test cases for account listing summaries."""
+
+    def test_token_accounts_summary(self):
+        """Token accounts reduce to counts and the largest balances."""
+        summary = summarize_token_accounts(token_response(30)["result"]["value"], top_n=3)
+        self.assertEqual(summary["count"], 30)
+        self.assertEqual(summary["mints"], 3)
+        self.assertEqual(summary["empty_accounts"], 1)
+        self.assertEqual([entry["pubkey"] for entry in summary["top"]], ["Acct29", "Acct28", "Acct27"])
+        self.assertFalse(summary["truncated"])
+
+    def test_max_items_truncates(self):
+        """Reading stops after max_items and the summary says so."""
+        summary = summarize_token_accounts(token_response(30)["result"]["value"], max_items=10)
+        self.assertEqual(summary["count"], 10)
+        self.assertTrue(summary["truncated"])
+
+    def test_program_accounts_summary(self):
+        """Program accounts reduce to totals and the richest accounts."""
+        accounts = [{"pubkey": f"P{index}", "account": {"lamports": index, "space": 17, "owner": "Prog"}}
+                    for index in range(5)]
+        summary = summarize_program_accounts(accounts, top_n=2)
+        self.assertEqual(summary["total_lamports"], 10)
+        self.assertEqual(summary["total_space"], 85)
+        self.assertEqual([entry["pubkey"] for entry in summary["top"]], ["P4", "P3"])
+
+    def test_reduce_response_is_idempotent(self):
+        """Already reduced responses and other methods pass through unchanged."""
+        data = {"method": "getTokenAccountsByOwner", "params": [OWNER]}
+        reduced = reduce_response(data, token_response(4))
+        self.assertEqual(reduced["result"]["value"]["count"], 4)
+        self.assertEqual(reduce_response(data, reduced), reduced)
+        self.assertEqual(reduce_response({"method": "getBalance"}, token_response(1)), token_response(1))
+
+    def test_renderer_lists_largest(self):
+        """Rendered listings show the largest balances and how many are left out."""
+        data = {"method": "getTokenAccountsByOwner", "params": [OWNER]}
+        text = render_result("getTokenAccountsByOwner", data, token_response(15))
+        self.assertIn("Found 15 token accounts owned by", text)
+        self.assertIn("Acct14", text)
+        self.assertNotIn("Acct0:", text)
+        self.assertIn("...and 5 more.", text)
+
+class TestStreamedCalls(unittest.TestCase):
+    """Test cases for reduced calls over HTTP."""
+
+    def setUp(self):
+        """Serve a large token account listing."""
+        self.server = StubRPCServer(handler=lambda request: dict(token_response(500), id=request.get("id"))).start()
+        self.client = SolanaRPCClient()
+
+    def tearDown(self):
+        """Stop the stub server."""
+        self.client.close()
+        self.server.stop()
+
+    def test_client_reduces_stream(self):
+        """The client hands array elements to the reducer and returns its summary."""
+        payload = {"jsonrpc": "2.0", "id": 7, "method": "getTokenAccountsByOwner", "params": [OWNER]}
+        response = self.client.call(payload, self.server.url, reduce=summarize_token_accounts)
+        self.assertEqual(response["id"], 7)
+        self.assertEqual(response["result"]["context"], {"slot": 5})
+        self.assertEqual(response["result"]["value"]["count"], 500)
+
+    def test_call_rpc_returns_summary(self):
+        """Tool calls return summaries, so the full listing never reaches the model."""
+        router = RPCRouter([self.server.url], client=self.client)
+        with patch('app.utils.tools.rpc_router', router), patch('app.utils.tools.rpc_cache', RPCCache(enabled=False)):
+            response = call_rpc({"jsonrpc": "2.0", "id": 1, "method": "getTokenAccountsByOwner", "params": [OWNER]})
+        self.assertEqual(response["result"]["value"]["count"], 500)
+        self.assertLess(len(json.dumps(response)), 5000)
+
+if __name__ == '__main__':
+    unittest.main()
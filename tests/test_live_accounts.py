@@ -0,0 +1,167 @@
+"""
+Tests for the subscription-backed live account view.
+"""
+import time
+import unittest
+from unittest.mock import patch
+from app.utils.cache import RPCCache
+from app.utils.live_accounts import LiveAccountView
+from app.utils.tools import call_rpc
+from tests.stub_ws import StubWSServer
+
+HOT = "4Nd1mBQtrMJVYVfKf2PJy9NZUZdTAsp7D4xWLs4gDB4T"
+COLD = "dv1ZAGvdsz5hHLwWXsVnM94hWf1pjbKVau1QVkaMJ92"
+
+def token_account(lamports=2039280, amount="5000"):
+    """jsonParsed token account value."""
+    return {"lamports": lamports, "owner": "TokenkegQfeZyiNwAJbNbGqPDpfhrLSpn8Xk5GaFz7eG", "executable": False,
+            "data": {"program": "spl-token", "parsed": {"type": "account", "info": {
+                "mint": "So11111111111111111111111111111111111111112", "owner": HOT,
+                "tokenAmount": {"amount": amount, "decimals": 9, "uiAmountString": amount}}}, "space": 165}}
+
+def wait_for(condition, timeout=5.0):
+    """Poll until a condition holds."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+def request(method, address=HOT, *options):
+    """JSON-RPC request for an account."""
+    return {"jsonrpc": "2.0", "id": 7, "method": method, "params": [address, *options]}
+
+class TestLiveAccountView(unittest.TestCase):
+    """Test cases for subscribing to and serving hot accounts."""
+
+    def setUp(self):
+        """Start a WebSocket stub and a view with fast rebalancing."""
+        self.server = StubWSServer().start()
+        self.fetched = []
+        self.view = LiveAccountView(ws_url=self.server.url, max_accounts=2, min_hits=3,
+                                    rebalance_interval=0.25, stale_after=1.0, reconnect_max_delay=0.2,
+                                    fetch=self.fetch)
+
+    def tearDown(self):
+        """Stop the view and the stub."""
+        self.view.stop()
+        self.server.stop()
+
+    def fetch(self, payload):
+        """Snapshot fetch answering with a token account at slot 100."""
+        self.fetched.append(payload)
+        return {"jsonrpc": "2.0", "id": payload["id"],
+                "result": {"context": {"slot": 100}, "value": token_account()}}
+
+    def make_hot(self, address=HOT, hits=256):
+        """Request an account often enough to stay subscribed through the test."""
+        for _ in range(hits):
+            self.view.record_access(request("getBalance", address))
+
+    def start_live(self, hits=256):
+        """Start the view and wait until the hot account is served."""
+        self.view.start()
+        self.make_hot(hits=hits)
+        self.assertTrue(wait_for(lambda: self.view.lookup(request("getBalance")) is not None))
+
+    def test_hot_account_served_from_memory(self):
+        """Accounts past the hit threshold are subscribed, seeded once and then served locally."""
+        self.start_live()
+        self.make_hot(COLD, hits=2)
+        self.assertEqual(self.server.subscribed(), [HOT])
+        self.assertEqual(len(self.fetched), 1)
+        self.assertEqual(self.fetched[0]["params"], [HOT, {"encoding": "jsonParsed", "commitment": "finalized"}])
+
+        response = self.view.lookup(request("getBalance"))
+        self.assertEqual(response, {"jsonrpc": "2.0", "id": 7, "result": {"context": {"slot": 100}, "value": 2039280}})
+        balance = self.view.lookup(request("getTokenAccountBalance"))
+        self.assertEqual(balance["result"]["value"]["amount"], "5000")
+        info = self.view.lookup(request("getAccountInfo", HOT, {"encoding": "jsonParsed"}))
+        self.assertEqual(info["result"]["value"]["data"]["parsed"]["type"], "account")
+        self.assertIsNone(self.view.lookup(request("getBalance", COLD)))
+        self.assertEqual(self.view.stats()["served"], 4)
+
+    def test_notifications_update_value(self):
+        """Account notifications replace the snapshot; older slots are ignored."""
+        self.start_live()
+        self.server.notify(HOT, token_account(lamports=10, amount="7"), slot=150)
+        self.assertTrue(wait_for(lambda: self.view.lookup(request("getBalance"))["result"]["value"] == 10))
+        self.server.notify(HOT, token_account(lamports=20), slot=120)
+        self.server.notify(HOT, token_account(lamports=30, amount="9"), slot=160)
+        self.assertTrue(wait_for(lambda: self.view.lookup(request("getBalance"))["result"]["value"] == 30))
+        self.assertEqual(self.view.lookup(request("getBalance"))["result"]["context"]["slot"], 160)
+
+    def test_other_requests_not_served(self):
+        """Requests at another commitment or with a data slice go to the RPC."""
+        self.start_live()
+        self.assertIsNone(self.view.lookup(request("getBalance", HOT, {"commitment": "processed"})))
+        self.assertIsNone(self.view.lookup(request("getAccountInfo", HOT, {"dataSlice": {"offset": 0, "length": 8}})))
+        self.assertIsNotNone(self.view.lookup(request("getBalance", HOT, {"commitment": "finalized"})))
+
+    def test_other_encodings_not_served(self):
+        """getAccountInfo is only served in the subscription's encoding."""
+        self.start_live()
+        self.assertIsNone(self.view.lookup(request("getAccountInfo", HOT, {"encoding": "base64"})))
+        self.assertIsNone(self.view.lookup(request("getAccountInfo", HOT)))
+        self.assertIsNotNone(self.view.lookup(request("getAccountInfo", HOT, {"encoding": "jsonParsed"})))
+
+    def test_unservable_requests_not_counted(self):
+        """Requests the view could not answer do not earn an account a subscription."""
+        self.view.start()
+        for _ in range(10):
+            self.view.record_access(request("getAccountInfo", COLD, {"encoding": "base64"}))
+            self.view.record_access(request("getBalance", COLD, {"commitment": "processed"}))
+        self.assertEqual(self.view.hot_accounts(), [])
+        self.make_hot(COLD, hits=3)
+        self.assertEqual(self.view.hot_accounts(), [COLD])
+
+    def test_stale_view_not_served(self):
+        """Nothing is served once slot notifications stop arriving."""
+        now = [0.0]
+        self.view.clock = lambda: now[0]
+        self.start_live()
+        now[0] += 2.0
+        self.assertFalse(self.view.is_fresh())
+        self.assertIsNone(self.view.lookup(request("getBalance")))
+
+    def test_reconnect_resubscribes(self):
+        """A dropped connection stops serving until the view reconnects and subscribes again."""
+        self.start_live()
+        self.server.drop_connections()
+        self.assertTrue(wait_for(lambda: self.view.stats()["reconnects"] >= 1))
+        self.make_hot()
+        self.assertTrue(wait_for(lambda: self.view.lookup(request("getBalance")) is not None))
+        self.assertGreaterEqual(self.server.connections, 2)
+        self.assertEqual(self.server.subscribed(), [HOT])
+        self.assertEqual(len(self.fetched), 2)
+
+    def test_malformed_message_reconnects(self):
+        """A malformed frame ends the session and the view reconnects instead of dying."""
+        self.start_live()
+        self.server.send_raw("not json")
+        self.assertTrue(wait_for(lambda: self.view.stats()["reconnects"] >= 1))
+        self.make_hot()
+        self.assertTrue(wait_for(lambda: self.view.lookup(request("getBalance")) is not None))
+        self.server.send_raw('{"jsonrpc": "2.0", "method": "slotNotification", "params": "broken"}')
+        self.assertTrue(wait_for(lambda: self.view.stats()["reconnects"] >= 2))
+
+    def test_cold_accounts_unsubscribed(self):
+        """Request counts decay, so accounts no longer asked for are unsubscribed."""
+        self.start_live(hits=3)
+        self.assertTrue(wait_for(lambda: self.server.subscribed() == []))
+        self.assertIn("accountUnsubscribe", [method for method, _ in self.server.requests])
+        self.assertIsNone(self.view.lookup(request("getBalance")))
+
+    @patch('app.utils.tools.rpc_cache', RPCCache(enabled=False))
+    @patch('app.utils.tools.rpc_router')
+    def test_call_rpc_uses_live_view(self, mock_router):
+        """Tool calls for live accounts make no RPC request."""
+        with patch('app.utils.tools.live_accounts', self.view):
+            self.start_live()
+            response = call_rpc(request("getBalance"))
+        self.assertEqual(response["result"]["value"], 2039280)
+        mock_router.call.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
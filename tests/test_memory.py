@@ -0,0 +1,175 @@
+"""
+Tests for session-scoped conversation memory.
+"""
+import os
+import tempfile
+import time
+import unittest
+from app.core.memory import ConversationMemory, SessionMemoryStore
+from app.core.memory_backends import SQLiteMemoryBackend
+
+ADDRESS = "dv1ZAGvdsz5hHLwWXsVnM94hWf1pjbKVau1QVkaMJ92"
+
+class TestConversationMemory(unittest.TestCase):
+    """Test cases for the token-budgeted window."""
+
+    def test_window_stays_within_budget(self):
+        """Old messages are folded into a bounded summary."""
+        memory = ConversationMemory(token_budget=50, summary_budget=40)
+        for index in range(100):
+            memory.add_user_message(f"question number {index} " + "x" * 40)
+            memory.add_assistant_message(f"answer number {index} " + "y" * 40)
+
+        self.assertLessEqual(memory.token_count, 90)
+        messages = memory.get_memory()
+        self.assertEqual(messages[0]["role"], "system")
+        self.assertIn("Summary of earlier conversation", messages[0]["content"])
+        self.assertIn("answer number 99", messages[-1]["content"])
+
+    def test_summary_keeps_informative_sentences(self):
+        """Folded messages are condensed to the sentences carrying facts, not cut off at a fixed length."""
+        memory = ConversationMemory(token_budget=5, summary_budget=200)
+        memory.add_assistant_message(
+            "Let me check that for you right away, one moment please while I look it up. "
+            f"The balance of {ADDRESS} is 1.5 SOL. "
+            "Let me know if you need anything else at all, I am always happy to help you out!"
+        )
+        memory.add_user_message("thanks")
+        summary = memory.get_memory()[0]["content"]
+        self.assertIn(f"assistant: The balance of {ADDRESS} is 1.5 SOL.", summary)
+        self.assertNotIn("Let me", summary)
+
+    def test_latest_message_always_kept(self):
+        """A single oversized message is still kept verbatim."""
+        memory = ConversationMemory(token_budget=5, summary_budget=5)
+        memory.add_user_message("z" * 400)
+        self.assertEqual(memory.get_memory()[-1]["content"], "z" * 400)
+
+class TestSessionMemoryStore(unittest.TestCase):
+    """Test cases for session isolation and eviction."""
+
+    def test_sessions_are_isolated(self):
+        """Each session sees only its own messages."""
+        store = SessionMemoryStore()
+        store.get("a").add_user_message("hello from a")
+        store.get("b").add_user_message("hello from b")
+        self.assertEqual([m["content"] for m in store.get("a").get_memory()], ["hello from a"])
+
+    def test_requests_without_session_are_ephemeral(self):
+        """Requests without a session id get their own memory, which is not registered."""
+        store = SessionMemoryStore()
+        store.get(None).add_user_message("my secret address")
+        self.assertEqual(store.get(None).get_memory(), [])
+        self.assertIsNot(store.get(None), store.get(None))
+        self.assertEqual(store.stats()["sessions"], 0)
+
+    def test_idle_sessions_evicted(self):
+        """Sessions idle beyond the threshold are dropped."""
+        store = SessionMemoryStore(idle_seconds=0.05)
+        store.get("old").add_user_message("hi")
+        time.sleep(0.1)
+        store.get("new")
+        self.assertEqual(store.stats()["sessions"], 1)
+        self.assertEqual(store.get("old").get_memory(), [])
+
+    def test_process_caps(self):
+        """Session count and total tokens are capped with LRU eviction."""
+        store = SessionMemoryStore(max_sessions=3, max_total_tokens=10_000)
+        for index in range(5):
+            store.get(f"s{index}").add_user_message("hi")
+        self.assertEqual(store.stats()["sessions"], 3)
+
+        store = SessionMemoryStore(max_total_tokens=100)
+        for index in range(10):
+            store.get(f"s{index}").add_user_message("w" * 200)
+        store.get("last")
+        self.assertLessEqual(store.stats()["tokens"], 100)
+        self.assertGreater(store.stats()["evictions"], 0)
+
+    def test_running_token_total(self):
+        """The token total follows messages, evictions and clears without rescanning sessions."""
+        store = SessionMemoryStore(max_sessions=2)
+        first = store.get("a")
+        first.add_user_message("w" * 40)
+        store.get("b").add_user_message("w" * 80)
+        self.assertEqual(store.stats()["tokens"], 30)
+        store.get("c")
+        first.add_user_message("w" * 400)
+        self.assertEqual(store.stats()["tokens"], 20)
+        store.clear("b")
+        self.assertEqual(store.stats()["tokens"], 0)
+
+class TestPersistentMemory(unittest.TestCase):
+    """Test cases for the SQLite backend and the store's hot tier."""
+
+    def setUp(self):
+        """Use a fresh database file."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.url = "sqlite:///" + os.path.join(self.directory.name, "memory.db")
+        self.backends = []
+
+    def tearDown(self):
+        """Close the backends and remove the database."""
+        for backend in self.backends:
+            backend.close()
+        self.directory.cleanup()
+
+    def backend(self, **kwargs):
+        backend = SQLiteMemoryBackend(self.url, **kwargs)
+        self.backends.append(backend)
+        return backend
+
+    def test_sessions_survive_restart(self):
+        """A new store restores a session's recent window from disk."""
+        store = SessionMemoryStore(backend=self.backend(flush_interval=60), load_messages=4)
+        memory = store.get("wallet")
+        for index in range(10):
+            memory.add_user_message(f"question {index}")
+            memory.add_assistant_message(f"answer {index}")
+        store.close()
+
+        restarted = SessionMemoryStore(backend=self.backend(), load_messages=4)
+        messages = restarted.get("wallet").get_memory()
+        self.assertEqual([m["content"] for m in messages], ["question 8", "answer 8", "question 9", "answer 9"])
+        self.assertEqual(restarted.get("other").get_memory(), [])
+
+    def test_write_behind(self):
+        """Messages are written in batches in the background, or early once a batch fills."""
+        backend = self.backend(flush_interval=0.1, batch_size=1000)
+        store = SessionMemoryStore(backend=backend)
+        store.get("a").add_user_message("hello")
+        self.assertEqual(backend.stats()["pending"], 1)
+        self.assertEqual(backend.stats()["written"], 0)
+        time.sleep(0.4)
+        self.assertEqual(backend.stats()["written"], 1)
+
+        backend = self.backend(flush_interval=60, batch_size=5)
+        for index in range(5):
+            backend.append("b", "user", str(index))
+        deadline = time.monotonic() + 5
+        while backend.stats()["written"] < 5 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(backend.stats()["written"], 5)
+
+    def test_evicted_sessions_restored(self):
+        """Sessions dropped from the hot tier are read back, including unwritten messages."""
+        store = SessionMemoryStore(backend=self.backend(flush_interval=60), max_sessions=2)
+        for index in range(5):
+            store.get(f"s{index}").add_user_message(f"hello from s{index}")
+        self.assertEqual(store.stats()["sessions"], 2)
+        self.assertEqual(store.stats()["storage"]["written"], 0)
+        self.assertEqual([m["content"] for m in store.get("s0").get_memory()], ["hello from s0"])
+        self.assertGreater(store.stats()["storage"]["written"], 0)
+
+    def test_restored_messages_not_rewritten(self):
+        """Restoring a session does not store its messages a second time."""
+        backend = self.backend(flush_interval=60)
+        store = SessionMemoryStore(backend=backend, max_sessions=1)
+        store.get("a").add_user_message("first")
+        store.get("b")
+        store.get("a").add_user_message("second")
+        backend.flush()
+        self.assertEqual([m["content"] for m in backend.load("a", 10)], ["first", "second"])
+
+if __name__ == '__main__':
+    unittest.main()
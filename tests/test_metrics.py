@@ -0,0 +1,75 @@
+"""
+Tests for latency instrumentation and the metrics endpoint.
+"""
+import unittest
+from unittest.mock import patch, MagicMock
+from fastapi.testclient import TestClient
+from app.core.crew import BlockchainCrew
+from app.utils.cache import RPCCache
+from app.utils.metrics import Counter, Histogram, LLM_TOKENS, RPC_CALL_SECONDS, STAGE_SECONDS, span
+from app.utils.tools import call_rpc
+from main import app
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for metric types and exposition."""
+
+    def test_histogram_render(self):
+        """Buckets are cumulative and end with +Inf, sum and count."""
+        histogram = Histogram("test_seconds", "Test", ["stage"], buckets=(0.1, 1.0))
+        histogram.observe(0.05, stage="a")
+        histogram.observe(0.5, stage="a")
+        histogram.observe(5, stage="a")
+        lines = histogram.render()
+        self.assertIn('test_seconds_bucket{stage="a",le="0.1"} 1', lines)
+        self.assertIn('test_seconds_bucket{stage="a",le="1"} 2', lines)
+        self.assertIn('test_seconds_bucket{stage="a",le="+Inf"} 3', lines)
+        self.assertIn('test_seconds_count{stage="a"} 3', lines)
+
+    def test_counter_escapes_labels(self):
+        """Label values are escaped in the exposition format."""
+        counter = Counter("test_total", "Test", ["path"])
+        counter.inc(2, path='a"b')
+        self.assertIn('test_total{path="a\\"b"} 2', counter.render())
+
+    def test_span_observes_stage(self):
+        """Spans record their duration even when the block raises."""
+        before = STAGE_SECONDS.count(stage="test_stage")
+        with self.assertRaises(ValueError):
+            with span("test_stage"):
+                raise ValueError("boom")
+        self.assertEqual(STAGE_SECONDS.count(stage="test_stage"), before + 1)
+
+    @patch('app.utils.tools.rpc_cache', RPCCache(enabled=True))
+    @patch('app.utils.tools.rpc_router')
+    def test_rpc_calls_labelled_by_method_and_status(self, mock_router):
+        """RPC calls are timed by method and outcome, including cache hits."""
+        mock_router.call.return_value = {"jsonrpc": "2.0", "id": 1, "result": 5}
+        labels = {"method": "getBalance"}
+        before = {status: RPC_CALL_SECONDS.count(status=status, **labels) for status in ("ok", "cache_hit")}
+        data = {"jsonrpc": "2.0", "id": 1, "method": "getBalance", "params": ["metrics-address"]}
+        call_rpc(data)
+        call_rpc(data)
+        self.assertEqual(RPC_CALL_SECONDS.count(status="ok", **labels), before["ok"] + 1)
+        self.assertEqual(RPC_CALL_SECONDS.count(status="cache_hit", **labels), before["cache_hit"] + 1)
+
+    def test_kickoff_records_token_delta(self):
+        """Only the tokens used by this run of a pooled crew are counted."""
+        crew = MagicMock()
+        crew.calculate_usage_metrics.return_value = MagicMock(prompt_tokens=100, completion_tokens=10)
+        crew.kickoff.return_value = MagicMock(token_usage=MagicMock(prompt_tokens=150, completion_tokens=30))
+        before = LLM_TOKENS.value(stage="test_kickoff", kind="prompt")
+        BlockchainCrew.kickoff(crew, "test_kickoff", {})
+        self.assertEqual(LLM_TOKENS.value(stage="test_kickoff", kind="prompt"), before + 50)
+
+    def test_metrics_endpoint(self):
+        """The endpoint serves Prometheus text including request latency."""
+        client = TestClient(app)
+        client.get("/health")
+        response = client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain"))
+        self.assertIn('solana_assistant_http_request_seconds_count{path="/health",status="200"}', response.text)
+        self.assertIn("# TYPE solana_assistant_stage_seconds histogram", response.text)
+
+if __name__ == '__main__':
+    unittest.main()
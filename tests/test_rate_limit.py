@@ -0,0 +1,111 @@
+"""
+Tests for client-side rate limiting and priority scheduling.
+"""
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from app.services.executor import QueryExecutor
+from app.utils.rate_limit import (
+    RateLimiter,
+    RateLimitTimeout,
+    TokenBucket,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_BACKGROUND,
+    PRIORITY_BATCH,
+    request_context,
+    request_priority,
+    rpc_credits,
+)
+from app.utils.rpc_client import SolanaRPCClient
+from app.utils.rpc_router import RPCRouter
+from tests.stub_rpc import StubRPCServer
+from main import app
+
+def limiter(rate, capacity=1):
+    """Build a single-bucket limiter counting requests."""
+    return RateLimiter("test", [TokenBucket("requests", rate, capacity)], max_wait=5)
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for token buckets, deadlines and priorities."""
+
+    def test_waits_for_tokens(self):
+        """Calls beyond the burst are delayed until the bucket refills."""
+        bucket_limiter = limiter(rate=10)
+        self.assertEqual(bucket_limiter.acquire({"requests": 1}), 0.0)
+        waited = bucket_limiter.acquire({"requests": 1})
+        self.assertGreater(waited, 0.05)
+        self.assertEqual(bucket_limiter.stats()["waited"], 1)
+
+    def test_deadline_fails_fast(self):
+        """A caller whose turn would come after its deadline is rejected without waiting."""
+        bucket_limiter = limiter(rate=0.1)
+        bucket_limiter.acquire({"requests": 1})
+        start = time.perf_counter()
+        with self.assertRaises(RateLimitTimeout) as raised:
+            bucket_limiter.acquire({"requests": 1}, deadline=time.monotonic() + 1)
+        self.assertLess(time.perf_counter() - start, 0.1)
+        self.assertGreaterEqual(raised.exception.retry_after, 1)
+
+    def test_interactive_served_before_background(self):
+        """A later interactive caller overtakes a queued background caller."""
+        bucket_limiter = limiter(rate=5)
+        bucket_limiter.acquire({"requests": 1})
+        order = []
+
+        def worker(priority):
+            bucket_limiter.acquire({"requests": 1}, priority=priority)
+            order.append(priority)
+
+        background = threading.Thread(target=worker, args=(PRIORITY_BACKGROUND,))
+        background.start()
+        time.sleep(0.05)
+        interactive = threading.Thread(target=worker, args=(PRIORITY_INTERACTIVE,))
+        interactive.start()
+        background.join(timeout=5)
+        interactive.join(timeout=5)
+        self.assertEqual(order, [PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND])
+
+    def test_executor_keeps_request_context(self):
+        """Work submitted to the query executor sees the submitter's priority."""
+        executor = QueryExecutor(max_workers=1, queue_size=0)
+        with request_context(PRIORITY_BATCH, 5):
+            future = executor.submit(request_priority.get)
+        self.assertEqual(future.result(), PRIORITY_BATCH)
+        executor.shutdown()
+
+    def test_rpc_credits(self):
+        """RPC costs are weighted by method and summed over batches."""
+        self.assertEqual(rpc_credits({"method": "getBalance"}), {"credits": 1})
+        self.assertEqual(rpc_credits([{"method": "getProgramAccounts"}, {"method": "getHealth"}]), {"credits": 11})
+
+class TestRateLimitedCalls(unittest.TestCase):
+    """Test cases for limiter integration."""
+
+    def test_router_rejects_before_sending(self):
+        """An RPC call that cannot be admitted is never sent upstream."""
+        server = StubRPCServer().start()
+        client = SolanaRPCClient()
+        try:
+            credit_limiter = RateLimiter("rpc", [TokenBucket("credits", 0.1, 1)])
+            router = RPCRouter([server.url], client=client, limiter=credit_limiter)
+            router.call({"jsonrpc": "2.0", "id": 1, "method": "getHealth"})
+            with request_context(PRIORITY_INTERACTIVE, 1):
+                with self.assertRaises(RateLimitTimeout):
+                    router.call({"jsonrpc": "2.0", "id": 2, "method": "getHealth"})
+            self.assertEqual(len(server.requests), 1)
+        finally:
+            client.close()
+            server.stop()
+
+    @patch('app.api.routes.get_blockchain_service')
+    def test_query_returns_retry_after(self, mock_get_service):
+        """Rate limit rejections surface as 503 with Retry-After rather than as an answer."""
+        mock_get_service.return_value.process_query.side_effect = RateLimitTimeout("llm", 7)
+        response = TestClient(app).post("/query", json={"query": "hi"})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "7")
+
+if __name__ == '__main__':
+    unittest.main()
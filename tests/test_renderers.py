@@ -0,0 +1,72 @@
+"""
+Tests for the deterministic result renderers.
+"""
+import unittest
+from app.core.renderers import RENDERERS, render_result
+from app.data.task_params import TASK_PARAMS_MAP
+from app.utils.templates import build_task_data
+
+ADDRESS = "dv1ZAGvdsz5hHLwWXsVnM94hWf1pjbKVau1QVkaMJ92"
+
+def ok(result):
+    """Wrap a result in a JSON-RPC success envelope."""
+    return {"jsonrpc": "2.0", "id": 1, "result": result}
+
+class TestRenderers(unittest.TestCase):
+    """Test cases for rendering RPC responses."""
+
+    def test_every_task_has_renderer(self):
+        """All templated tasks can be rendered without the LLM."""
+        self.assertEqual(set(TASK_PARAMS_MAP) - set(RENDERERS), set())
+
+    def test_balance_in_sol(self):
+        """Lamports are converted to SOL exactly."""
+        data = build_task_data("getBalance", {"address": ADDRESS})
+        text = render_result("getBalance", data, ok({"context": {"slot": 1}, "value": 2500000000}))
+        self.assertIn("2.5 SOL", text)
+        self.assertIn(ADDRESS, text)
+
+    def test_multiple_balances(self):
+        """Several balances are listed with their total; missing accounts hold nothing."""
+        other = "4Nd1mBQtrMJVYVfKf2PJy9NZUZdTAsp7D4xWLs4gDB4T"
+        data = build_task_data("getMultipleBalances", {"addresses": [ADDRESS, other]})
+        result = {"context": {"slot": 1}, "value": [{"lamports": 1500000000, "owner": "a"}, None]}
+        text = render_result("getMultipleBalances", data, ok(result))
+        self.assertIn("The 2 addresses hold 1.5 SOL in total", text)
+        self.assertIn(f"- {ADDRESS}: 1.5 SOL", text)
+        self.assertIn(f"- {other}: 0 SOL (no account)", text)
+
+    def test_supply(self):
+        """Supply figures are rendered in SOL."""
+        result = {"context": {"slot": 1}, "value": {
+            "total": 580000000000000000, "circulating": 480000000000000000,
+            "nonCirculating": 100000000000000000, "nonCirculatingAccounts": []}}
+        text = render_result("getSupply", TASK_PARAMS_MAP["getSupply"]["data"], ok(result))
+        self.assertIn("580,000,000 SOL", text)
+        self.assertIn("100,000,000 SOL is non-circulating", text)
+
+    def test_inflation_rate(self):
+        """Inflation rates are rendered as percentages."""
+        result = {"epoch": 500, "foundation": 0.0, "total": 0.0512, "validator": 0.0512}
+        text = render_result("getInflationRate", {}, ok(result))
+        self.assertIn("5.1200%", text)
+        self.assertIn("epoch 500", text)
+
+    def test_token_supply(self):
+        """Token amounts use uiAmountString and decimals."""
+        data = build_task_data("getTokenSupply", {"address": ADDRESS})
+        result = {"context": {"slot": 1}, "value": {"amount": "1000000", "decimals": 2,
+                                                    "uiAmount": 10000.0, "uiAmountString": "10000"}}
+        text = render_result("getTokenSupply", data, ok(result))
+        self.assertIn("10000 tokens", text)
+        self.assertIn("2 decimals", text)
+
+    def test_rpc_error(self):
+        """JSON-RPC and transport errors are rendered as messages."""
+        text = render_result("getBalance", {}, {"error": {"code": -32602, "message": "Invalid param"}})
+        self.assertIn("Invalid param", text)
+        text = render_result("getBalance", {}, {"error": "API call failed with status code 429"})
+        self.assertIn("429", text)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Tests for the deterministic intent router.
+"""
+import unittest
+from app.core.router import IntentRouter
+from app.utils.solana import b58encode, b58decode, is_pubkey, is_signature, TOKEN_PROGRAM_ID
+
+ADDRESS = "dv1ZAGvdsz5hHLwWXsVnM94hWf1pjbKVau1QVkaMJ92"
+OTHER_ADDRESS = b58encode(bytes(range(1, 33)))
+SIGNATURE = b58encode(bytes(range(100, 164)))
+
+class TestBase58(unittest.TestCase):
+    """Test cases for base58 validation helpers."""
+
+    def test_round_trip(self):
+        """Encoding and decoding are inverse operations, including leading zeros."""
+        data = b"\x00\x00" + bytes(range(30))
+        self.assertEqual(b58decode(b58encode(data)), data)
+        self.assertTrue(b58encode(data).startswith("11"))
+
+    def test_validation(self):
+        """Pubkeys and signatures are recognised by decoded length."""
+        self.assertTrue(is_pubkey(ADDRESS))
+        self.assertTrue(is_signature(SIGNATURE))
+        self.assertFalse(is_pubkey(SIGNATURE))
+        self.assertFalse(is_pubkey("0OIl" * 10))
+
+class TestIntentRouter(unittest.TestCase):
+    """Test cases for the rule-based router."""
+
+    def setUp(self):
+        """Create a router."""
+        self.router = IntentRouter()
+
+    def test_balance(self):
+        """A balance query with one address routes to getBalance."""
+        result = self.router.route(f"What is the balance of {ADDRESS}?")
+        self.assertEqual(result.task, "getBalance")
+        self.assertEqual(result.data["method"], "getBalance")
+        self.assertEqual(result.data["params"], [ADDRESS])
+
+    def test_health_without_input(self):
+        """Input-free tasks route when no address is present."""
+        self.assertEqual(self.router.route("Is the network healthy?").task, "getHealth")
+        self.assertEqual(self.router.route("current inflation rate").task, "getInflationRate")
+        self.assertEqual(self.router.route("what's the total supply of SOL").task, "getSupply")
+
+    def test_supply_with_mint_is_token_supply(self):
+        """An address turns a supply query into getTokenSupply."""
+        self.assertEqual(self.router.route(f"supply of {ADDRESS}").task, "getTokenSupply")
+
+    def test_signature(self):
+        """88-char signatures route to transaction lookup."""
+        result = self.router.route(f"show me transaction {SIGNATURE}")
+        self.assertEqual(result.task, "getTransactionDetails")
+        self.assertEqual(result.data["params"][0], SIGNATURE)
+
+    def test_airdrop_amount_conversion(self):
+        """Airdrop amounts in SOL are converted to integer lamports."""
+        [(task, _, values)] = self.router.candidates(f"airdrop 1.5 SOL to {ADDRESS}")
+        self.assertEqual((task, values), ("requestAirdrop", {"address": ADDRESS, "amount": 1_500_000_000}))
+        [(_, _, values)] = self.router.candidates(f"airdrop 1.1 SOL to {ADDRESS}")
+        self.assertEqual(values["amount"], 1_100_000_000)
+
+    def test_airdrop_without_unit_falls_back(self):
+        """Amounts without a unit are left to the LLM."""
+        self.assertEqual(self.router.candidates(f"airdrop 2 to {ADDRESS}"), [])
+
+    def test_mutating_methods_left_to_llm(self):
+        """Airdrops are never fast-pathed, negated or not."""
+        self.assertIsNone(self.router.route(f"airdrop 1 SOL to {ADDRESS}"))
+        self.assertIsNone(self.router.route(f"do not airdrop 1 SOL to {ADDRESS}"))
+
+    def test_token_accounts_default_program(self):
+        """Owner token account queries default to the SPL Token program."""
+        result = self.router.route(f"list token accounts owned by {ADDRESS}")
+        self.assertEqual(result.task, "getTokenAccountsByOwner")
+        self.assertEqual(result.data["params"][1], {"programId": TOKEN_PROGRAM_ID})
+
+    def test_explicit_method_name(self):
+        """Naming the RPC method routes to it."""
+        self.assertEqual(self.router.route(f"getAccountInfo {ADDRESS}").task, "getAccountInfo")
+
+    def test_multiple_balances(self):
+        """Balance queries naming several addresses fetch them in one request."""
+        result = self.router.route(f"balances of {ADDRESS}, {OTHER_ADDRESS} and {ADDRESS}")
+        self.assertEqual(result.task, "getMultipleBalances")
+        self.assertEqual(result.data["method"], "getMultipleAccounts")
+        self.assertEqual(result.data["params"][0], [ADDRESS, OTHER_ADDRESS])
+        self.assertEqual(self.router.route(f"balance of {ADDRESS}").task, "getBalance")
+        result = self.router.route(f"balance of {ADDRESS} {ADDRESS}")
+        self.assertEqual((result.task, result.data["params"]), ("getBalance", [ADDRESS]))
+
+    def test_ambiguous_falls_back(self):
+        """Conversational, explanatory or multi-address queries return None."""
+        self.assertIsNone(self.router.route("hello there"))
+        self.assertIsNone(self.router.route("explain how the inflation rate works"))
+        self.assertIsNone(self.router.route(f"account info of {ADDRESS} and {OTHER_ADDRESS}"))
+        self.assertIsNone(self.router.route("what is my balance?"))
+
+if __name__ == '__main__':
+    unittest.main()
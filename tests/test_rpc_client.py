@@ -0,0 +1,66 @@
+"""
+Tests for the pooled JSON-RPC client.
+"""
+import asyncio
+import unittest
+from app.utils.rpc_client import SolanaRPCClient, RPCClientError
+from tests.stub_rpc import StubRPCServer
+
+class TestSolanaRPCClient(unittest.TestCase):
+    """Test cases for the RPC client."""
+
+    def setUp(self):
+        """Start a stub server and point a client at it."""
+        self.server = StubRPCServer().start()
+        self.client = SolanaRPCClient(url=self.server.url)
+
+    def tearDown(self):
+        """Close the client and stop the server."""
+        self.client.close()
+        self.server.stop()
+
+    def test_call_reuses_connection(self):
+        """Sequential calls share one keep-alive connection."""
+        for _ in range(5):
+            result = self.client.call({"jsonrpc": "2.0", "id": 1, "method": "getHealth"})
+            self.assertEqual(result["result"], "getHealth")
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(len(self.server.requests), 5)
+
+    def test_acall(self):
+        """The async entry point returns the decoded response."""
+        async def run():
+            try:
+                return await self.client.acall({"jsonrpc": "2.0", "id": 7, "method": "getSupply"})
+            finally:
+                await self.client.aclose()
+
+        result = asyncio.run(run())
+        self.assertEqual(result, {"jsonrpc": "2.0", "id": 7, "result": "getSupply"})
+
+    def test_batch_payload(self):
+        """A batch array is sent as one request."""
+        result = self.client.call([
+            {"jsonrpc": "2.0", "id": 1, "method": "getHealth"},
+            {"jsonrpc": "2.0", "id": 2, "method": "getSupply"},
+        ])
+        self.assertEqual([item["result"] for item in result], ["getHealth", "getSupply"])
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_http_error_status(self):
+        """Non-200 responses raise RPCClientError with the status code."""
+        self.server.status_code = 429
+        with self.assertRaises(RPCClientError) as ctx:
+            self.client.call({"jsonrpc": "2.0", "id": 1, "method": "getHealth"})
+        self.assertEqual(ctx.exception.status_code, 429)
+
+    def test_connection_error(self):
+        """Connection failures are surfaced as RPCClientError."""
+        self.server.stop()
+        client = SolanaRPCClient(url=self.server.url, connect_timeout=0.5)
+        with self.assertRaises(RPCClientError):
+            client.call({"jsonrpc": "2.0", "id": 1, "method": "getHealth"})
+        client.close()
+
+if __name__ == '__main__':
+    unittest.main()
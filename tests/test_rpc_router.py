@@ -0,0 +1,94 @@
+"""
+Tests for multi-endpoint RPC routing and hedging.
+"""
+import time
+import unittest
+from app.utils.rpc_client import SolanaRPCClient, RPCClientError
+from app.utils.rpc_router import EndpointHealth, RPCRouter, is_read_only
+from tests.stub_rpc import StubRPCServer
+
+HEALTH = {"jsonrpc": "2.0", "id": 1, "method": "getHealth"}
+AIRDROP = {"jsonrpc": "2.0", "id": 1, "method": "requestAirdrop", "params": ["address", 1000000000]}
+
+class TestRPCRouter(unittest.TestCase):
+    """Test cases for endpoint selection, failover and hedging."""
+
+    def setUp(self):
+        """Start a slow and a fast stub endpoint."""
+        self.slow = StubRPCServer(latency=0.3).start()
+        self.fast = StubRPCServer(latency=0.01).start()
+        self.client = SolanaRPCClient()
+
+    def tearDown(self):
+        """Close the client and stop the servers."""
+        self.client.close()
+        self.slow.stop()
+        self.fast.stop()
+
+    def test_prefers_fastest_endpoint(self):
+        """Once both endpoints are measured, calls go to the faster one."""
+        router = RPCRouter([self.slow.url, self.fast.url], client=self.client, hedging=False)
+        for _ in range(6):
+            self.assertEqual(router.call(HEALTH)["result"], "getHealth")
+        # Each endpoint is probed once, then only the fast one is used
+        self.assertEqual(len(self.slow.requests), 1)
+        self.assertEqual(len(self.fast.requests), 5)
+
+    def test_failover_and_benching(self):
+        """Read-only calls fail over, and a failing endpoint is benched."""
+        broken = StubRPCServer(status_code=503).start()
+        try:
+            router = RPCRouter([broken.url, self.fast.url], client=self.client, hedging=False, max_failures=1)
+            for _ in range(4):
+                self.assertEqual(router.call(HEALTH)["result"], "getHealth")
+            stats = router.stats()["endpoints"]
+            self.assertFalse(stats[0]["healthy"])
+            self.assertEqual(len(broken.requests), 1)
+        finally:
+            broken.stop()
+
+    def test_hedged_request_wins(self):
+        """A slow primary is raced by a hedged call to the next endpoint."""
+        router = RPCRouter([self.slow.url, self.fast.url], client=self.client, hedging=True,
+                           hedge_min_delay=0.02, hedge_max_delay=0.05)
+        start = time.perf_counter()
+        self.assertEqual(router.call(HEALTH)["result"], "getHealth")
+        self.assertLess(time.perf_counter() - start, 0.25)
+        self.assertEqual(router.stats()["hedged_calls"], 1)
+        self.assertEqual(len(self.fast.requests), 1)
+        router.shutdown()
+
+    def test_airdrop_never_hedged_or_retried(self):
+        """Mutating calls go to exactly one endpoint once, even when slow or failing."""
+        router = RPCRouter([self.slow.url, self.fast.url], client=self.client, hedging=True,
+                           hedge_min_delay=0.01, hedge_max_delay=0.01)
+        router.call(AIRDROP)
+        self.assertEqual(len(self.slow.requests) + len(self.fast.requests), 1)
+
+        self.slow.status_code = 500
+        self.fast.status_code = 500
+        with self.assertRaises(RPCClientError):
+            router.call(AIRDROP)
+        self.assertEqual(len(self.slow.requests) + len(self.fast.requests), 2)
+
+    def test_is_read_only(self):
+        """Batches are read-only only if every request is."""
+        self.assertTrue(is_read_only([HEALTH, HEALTH]))
+        self.assertFalse(is_read_only([HEALTH, AIRDROP]))
+        self.assertFalse(is_read_only(AIRDROP))
+
+class TestEndpointHealth(unittest.TestCase):
+    """Test cases for endpoint scoring."""
+
+    def test_fast_failures_rank_last(self):
+        """An endpoint failing fast on 44% of calls ranks behind a healthy slower one."""
+        flaky, healthy = EndpointHealth("flaky"), EndpointHealth("healthy")
+        for index in range(25):
+            flaky.record(0.001 if index < 11 else 0.03, index >= 11, max_failures=100, cooldown=0)
+            healthy.record(0.2, True, max_failures=100, cooldown=0)
+        self.assertEqual(flaky.latency(0.5), 0.03)
+        self.assertGreater(flaky.score(), healthy.score())
+        self.assertAlmostEqual(healthy.score(), 0.2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,210 @@
+"""
+Tests for the state shared between worker processes.
+"""
+import os
+import socket
+import tempfile
+import time
+import unittest
+from app.core.memory import SessionMemoryStore, check_shared_memory
+from app.core.memory_backends import SQLiteMemoryBackend
+from app.utils.cache import RPCCache
+from app.utils.shared_state import RedisState, SharedState, SharedStateError, SQLiteState, create_shared_state
+from tests.stub_redis import StubRedisServer
+
+def request(method, params=None, request_id=1):
+    """Build a JSON-RPC request."""
+    return {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or []}
+
+def free_port():
+    """A local port nothing listens on."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+class SharedStateContract:
+    """Behaviour every shared state implementation provides."""
+
+    def test_get_set_delete(self):
+        """Values are stored, replaced and removed."""
+        self.assertIsNone(self.state.get("missing"))
+        self.state.set("key", b"one")
+        self.state.set("key", b"two")
+        self.assertEqual(self.state.get("key"), b"two")
+        self.state.delete("key")
+        self.assertIsNone(self.state.get("key"))
+
+    def test_ttl(self):
+        """Values with a TTL expire."""
+        self.state.set("short", b"value", ttl=0.001)
+        self.state.set("long", b"value", ttl=60)
+        self.expire()
+        self.assertIsNone(self.state.get("short"))
+        self.assertEqual(self.state.get("long"), b"value")
+
+    def test_incr(self):
+        """Counters start from zero and read back as their value."""
+        self.assertEqual(self.state.incr("counter"), 1)
+        self.assertEqual(self.state.incr("counter"), 2)
+        self.assertEqual(int(self.state.get("counter")), 2)
+
+class TestSQLiteState(SharedStateContract, unittest.TestCase):
+    """Test cases for the SQLite shared state."""
+
+    def setUp(self):
+        """Use a fresh state file and a controllable clock."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.now = 1000.0
+        self.state = SQLiteState(os.path.join(self.directory.name, "state.db"), clock=lambda: self.now)
+
+    def tearDown(self):
+        """Close and remove the state file."""
+        self.state.close()
+        self.directory.cleanup()
+
+    def expire(self):
+        self.now += 1
+
+    def test_shared_between_connections(self):
+        """Two instances on the same file see each other's writes."""
+        other = SQLiteState(self.state.path, clock=lambda: self.now)
+        self.addCleanup(other.close)
+        self.state.set("key", b"value")
+        self.assertEqual(other.get("key"), b"value")
+        self.assertEqual(other.incr("counter"), 1)
+        self.assertEqual(self.state.incr("counter"), 2)
+
+class TestRedisState(SharedStateContract, unittest.TestCase):
+    """Test cases for the Redis-protocol shared state."""
+
+    def setUp(self):
+        """Start a Redis stub requiring a password."""
+        self.server = StubRedisServer(password="secret").start()
+        self.state = RedisState(self.server.url)
+
+    def tearDown(self):
+        """Close the client and stop the stub."""
+        self.state.close()
+        self.server.stop()
+
+    def expire(self):
+        time.sleep(0.01)
+
+    def test_authenticates_and_selects_database(self):
+        """The client authenticates and selects the database of the URL on connect."""
+        self.state.set("key", b"value")
+        self.assertEqual([args[0] for args in self.server.commands[:3]], [b"AUTH", b"SELECT", b"SET"])
+        self.assertEqual(self.server.commands[1], [b"SELECT", b"1"])
+
+    def test_unreachable_server(self):
+        """An unreachable server raises SharedStateError and is counted."""
+        state = RedisState(f"redis://127.0.0.1:{free_port()}/0", timeout=0.5)
+        with self.assertRaises(SharedStateError):
+            state.get("key")
+        self.assertEqual(state.stats()["errors"], 1)
+
+    def test_reconnects_after_drop(self):
+        """A lost connection is reopened once transparently."""
+        self.state.set("key", b"value")
+        self.server.drop_connections()
+        self.assertEqual(self.state.get("key"), b"value")
+        self.assertEqual([args[0] for args in self.server.commands].count(b"AUTH"), 2)
+
+    def test_lost_incr_reply_not_retried(self):
+        """INCR is not sent again once it may have been applied, but is after an idle drop."""
+        self.assertEqual(self.state.incr("counter"), 1)
+        self.server.drop_connections()
+        time.sleep(0.05)
+        self.assertEqual(self.state.incr("counter"), 2)
+
+        self.server.unanswered.add(b"INCR")
+        with self.assertRaises(SharedStateError):
+            self.state.incr("counter")
+        self.server.unanswered.clear()
+        self.assertEqual(self.state.get("counter"), b"3")
+        self.assertEqual(self.state.stats()["errors"], 1)
+
+class TestCreateSharedState(unittest.TestCase):
+    """Test cases for selecting the shared state."""
+
+    def test_backends(self):
+        """"local" keeps state in the process; unknown names are rejected."""
+        self.assertIsNone(create_shared_state("local"))
+        self.assertIsInstance(create_shared_state("redis", "redis://127.0.0.1:1/0"), RedisState)
+        with self.assertRaises(ValueError):
+            create_shared_state("memcached")
+
+    def test_interface_is_abstract(self):
+        """The shared state interface cannot be instantiated."""
+        with self.assertRaises(TypeError):
+            SharedState()
+
+    def test_redis_requires_shared_memory_database(self):
+        """Sessions shared across hosts cannot be stored in a host-local SQLite file."""
+        with self.assertRaises(ValueError):
+            check_shared_memory("redis", "sqlite", "sqlite:///conversations.db")
+        check_shared_memory("redis", "sqlite", "postgresql://db.internal/conversations")
+        check_shared_memory("sqlite", "sqlite", "sqlite:///conversations.db")
+        check_shared_memory("redis", "memory", "sqlite:///conversations.db")
+
+class TestSharedWorkers(unittest.TestCase):
+    """Test cases for two workers coordinating through shared state."""
+
+    def setUp(self):
+        """Create a shared state and database file."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.state = SQLiteState(os.path.join(self.directory.name, "state.db"))
+        self.url = "sqlite:///" + os.path.join(self.directory.name, "memory.db")
+        self.backends = []
+
+    def tearDown(self):
+        """Close everything and remove the files."""
+        for backend in self.backends:
+            backend.close()
+        self.state.close()
+        self.directory.cleanup()
+
+    def store(self):
+        backend = SQLiteMemoryBackend(self.url, flush_interval=60)
+        self.backends.append(backend)
+        return SessionMemoryStore(backend=backend, shared=self.state)
+
+    def test_cache_shared_between_workers(self):
+        """A response fetched by one worker is a hit for the other."""
+        first, second = RPCCache(enabled=True, shared=self.state), RPCCache(enabled=True, shared=self.state)
+        response = {"jsonrpc": "2.0", "id": 1, "result": {"context": {"slot": 5}, "value": 42}}
+        self.assertTrue(first.set(request("getSupply"), response))
+        self.assertEqual(second.get(request("getSupply", request_id=9)), dict(response, id=9))
+        self.assertEqual(second.get(request("getSupply")), response)
+        stats = second.stats()
+        self.assertEqual((stats["shared_hits"], stats["hits"], stats["misses"]), (1, 1, 0))
+
+    def test_short_lived_responses_stay_local(self):
+        """Responses fresher than the shared minimum TTL are not shared."""
+        first = RPCCache(enabled=True, shared=self.state, shared_min_ttl=5)
+        second = RPCCache(enabled=True, shared=self.state, shared_min_ttl=5)
+        first.set(request("getBalance", ["address"]), {"jsonrpc": "2.0", "id": 1, "result": {"value": 1}})
+        self.assertIsNone(second.get(request("getBalance", ["address"])))
+
+    def test_sessions_shared_between_workers(self):
+        """Each worker sees the other's messages as soon as they are added."""
+        worker_a, worker_b = self.store(), self.store()
+        worker_a.get("wallet").add_user_message("question 1")
+        worker_a.get("wallet").add_assistant_message("answer 1")
+        self.assertEqual(len(worker_b.get("wallet").get_memory()), 2)
+
+        worker_b.get("wallet").add_user_message("question 2")
+        worker_a.get("wallet").add_user_message("question 3")
+        for worker in (worker_a, worker_b):
+            messages = [m["content"] for m in worker.get("wallet").get_memory()]
+            self.assertEqual(messages, ["question 1", "answer 1", "question 2", "question 3"])
+
+    def test_unchanged_session_served_from_memory(self):
+        """A worker's own writes keep its copy current, so it is not reloaded."""
+        worker = self.store()
+        memory = worker.get("wallet")
+        memory.add_user_message("hello")
+        self.assertIs(worker.get("wallet"), memory)
+
+if __name__ == '__main__':
+    unittest.main()
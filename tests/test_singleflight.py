@@ -0,0 +1,77 @@
+"""
+Tests for single-flight call coalescing.
+"""
+import threading
+import time
+import unittest
+from app.utils.singleflight import SingleFlight
+from app.utils.text import normalize_query
+
+ADDRESS = "dv1ZAGvdsz5hHLwWXsVnM94hWf1pjbKVau1QVkaMJ92"
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for SingleFlight."""
+
+    def run_concurrently(self, count, target):
+        """Start count threads running target and wait for them."""
+        threads = [threading.Thread(target=target) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+    def test_concurrent_callers_share_one_call(self):
+        """Only one execution happens for concurrent identical keys."""
+        flight = SingleFlight("test")
+        calls = []
+        results = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.2)
+            return "value"
+
+        self.run_concurrently(10, lambda: results.append(flight.do("key", slow)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([value for value, _ in results], ["value"] * 10)
+        self.assertEqual(sum(shared for _, shared in results), 9)
+        self.assertEqual(flight.stats(), {"executions": 1, "coalesced": 9, "in_flight": 0})
+
+    def test_exception_is_shared(self):
+        """Waiters receive the leader's exception."""
+        flight = SingleFlight("test")
+        errors = []
+
+        def failing():
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        def call():
+            try:
+                flight.do("key", failing)
+            except ValueError as e:
+                errors.append(str(e))
+
+        self.run_concurrently(3, call)
+        self.assertEqual(errors, ["boom"] * 3)
+
+    def test_sequential_calls_are_not_coalesced(self):
+        """Completed keys are released for later callers."""
+        flight = SingleFlight("test")
+        flight.do("key", lambda: 1)
+        value, shared = flight.do("key", lambda: 2)
+        self.assertEqual((value, shared), (2, False))
+
+class TestNormalizeQuery(unittest.TestCase):
+    """Test cases for query normalization."""
+
+    def test_normalization_keeps_addresses(self):
+        """Case and spacing are normalized but base58 values are preserved."""
+        self.assertEqual(
+            normalize_query(f"  What is the  Balance of {ADDRESS}? "),
+            f"what is the balance of {ADDRESS}"
+        )
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Tests for lazy service initialization and readiness.
+"""
+import subprocess
+import sys
+import unittest
+from unittest.mock import patch, MagicMock
+from fastapi.testclient import TestClient
+import app.services.blockchain as blockchain
+from main import app
+
+class TestStartup(unittest.TestCase):
+    """Test cases for deferred imports, liveness and readiness."""
+
+    def setUp(self):
+        """Start every test with an unbuilt service."""
+        blockchain._service = None
+        blockchain._service_error = None
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        """Drop any service built by a test."""
+        blockchain._service = None
+        blockchain._service_error = None
+
+    def test_import_does_not_load_crewai(self):
+        """Importing the app leaves crewai and litellm unloaded."""
+        code = "import sys, main; print('crewai' in sys.modules or 'litellm' in sys.modules)"
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(output.stdout.strip(), "False")
+
+    def test_health_before_ready(self):
+        """Liveness answers immediately while readiness reports 503."""
+        self.assertEqual(self.client.get("/health").status_code, 200)
+        response = self.client.get("/ready")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["status"], "not_started")
+
+    @patch('app.services.blockchain.BlockchainService')
+    def test_lazy_initialization(self, mock_service_class):
+        """The service is built once, on first use, and then reported ready."""
+        mock_service_class.return_value = MagicMock()
+        first = blockchain.get_blockchain_service()
+        second = blockchain.get_blockchain_service()
+        self.assertIs(first, second)
+        mock_service_class.assert_called_once_with()
+        self.assertEqual(self.client.get("/ready").status_code, 200)
+
+    @patch('app.services.blockchain.BlockchainService', side_effect=RuntimeError("missing key"))
+    def test_failed_initialization(self, mock_service_class):
+        """A failed build is reported by the readiness endpoint and retried later."""
+        with self.assertRaises(RuntimeError):
+            blockchain.get_blockchain_service()
+        status = self.client.get("/ready").json()
+        self.assertEqual(status["status"], "failed")
+        self.assertEqual(status["error"], "missing key")
+
+        mock_service_class.side_effect = None
+        mock_service_class.return_value = MagicMock()
+        self.assertIsNotNone(blockchain.get_blockchain_service())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"""
+Tests for the streaming query endpoint.
+"""
+import asyncio
+import unittest
+from unittest.mock import patch, MagicMock
+from fastapi.testclient import TestClient
+from app.core.crew import BlockchainCrew
+from app.services.executor import QueryExecutor
+from main import app
+
+ADDRESS = "dv1ZAGvdsz5hHLwWXsVnM94hWf1pjbKVau1QVkaMJ92"
+BALANCE_RESPONSE = {"jsonrpc": "2.0", "id": 1, "result": {"context": {"slot": 1}, "value": 1500000000}}
+
+def parse_sse(text):
+    """Split an event stream into (event, data) pairs."""
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], lines["data"]))
+    return events
+
+class TestStreamQuery(unittest.TestCase):
+    """Test cases for staged query events."""
+
+    @patch('app.core.crew.Crew')
+    def setUp(self, mock_crew_class):
+        """Build a crew with a mocked task identifier."""
+        self.crew = BlockchainCrew(MagicMock(), MagicMock(), MagicMock(), {"getBalance": MagicMock()})
+
+    @patch('app.core.crew.call_rpc', return_value=BALANCE_RESPONSE)
+    def test_rendered_events(self, mock_call_rpc):
+        """Task, RPC result, tokens and the final payload are emitted in order."""
+        events = list(self.crew.stream_query(f"balance of {ADDRESS}", session_id="stream-rendered"))
+        names = [name for name, _ in events]
+
+        self.assertEqual(names[:2], ["task", "rpc_result"])
+        self.assertEqual(events[0][1]["task"], "getBalance")
+        self.assertEqual(events[1][1], BALANCE_RESPONSE)
+        self.assertEqual(names[-1], "final")
+        tokens = "".join(payload for name, payload in events if name == "token")
+        self.assertEqual(tokens, events[-1][1]["response"])
+        self.assertIn("1.5 SOL", tokens)
+
+    @patch('app.core.crew.LLM_RENDERING', True)
+    @patch('app.core.crew.stream_completion', return_value=iter(["You have ", "1.5 SOL."]))
+    @patch('app.core.crew.call_rpc', return_value=BALANCE_RESPONSE)
+    def test_llm_tokens(self, mock_call_rpc, mock_stream_completion):
+        """With LLM rendering the answer is streamed from the LLM's deltas."""
+        events = list(self.crew.stream_query(f"balance of {ADDRESS}", session_id="stream-llm"))
+        self.assertEqual([payload for name, payload in events if name == "token"], ["You have ", "1.5 SOL."])
+        self.assertEqual(events[-1][1]["response"], "You have 1.5 SOL.")
+        self.assertIn("Result:", mock_stream_completion.call_args[0][1][1]["content"])
+
+class TestStreamEndpoint(unittest.TestCase):
+    """Test cases for the server-sent events endpoint."""
+
+    @patch('app.api.routes.get_blockchain_service')
+    def test_sse_response(self, mock_get_service):
+        """Events are encoded as SSE and the final event matches QueryResponse."""
+        mock_get_service.return_value.stream_query.return_value = iter([
+            ("task", {"task": "getHealth", "data": {"method": "getHealth"}}),
+            ("rpc_result", {"result": "ok"}),
+            ("token", "Healthy"),
+            ("final", {"response": "Healthy", "task_executed": "getHealth", "data_used": {"method": "getHealth"}}),
+        ])
+        response = TestClient(app).post("/query/stream", json={"query": "is the network healthy?"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/event-stream"))
+        events = parse_sse(response.text)
+        self.assertEqual([name for name, _ in events], ["task", "rpc_result", "token", "final"])
+        self.assertEqual(events[2][1], '{"text":"Healthy"}')
+        self.assertIn('"task_executed":"getHealth"', events[3][1])
+
+    def test_executor_stream_relays_errors(self):
+        """Items produced before a failure are delivered, then the error is raised."""
+        def produce():
+            yield 1
+            raise ValueError("boom")
+
+        async def consume():
+            items = []
+            with self.assertRaises(ValueError):
+                async for item in executor.stream(produce):
+                    items.append(item)
+            return items
+
+        executor = QueryExecutor(max_workers=1, queue_size=0)
+        self.assertEqual(asyncio.run(consume()), [1])
+        executor.shutdown()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Tests for the RPC tool helpers.
+"""
+import threading
+import unittest
+from unittest.mock import patch
+from app.utils.cache import RPCCache
+from app.utils.rpc_client import SolanaRPCClient
+from app.utils.rpc_router import RPCRouter
+from app.utils.tools import call_rpc, call_rpc_batch
+from tests.stub_rpc import StubRPCServer
+
+def echo_params(request):
+    """Answer with the request's params, or an error for unknown methods."""
+    if request["method"] == "bad":
+        return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32601, "message": "Method not found"}}
+    if request["method"] == "getMultipleAccounts":
+        accounts = [{"lamports": int(address), "owner": "a", "data": ["", "base64"]} for address in request["params"][0]]
+        return {"jsonrpc": "2.0", "id": request["id"], "result": {"context": {"slot": len(accounts)}, "value": accounts}}
+    return {"jsonrpc": "2.0", "id": request["id"], "result": request.get("params")}
+
+class TestRPCTools(unittest.TestCase):
+    """Test cases for call_rpc and call_rpc_batch."""
+
+    def setUp(self):
+        """Point the tools at a stub server with an empty cache."""
+        self.server = StubRPCServer(echo_params).start()
+        self.client = SolanaRPCClient(url=self.server.url)
+        self.cache = RPCCache(enabled=True)
+        self.patches = [
+            patch("app.utils.tools.rpc_router", RPCRouter([self.server.url], client=self.client)),
+            patch("app.utils.tools.rpc_cache", self.cache),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        """Undo patches and stop the server."""
+        for p in self.patches:
+            p.stop()
+        self.client.close()
+        self.server.stop()
+
+    def test_call_rpc_uses_cache(self):
+        """Repeated cacheable calls reach the provider once."""
+        data = {"jsonrpc": "2.0", "id": 1, "method": "getBalance", "params": ["a"]}
+        self.assertEqual(call_rpc(data)["result"], ["a"])
+        self.assertEqual(call_rpc(dict(data, id=2))["id"], 2)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_call_rpc_coalesces_concurrent_requests(self):
+        """Concurrent identical requests share one upstream call."""
+        self.server.latency = 0.2
+        results = []
+        threads = [
+            threading.Thread(target=lambda i=i: results.append(
+                call_rpc({"jsonrpc": "2.0", "id": i, "method": "getTokenSupply", "params": ["mint"]})))
+            for i in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(sorted(r["id"] for r in results), [0, 1, 2, 3, 4])
+
+    def test_call_rpc_transport_error(self):
+        """Transport failures are returned as error dicts."""
+        self.server.status_code = 500
+        result = call_rpc({"jsonrpc": "2.0", "id": 1, "method": "getHealth"})
+        self.assertIn("500", result["error"])
+
+    def test_batch_dedupes_and_preserves_order(self):
+        """Identical payloads are sent once and fanned back out in order."""
+        requests = [
+            {"jsonrpc": "2.0", "id": 1, "method": "getBalance", "params": ["a"]},
+            {"jsonrpc": "2.0", "id": 1, "method": "getBalance", "params": ["b"]},
+            {"jsonrpc": "2.0", "id": 1, "method": "getBalance", "params": ["a"]},
+            {"jsonrpc": "2.0", "id": 1, "method": "bad"},
+        ]
+        responses = call_rpc_batch(requests)
+
+        self.assertEqual(len(self.server.requests), 1)
+        sent = self.server.requests[0]
+        self.assertEqual(len(sent), 3)
+        self.assertEqual(len({item["id"] for item in sent}), 3)
+
+        self.assertEqual([r.get("result") for r in responses[:3]], [["a"], ["b"], ["a"]])
+        self.assertEqual(responses[3]["error"]["code"], -32601)
+        self.assertTrue(all(r["id"] == 1 for r in responses))
+
+    def test_batch_never_dedupes_airdrops(self):
+        """Mutating requests are sent once per occurrence."""
+        airdrop = {"jsonrpc": "2.0", "id": 1, "method": "requestAirdrop", "params": ["a", 1]}
+        call_rpc_batch([airdrop, airdrop])
+        self.assertEqual(len(self.server.requests[0]), 2)
+
+    def test_batch_transport_error_is_per_item(self):
+        """A failed batch request marks every item as an error."""
+        self.server.status_code = 503
+        responses = call_rpc_batch([
+            {"jsonrpc": "2.0", "id": 1, "method": "getHealth"},
+            {"jsonrpc": "2.0", "id": 2, "method": "getSupply"},
+        ])
+        self.assertTrue(all("503" in r["error"] for r in responses))
+
+    def test_multiple_accounts_chunked(self):
+        """Address lists over the per-call limit are sent as chunks in one batch and merged in order."""
+        addresses = [str(index) for index in range(250)]
+        data = {"jsonrpc": "2.0", "id": 9, "method": "getMultipleAccounts", "params": [addresses, {"encoding": "base64"}]}
+        response = call_rpc(data)
+
+        self.assertEqual(len(self.server.requests), 1)
+        sent = self.server.requests[0]
+        self.assertEqual([len(item["params"][0]) for item in sent], [100, 100, 50])
+        self.assertTrue(all(item["params"][1] == {"encoding": "base64"} for item in sent))
+        self.assertEqual(response["id"], 9)
+        self.assertEqual([account["lamports"] for account in response["result"]["value"]], list(range(250)))
+        self.assertEqual(response["result"]["context"]["slot"], 50)
+
+    def test_multiple_accounts_chunked_shares_cache_and_flight(self):
+        """Concurrent and repeated oversized requests reach the provider once."""
+        self.server.latency = 0.2
+        data = {"jsonrpc": "2.0", "id": 1, "method": "getMultipleAccounts", "params": [[str(index) for index in range(150)]]}
+        results = []
+        threads = [threading.Thread(target=lambda i=i: results.append(call_rpc(dict(data, id=i)))) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(call_rpc(dict(data, id=7))["id"], 7)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(sorted(result["id"] for result in results), [0, 1, 2])
+
+    def test_multiple_accounts_chunk_error(self):
+        """A failed chunk fails the whole request."""
+        self.server.status_code = 503
+        response = call_rpc({"jsonrpc": "2.0", "id": 9, "method": "getMultipleAccounts",
+                             "params": [[str(index) for index in range(150)]]})
+        self.assertIn("503", response["error"])
+
+if __name__ == '__main__':
+    unittest.main()